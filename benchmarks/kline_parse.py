@@ -0,0 +1,110 @@
+"""Kline/OI parse benchmark: ccxt's per-row normalisation vs the Binance fast path.
+
+    python -m benchmarks.kline_parse [--bars 1000] [--symbols 200] [--repeat 5]
+
+Synthetic ``/fapi/v1/klines`` and ``/futures/data/openInterestHist`` payloads
+(decoded JSON, as the ccxt client hands them over) are parsed both ways; the
+report gives the cost per 1,000 bars and the whole-universe cost for one cycle.
+Both paths are checked for identical numeric output before anything is timed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+import ccxt
+
+from combined_bot.adapters.binance import parse_klines
+
+
+def _klines(rng: random.Random, bars: int):
+    start = 1735689600000
+    rows = []
+    price = 100.0
+    for index in range(bars):
+        open_ = price
+        price = max(0.0001, price * (1 + rng.gauss(0, 0.01)))
+        high, low = max(open_, price) * 1.002, min(open_, price) * 0.998
+        rows.append(
+            [
+                start + index * 3600000,
+                f"{open_:.8f}",
+                f"{high:.8f}",
+                f"{low:.8f}",
+                f"{price:.8f}",
+                f"{rng.random() * 1e6:.3f}",
+                start + (index + 1) * 3600000 - 1,
+                f"{rng.random() * 1e8:.4f}",
+                rng.randrange(1, 10000),
+                f"{rng.random() * 1e5:.3f}",
+                f"{rng.random() * 1e7:.4f}",
+                "0",
+            ]
+        )
+    return rows
+
+
+def _oi(rng: random.Random, points: int):
+    return [
+        {
+            "symbol": "BTCUSDT",
+            "sumOpenInterest": f"{rng.random() * 1e5:.8f}",
+            "sumOpenInterestValue": f"{rng.random() * 1e9:.8f}",
+            "timestamp": 1735689600000 + index * 86400000,
+        }
+        for index in range(points)
+    ]
+
+
+def _best(call, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        call()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bars", type=int, default=1000)
+    parser.add_argument("--symbols", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    client = ccxt.binanceusdm()
+    klines = _klines(rng, args.bars)
+    oi = _oi(rng, args.bars)
+
+    ccxt_ohlcv = client.parse_ohlcvs(klines)
+    fast_ohlcv = parse_klines(klines)
+    if fast_ohlcv.tolist() != [[float(value) for value in row] for row in ccxt_ohlcv]:
+        raise SystemExit("fast kline parse differs from ccxt")
+    ccxt_oi = [(point["timestamp"], point["openInterestAmount"]) for point in client.parse_open_interests_history(oi)]
+    fast_oi = [(int(row["timestamp"]), float(row["sumOpenInterest"])) for row in oi]
+    if fast_oi != ccxt_oi:
+        raise SystemExit("fast open interest parse differs from ccxt")
+
+    per_1000 = 1000 / args.bars
+    rows = (
+        ("klines_ccxt", _best(lambda: client.parse_ohlcvs(klines), args.repeat)),
+        ("klines_fast", _best(lambda: parse_klines(klines), args.repeat)),
+        ("klines_fast_tolist", _best(lambda: parse_klines(klines).tolist(), args.repeat)),
+        ("oi_ccxt", _best(lambda: client.parse_open_interests_history(oi), args.repeat)),
+        (
+            "oi_fast",
+            _best(lambda: [{"ts": int(r["timestamp"]), "oi": float(r["sumOpenInterest"])} for r in oi], args.repeat),
+        ),
+    )
+    print(f"bars={args.bars:,} symbols={args.symbols:,} results identical")
+    print(f"{'path':<20} {'us/1000 bars':>14} {'ms/cycle':>10}")
+    for name, seconds in rows:
+        print(f"{name:<20} {seconds * per_1000 * 1e6:>14,.0f} {seconds * args.symbols * 1000:>10,.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,143 @@
+"""ML inference benchmark: feature extraction + batched prediction throughput in rows/s.
+
+    python -m benchmarks.ml_inference [--rows 200,2000,20000] [--trees 200] [--depth 6] [--workers 2]
+
+Synthetic 48 x 1h candle windows are scored by a linear model and a random
+tree ensemble, both saved to and loaded from ``.npz``. ``inline`` runs in the
+calling process; ``pool`` goes through the same process-pool path as
+``MachineLearningScanner`` used before shared memory (candles are pickled to
+one worker, features and scores come back), so its numbers include the IPC
+cost. ``shared`` is the scanner's current path: candles are written once into
+a ``SharedArray`` and ``--workers`` slices are scored in parallel.
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+
+from combined_bot.core import inference
+from combined_bot.core.shared_arrays import SharedArray, share_tracker_with_workers
+
+
+def _candles(rows: int, rng: np.random.Generator) -> np.ndarray:
+    returns = rng.normal(0.0, 0.01, size=(rows, inference.WINDOW_HOURS))
+    closes = 10.0 * np.exp(np.cumsum(returns, axis=1))
+    candles = np.empty((rows, inference.WINDOW_HOURS, 6))
+    candles[:, :, 0] = np.arange(inference.WINDOW_HOURS) * 3_600_000
+    candles[:, :, 1] = closes
+    candles[:, :, 2] = closes * 1.005
+    candles[:, :, 3] = closes * 0.995
+    candles[:, :, 4] = closes
+    candles[:, :, 5] = rng.lognormal(12.0, 1.0, size=(rows, inference.WINDOW_HOURS))
+    return candles
+
+
+def _linear_model() -> inference.InferenceModel:
+    weights = np.linspace(-1.0, 1.0, len(inference.FEATURE_NAMES))
+    return inference.InferenceModel("linear", "bench-linear", inference.FEATURE_NAMES, "logistic", {"weights": weights, "bias": np.array(0.0)})
+
+
+def _tree_model(trees: int, depth: int, rng: np.random.Generator) -> inference.InferenceModel:
+    internal = 2**depth - 1
+    nodes = 2 ** (depth + 1) - 1
+    index = np.arange(nodes)
+    left = np.where(index < internal, 2 * index + 1, -1)
+    right = np.where(index < internal, 2 * index + 2, -1)
+    arrays = {
+        "feature": rng.integers(0, len(inference.FEATURE_NAMES), size=(trees, nodes)),
+        "threshold": rng.normal(size=(trees, nodes)),
+        "left": np.tile(left, (trees, 1)),
+        "right": np.tile(right, (trees, 1)),
+        "value": rng.normal(0.0, 0.1, size=(trees, nodes)),
+        "base_score": np.array(0.0),
+    }
+    return inference.InferenceModel("tree_ensemble", "bench-trees", inference.FEATURE_NAMES, "logistic", arrays)
+
+
+_POOL_MODEL: Optional[inference.InferenceModel] = None
+
+
+def _init_pool_worker(model: inference.InferenceModel) -> None:
+    global _POOL_MODEL
+    _POOL_MODEL = model
+    inference.init_worker(model)
+
+
+def _score_pickled(candles: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    # The pre-shared-memory pool path: the whole candle stack is pickled to one worker.
+    assert _POOL_MODEL is not None
+    features = inference.build_features(candles)
+    return inference.predict(_POOL_MODEL, features), features
+
+
+def _score_shared(pool: ProcessPoolExecutor, candles: np.ndarray, workers: int) -> np.ndarray:
+    with SharedArray(candles.shape) as shared:
+        shared.array[:] = candles
+        bounds = np.linspace(0, len(candles), workers + 1).astype(int).tolist()
+        futures = [
+            pool.submit(inference.score_shared_slice_in_worker, shared.spec, start, stop)
+            for start, stop in zip(bounds, bounds[1:])
+        ]
+        return np.concatenate([future.result()[0] for future in futures])
+
+
+def _rate(rows: int, seconds: float) -> str:
+    return f"{rows / seconds:,.0f}" if seconds > 0 else "inf"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", default="200,2000,20000")
+    parser.add_argument("--trees", type=int, default=200)
+    parser.add_argument("--depth", type=int, default=6)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    share_tracker_with_workers()
+    row_counts = [int(item) for item in args.rows.split(",") if item.strip()]
+    print(
+        f"{'model':<14} {'rows':>7} {'features_rows/s':>16} {'inline_rows/s':>14} {'pool_rows/s':>12} {'shared_rows/s':>14}"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        for model in (_linear_model(), _tree_model(args.trees, args.depth, rng)):
+            path = Path(tmp) / f"{model.version}.npz"
+            inference.save_model(path, model)
+            loaded = inference.load_model(path)
+            with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_pool_worker, initargs=(loaded,)) as pool:
+                pool.submit(_score_pickled, _candles(1, rng)).result()
+                for rows in row_counts:
+                    candles = _candles(rows, rng)
+                    started = time.perf_counter()
+                    for _ in range(args.repeat):
+                        inference.build_features(candles)
+                    features_sec = (time.perf_counter() - started) / args.repeat
+                    started = time.perf_counter()
+                    for _ in range(args.repeat):
+                        inference.predict(loaded, inference.build_features(candles))
+                    inline_sec = (time.perf_counter() - started) / args.repeat
+                    started = time.perf_counter()
+                    for _ in range(args.repeat):
+                        pool.submit(_score_pickled, candles).result()
+                    pool_sec = (time.perf_counter() - started) / args.repeat
+                    started = time.perf_counter()
+                    for _ in range(args.repeat):
+                        _score_shared(pool, candles, args.workers)
+                    shared_sec = (time.perf_counter() - started) / args.repeat
+                    print(
+                        f"{model.kind:<14} {rows:>7} {_rate(rows, features_sec):>16} "
+                        f"{_rate(rows, inline_sec):>14} {_rate(rows, pool_sec):>12} {_rate(rows, shared_sec):>14}"
+                    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
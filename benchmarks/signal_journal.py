@@ -0,0 +1,96 @@
+"""Signal journal benchmark: batched writes and stats latency on a large journal.
+
+    python -m benchmarks.signal_journal [--rows 1000000] [--days 30] [--symbols 500] [--batch 500]
+
+Synthetic signals are spread over ``--days`` UTC days and written through
+``Database.record_signals`` in batches of ``--batch`` (one cycle each). The
+rollup-backed stats are then timed against the same aggregate computed by a
+full scan of the raw day partitions.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from combined_bot.core.database import Database, _journal_table
+from combined_bot.models import MarketSymbol, SignalEvent
+
+_SCANNERS = ("vol_spike", "price_pump", "oi_spike", "funding_basis", "ml_predictor")
+
+
+def _ms(seconds: float) -> str:
+    return f"{seconds * 1000:,.2f}"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--symbols", type=int, default=500)
+    parser.add_argument("--batch", type=int, default=500)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    symbols = [MarketSymbol.from_raw("binance", f"C{index}/USDT:USDT", market_type="linear_perp") for index in range(args.symbols)]
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    span_seconds = args.days * 86400
+    with tempfile.TemporaryDirectory() as tmp:
+        database = Database(Path(tmp) / "journal.sqlite3", journal_retention_days=args.days + 3650)
+        write_sec = 0.0
+        for offset in range(0, args.rows, args.batch):
+            count = min(args.batch, args.rows - offset)
+            moment = start + timedelta(seconds=span_seconds * offset / args.rows)
+            entries = [
+                (
+                    SignalEvent(
+                        scanner_id=rng.choice(_SCANNERS),
+                        symbol=rng.choice(symbols),
+                        timeframe="1h",
+                        detected_at=moment,
+                        candle_close_at=moment,
+                        score=rng.random(),
+                        metrics={"ratio": rng.random() * 10},
+                    ),
+                    1,
+                )
+                for _ in range(count)
+            ]
+            started = time.perf_counter()
+            database.record_signals(entries)
+            write_sec += time.perf_counter() - started
+        print(f"rows={args.rows:,} write_rows/s={args.rows / write_sec:,.0f}")
+
+        end = start + timedelta(days=args.days)
+        week = end - timedelta(days=7)
+        timings = []
+        for name, call in (
+            ("alerts_per_scanner_per_day", lambda: database.alerts_per_scanner_per_day(start, end)),
+            ("top_symbols_week", lambda: database.top_symbols(week, end, limit=10)),
+            ("journal_entries_symbol_week", lambda: database.journal_entries(week, end, symbol="C7/USDT", limit=100)),
+        ):
+            started = time.perf_counter()
+            call()
+            timings.append((name, time.perf_counter() - started))
+
+        tables = [_journal_table(int((start + timedelta(days=day)).timestamp())) for day in range(args.days)]
+        full_scan = " UNION ALL ".join(f"SELECT scanner_id, detected_at FROM {table}" for table in tables)
+        started = time.perf_counter()
+        with database._connect() as conn:
+            conn.execute(
+                f"SELECT detected_at - detected_at % 86400 AS day, scanner_id, COUNT(*) FROM ({full_scan}) GROUP BY day, scanner_id"
+            ).fetchall()
+        timings.append(("full_scan_per_scanner_per_day", time.perf_counter() - started))
+
+    print(f"{'query':<32} {'ms':>10}")
+    for name, seconds in timings:
+        print(f"{name:<32} {_ms(seconds):>10}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,112 @@
+"""Startup benchmark: time-to-first-scan with a cold and a warm markets cache.
+
+Each measurement runs in a fresh interpreter so import costs are included:
+
+    python benchmarks/startup.py [--runs 3] [--cache-dir /tmp/markets_cache]
+
+Time-to-first-scan is measured from interpreter start-up until every enabled
+adapter has returned its symbol universe, i.e. the point where scanners can
+issue their first kline request. The cold run needs network access to the
+exchange; the warm runs are served from the on-disk markets cache.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+_STARTED = time.perf_counter()
+
+
+def _child() -> None:
+    import asyncio
+
+    import_started = time.perf_counter()
+    from combined_bot.main import build_orchestrator
+
+    imported = time.perf_counter()
+    orchestrator = build_orchestrator()
+    built = time.perf_counter()
+
+    async def _first_scan() -> int:
+        try:
+            symbols = await asyncio.gather(*(adapter.list_symbols() for adapter in orchestrator.adapters.values()))
+            return sum(len(items) for items in symbols)
+        finally:
+            for adapter in orchestrator.adapters.values():
+                await adapter.close()
+
+    symbols = asyncio.run(_first_scan())
+    ready = time.perf_counter()
+    print(
+        json.dumps(
+            {
+                "interpreter_to_import_sec": import_started - _STARTED,
+                "import_sec": imported - import_started,
+                "build_sec": built - imported,
+                "markets_sec": ready - built,
+                "time_to_first_scan_sec": ready - _STARTED,
+                "symbols": symbols,
+            }
+        )
+    )
+
+
+def _run_child(env: dict) -> dict:
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, __file__, "--child"],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else "child failed")
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result["wall_sec"] = time.perf_counter() - started
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3, help="warm runs after the cold one")
+    parser.add_argument("--cache-dir", type=Path, default=None)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        _child()
+        return 0
+
+    cache_dir = args.cache_dir or Path(tempfile.mkdtemp(prefix="markets_cache_"))
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    env = dict(os.environ)
+    env["MARKETS_CACHE_DIR"] = str(cache_dir)
+    env["TG_BOT_TOKEN"] = ""
+    env["DATABASE_PATH"] = str(cache_dir / "bench.sqlite3")
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(Path(__file__).resolve().parents[1]), env.get("PYTHONPATH")]))
+
+    rows = [("cold", _run_child(env))]
+    for index in range(args.runs):
+        rows.append((f"warm#{index + 1}", _run_child(env)))
+
+    print(f"{'run':<8} {'import':>8} {'build':>8} {'markets':>8} {'first_scan':>11} {'symbols':>8}")
+    for label, row in rows:
+        print(
+            f"{label:<8} {row['import_sec']:>8.3f} {row['build_sec']:>8.3f} {row['markets_sec']:>8.3f} "
+            f"{row['time_to_first_scan_sec']:>11.3f} {row['symbols']:>8}"
+        )
+    if args.cache_dir is None:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
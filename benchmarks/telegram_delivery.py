@@ -0,0 +1,202 @@
+"""Telegram delivery load test against a local fake Bot API server.
+
+    python -m benchmarks.telegram_delivery [--signals 10] [--chats 200] [--global-rate 30] [--chat-interval 1]
+                                            [--fail-rate 0.01] [--lost-reply-rate 0.0] [--concurrency 16]
+
+``FakeBotApi`` stands in for ``api.telegram.org``: it enforces a global
+message rate (token bucket, one second of burst) and a minimum interval per
+chat, answers over-limit requests with ``429`` and an integer ``retry_after``
+like the real API, fails ``--fail-rate`` of requests with ``500`` before
+delivering, and for ``--lost-reply-rate`` delivers the message but answers
+``502`` (the client retries, so the chat sees a duplicate).
+
+The driver pushes ``--signals`` x ``--chats`` messages through
+``Orchestrator._deliver`` and ``TelegramDispatcher`` exactly as a cycle does
+and reports sustained msgs/s, p50/p99 latency from ``_deliver`` start to the
+server receiving the message, and dropped/duplicated counts.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import math
+import random
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from aiohttp import web
+
+from combined_bot.adapters.http import SharedHttpSession
+from combined_bot.core.orchestrator import Orchestrator
+from combined_bot.delivery.bot_api import BotApiClient
+from combined_bot.delivery.telegram_dispatcher import TelegramDispatcher
+from combined_bot.models import SignalEvent, UserSettings
+from combined_bot.symbols import symbol_registry
+
+
+class FakeBotApi:
+    def __init__(
+        self,
+        global_rate: float = 30.0,
+        chat_interval: float = 1.0,
+        fail_rate: float = 0.0,
+        lost_reply_rate: float = 0.0,
+        seed: int = 7,
+    ) -> None:
+        self.global_rate = global_rate
+        self.chat_interval = chat_interval
+        self.fail_rate = fail_rate
+        self.lost_reply_rate = lost_reply_rate
+        self._rng = random.Random(seed)
+        self._tokens = global_rate
+        self._refilled_at = time.monotonic()
+        self._chat_last: Dict[int, float] = {}
+        # (monotonic receive time, chat id, text) of every delivered message.
+        self.received: List[Tuple[float, int, str]] = []
+        self.rate_limited = 0
+        self.failed = 0
+        self.lost_replies = 0
+        self.base_url = ""
+        self._runner: Optional[web.AppRunner] = None
+
+    def _retry_after(self, wait: float) -> web.Response:
+        self.rate_limited += 1
+        retry_after = max(1, math.ceil(wait))
+        return web.json_response(
+            {
+                "ok": False,
+                "error_code": 429,
+                "description": f"Too Many Requests: retry after {retry_after}",
+                "parameters": {"retry_after": retry_after},
+            }
+        )
+
+    async def _send_message(self, request: web.Request) -> web.Response:
+        payload = await request.json()
+        chat_id = int(payload["chat_id"])
+        now = time.monotonic()
+        self._tokens = min(self.global_rate, self._tokens + (now - self._refilled_at) * self.global_rate)
+        self._refilled_at = now
+        if self._tokens < 1:
+            return self._retry_after((1 - self._tokens) / self.global_rate)
+        chat_wait = self._chat_last.get(chat_id, -math.inf) + self.chat_interval - now
+        if chat_wait > 0:
+            return self._retry_after(chat_wait)
+        if self._rng.random() < self.fail_rate:
+            self.failed += 1
+            return web.json_response({"ok": False, "error_code": 500, "description": "Internal Server Error"}, status=500)
+        self._tokens -= 1
+        self._chat_last[chat_id] = now
+        self.received.append((now, chat_id, payload["text"]))
+        if self._rng.random() < self.lost_reply_rate:
+            self.lost_replies += 1
+            return web.json_response({"ok": False, "error_code": 502, "description": "Bad Gateway"}, status=502)
+        return web.json_response({"ok": True, "result": {"message_id": len(self.received), "chat": {"id": chat_id}}})
+
+    async def start(self) -> None:
+        app = web.Application()
+        app.router.add_post("/bot{token}/sendMessage", self._send_message)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        self.base_url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))]
+
+
+async def _run(args: argparse.Namespace) -> int:
+    server = FakeBotApi(args.global_rate, args.chat_interval, args.fail_rate, args.lost_reply_rate)
+    await server.start()
+    client = BotApiClient(
+        "bench", base_url=server.base_url, http=SharedHttpSession(), concurrency=args.concurrency, max_retries=args.max_retries
+    )
+    dispatcher = TelegramDispatcher(token="bench", client=client)
+    orchestrator = Orchestrator(adapters={}, scanners=[], database=None, dispatcher=dispatcher)
+    users = [UserSettings(chat_id=1000 + index) for index in range(args.chats)]
+    moment = datetime.now(timezone.utc)
+    signals = [
+        SignalEvent(
+            scanner_id="vol_spike",
+            symbol=symbol_registry.intern("binance", f"LOAD{index}/USDT:USDT", market_type="linear_perp"),
+            timeframe="1h",
+            detected_at=moment,
+            candle_close_at=moment,
+            score=0.9,
+            metrics={"prev_24h_volume_usd": 1e6, "last_24h_volume_usd": 6e6, "ratio": 6.0},
+        )
+        for index in range(args.signals)
+    ]
+    text_to_signal = {dispatcher._format_message(signal): index for index, signal in enumerate(signals)}
+
+    started_at: List[float] = []
+    accepted = 0
+    started = time.monotonic()
+    try:
+        for signal in signals:
+            started_at.append(time.monotonic())
+            accepted += await orchestrator._deliver(signal, users)
+    finally:
+        await dispatcher.close()
+        await server.stop()
+    wall = time.monotonic() - started
+
+    expected = args.signals * args.chats
+    copies = Counter((text_to_signal[text], chat_id) for _, chat_id, text in server.received)
+    latencies = [at - started_at[text_to_signal[text]] for at, _, text in server.received]
+    received_times = [at for at, _, _ in server.received]
+    span = (max(received_times) - min(received_times)) if len(received_times) > 1 else 0.0
+    print(
+        f"signals={args.signals} chats={args.chats} global_rate={args.global_rate}/s chat_interval={args.chat_interval}s "
+        f"fail_rate={args.fail_rate} lost_reply_rate={args.lost_reply_rate} concurrency={args.concurrency}"
+    )
+    print(f"{'metric':<22} {'value':>12}")
+    for name, value in (
+        ("messages_expected", f"{expected:,}"),
+        ("messages_received", f"{len(server.received):,}"),
+        ("accepted_by_client", f"{accepted:,}"),
+        ("dropped", f"{expected - len(copies):,}"),
+        ("duplicated", f"{sum(count - 1 for count in copies.values()):,}"),
+        ("rate_limited_429", f"{server.rate_limited:,}"),
+        ("failed_500", f"{server.failed:,}"),
+        ("lost_replies_502", f"{server.lost_replies:,}"),
+        ("wall_s", f"{wall:,.2f}"),
+        ("sustained_msgs/s", f"{(len(server.received) - 1) / span:,.1f}" if span > 0 else "-"),
+        ("latency_p50_s", f"{_percentile(latencies, 50):,.3f}"),
+        ("latency_p99_s", f"{_percentile(latencies, 99):,.3f}"),
+    ):
+        print(f"{name:<22} {value:>12}")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--signals", type=int, default=10)
+    parser.add_argument("--chats", type=int, default=200)
+    parser.add_argument("--global-rate", type=float, default=30.0, help="messages per second across all chats")
+    parser.add_argument("--chat-interval", type=float, default=1.0, help="minimum seconds between messages to one chat")
+    parser.add_argument("--fail-rate", type=float, default=0.01)
+    parser.add_argument("--lost-reply-rate", type=float, default=0.0)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--max-retries", type=int, default=3)
+    args = parser.parse_args()
+    # Retries are expected under load and counted by the server; only give-ups are worth printing.
+    logging.basicConfig(level=logging.ERROR)
+    return asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
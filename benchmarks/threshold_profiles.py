@@ -0,0 +1,62 @@
+"""Threshold profile matching: per-cycle cost as the number of distinct profiles grows.
+
+    python -m benchmarks.threshold_profiles [--users 10000] [--rows 500]
+
+``--users`` users are spread over 10, 100, 1,000 and 10,000 distinct volume
+scanner profiles; for each spread the report times ``prepare`` (profile dedup,
+scanner floors) and ``match`` (all profiles against a ``--rows`` batch).
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from combined_bot.core.features import FeatureStore
+from combined_bot.core.thresholds import ThresholdMatcher
+from combined_bot.models import UserSettings
+from combined_bot.scanners.volume import VolumeSpikeScanner
+from combined_bot.signal_batch import SignalBatchBuilder
+from combined_bot.symbols import SymbolRegistry
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--rows", type=int, default=500)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    registry = SymbolRegistry()
+    builder = SignalBatchBuilder("vol_spike", "1h", VolumeSpikeScanner.metric_names, registry=registry)
+    for index in range(args.rows):
+        ratio = rng.uniform(1.0, 12.0)
+        last_usd = rng.uniform(1e6, 1e8)
+        builder.add(registry.intern("binance", f"S{index}/USDT:USDT"), 1735689600000, 0.5, (last_usd / ratio, last_usd, ratio))
+    batch = builder.build()
+    scanner = VolumeSpikeScanner(store=FeatureStore())
+
+    print(f"users={args.users:,} rows={args.rows:,}")
+    print(f"{'profiles':>9} {'prepare_ms':>11} {'match_ms':>9}")
+    for distinct in (10, 100, 1_000, 10_000):
+        profiles = [
+            {"min_vol_ratio": round(rng.uniform(2.0, 10.0), 2), "min_vol_usd_last": float(rng.randrange(1, 50) * 1_000_000)}
+            for _ in range(distinct)
+        ]
+        users = [
+            UserSettings(chat_id=index, threshold_profiles={"vol_spike": profiles[index % distinct]})
+            for index in range(args.users)
+        ]
+        matcher = ThresholdMatcher([scanner])
+        started = time.perf_counter()
+        matcher.prepare(users)
+        prepared = time.perf_counter()
+        matcher.match(batch, users)
+        matched = time.perf_counter()
+        print(f"{len(matcher._profiles['vol_spike'].matrix) - 1:>9,} {(prepared - started) * 1000:>11.2f} {(matched - prepared) * 1000:>9.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
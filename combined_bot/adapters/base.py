@@ -3,6 +3,8 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 from typing import Any, Dict, List
 
+from ..models import UniverseEvent
+
 
 class BaseExchangeAdapter(ABC):
     exchange_id: str
@@ -13,11 +15,33 @@ class BaseExchangeAdapter(ABC):
 
     @abstractmethod
     async def fetch_ohlcv(self, symbol: str, timeframe: str, limit: int) -> List[List[Any]]:
+        """Oldest-first ``[open_ms, open, high, low, close, volume]`` rows; may be an ``(n, 6)`` float64 ndarray."""
         raise NotImplementedError
 
     @abstractmethod
     async def fetch_open_interest_history(self, symbol: str, days: int) -> List[Dict[str, Any]]:
         raise NotImplementedError
 
+    async def fetch_premium_index(self) -> Dict[str, Dict[str, float]]:
+        """Funding rate and mark/index prices for every scannable symbol from one bulk request.
+
+        Adapters without a bulk endpoint return an empty mapping.
+        """
+        return {}
+
+    async def fetch_24h_quote_volumes(self) -> Dict[str, float]:
+        """Rolling 24h quote volume for every scannable symbol from one bulk ticker request.
+
+        Adapters without a bulk endpoint return an empty mapping.
+        """
+        return {}
+
+    async def refresh_universe(self) -> List[UniverseEvent]:
+        """Re-read the exchange listing and report symbols that entered or left ``list_symbols``.
+
+        Adapters that cannot detect listings cheaply report nothing.
+        """
+        return []
+
     async def close(self) -> None:
         return None
@@ -1,90 +1,77 @@
 from __future__ import annotations
 
-import asyncio
-import logging
-import time
-from typing import Any, Dict, List, Optional
+from itertools import chain
+from typing import Any, Dict, List, Optional, Sequence
 
-import ccxt.async_support as ccxt
+import numpy as np
 
 from .. import config
-from .base import BaseExchangeAdapter
+from .ccxt_exchange import CcxtExchangeAdapter
+from .http import SharedHttpSession
 
+# /fapi/v1/klines caps ``limit`` at 1500 bars per request.
+_MAX_KLINES = 1500
 
-class BinanceFuturesAdapter(BaseExchangeAdapter):
-    exchange_id = "binance"
-
-    def __init__(self) -> None:
-        self.logger = logging.getLogger(self.__class__.__name__)
-        self._client = ccxt.binanceusdm(
-            {
-                "enableRateLimit": True,
-                "timeout": config.ADAPTER_TIMEOUT_MS,
-            }
-        )
-        self._markets_loaded = False
-        self._symbols_cache: List[str] = []
-        self._symbols_cached_at = 0.0
-
-    async def _with_retry(self, operation_name: str, operation):
-        attempts = max(1, config.ADAPTER_RETRY_ATTEMPTS)
-        base_delay = max(0.1, config.ADAPTER_RETRY_BASE_DELAY_SECONDS)
-        for attempt in range(1, attempts + 1):
-            try:
-                return await operation()
-            except (ccxt.NetworkError, ccxt.RequestTimeout, ccxt.ExchangeNotAvailable, ccxt.DDoSProtection, ccxt.RateLimitExceeded) as exc:
-                is_last = attempt == attempts
-                self.logger.warning(
-                    "adapter operation failed (%s) attempt %s/%s: %s",
-                    operation_name,
-                    attempt,
-                    attempts,
-                    exc,
-                )
-                if is_last:
-                    raise
-                await asyncio.sleep(base_delay * (2 ** (attempt - 1)))
-
-    async def _ensure_markets_loaded(self) -> None:
-        if not self._markets_loaded:
-            await self._with_retry("load_markets", self._client.load_markets)
-            self._markets_loaded = True
-
-    async def list_symbols(self) -> List[str]:
-        await self._ensure_markets_loaded()
-        now = time.monotonic()
-        if self._symbols_cache and now - self._symbols_cached_at < config.SYMBOLS_CACHE_TTL_SECONDS:
-            return list(self._symbols_cache)
 
-        symbols: List[str] = []
-        for market in self._client.markets.values():
-            if market.get("active") and market.get("swap") and market.get("linear") and market.get("quote") == "USDT":
-                symbols.append(str(market["symbol"]))
+def parse_klines(rows: Sequence[Sequence[Any]]) -> np.ndarray:
+    """Decode raw ``/fapi/v1/klines`` rows into an ``(n, 6)`` float64 OHLCV array in one pass.
 
-        symbols.sort(key=lambda item: str(item))
-        if config.TOP_SYMBOLS_LIMIT > 0:
-            symbols = symbols[: config.TOP_SYMBOLS_LIMIT]
+    Matches ccxt's ``parse_ohlcv`` numerically: the open time and the first five price/volume
+    strings of every row, everything after the base volume ignored.
+    """
+    return np.fromiter(
+        chain.from_iterable(row[:6] for row in rows), dtype=np.float64, count=6 * len(rows)
+    ).reshape(-1, 6)
 
-        self._symbols_cache = list(symbols)
-        self._symbols_cached_at = now
-        return symbols
 
-    async def fetch_ohlcv(self, symbol: str, timeframe: str, limit: int) -> List[List[Any]]:
+class BinanceFuturesAdapter(CcxtExchangeAdapter):
+    exchange_id = "binance"
+    ccxt_id = "binanceusdm"
+
+    def __init__(self, http_session: Optional[SharedHttpSession] = None) -> None:
+        super().__init__(http_session=http_session)
+
+    def _is_scannable_market(self, market: Dict[str, Any]) -> bool:
+        # binanceusdm also lists quarterly delivery contracts; keep perpetuals only.
+        info = market.get("info") or {}
+        contract_type = info.get("contractType")
+        if contract_type is not None and contract_type != "PERPETUAL":
+            return False
+        return super()._is_scannable_market(market)
+
+    def _parse_open_interest_point(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        oi = item.get("openInterestAmount")
+        if oi is None:
+            oi = (item.get("info") or {}).get("sumOpenInterest", 0)
+        return {"ts": item.get("timestamp", 0), "oi": oi}
+
+    # Fast path: the raw futures endpoints through the same ccxt client (signing, rate limit,
+    # shared session), skipping ccxt's per-row parse/safe-access normalisation.
+
+    async def _fetch_ohlcv_uncached(self, symbol: str, timeframe: str, limit: int):
+        if not config.BINANCE_FAST_PARSE:
+            return await super()._fetch_ohlcv_uncached(symbol, timeframe, limit)
         await self._ensure_markets_loaded()
+        request = {
+            "symbol": self._client.market_id(symbol),
+            "interval": self._client.timeframes[timeframe],
+            "limit": min(limit, _MAX_KLINES),
+        }
 
         async def _op():
-            return await self._client.fetch_ohlcv(symbol, timeframe=timeframe, limit=limit)
+            return parse_klines(await self._client.fapiPublicGetKlines(request))
 
-        return await self._with_retry(f"fetch_ohlcv:{symbol}:{timeframe}", _op)
+        return await self._with_retry(f"fetch_ohlcv:{symbol}:{timeframe}", _op, hedge=True)
 
     async def fetch_open_interest_history(self, symbol: str, days: int) -> List[Dict[str, Any]]:
+        if not config.BINANCE_FAST_PARSE:
+            return await super().fetch_open_interest_history(symbol, days)
         await self._ensure_markets_loaded()
+        params = self._open_interest_history_params(days)
+        request = {"symbol": self._client.market_id(symbol), "period": params["timeframe"], "limit": params["limit"]}
 
         async def _op():
-            return await self._client.fetch_open_interest_history(symbol, timeframe="1d", limit=days)
-
-        history = await self._with_retry(f"fetch_open_interest_history:{symbol}", _op)
-        return [{"ts": item.get("timestamp", 0), "oi": item.get("openInterestAmount", 0)} for item in history]
+            return await self._client.fapiDataGetOpenInterestHist(request)
 
-    async def close(self) -> None:
-        await self._client.close()
+        history = await self._with_retry(f"fetch_open_interest_history:{symbol}", _op, hedge=True)
+        return [{"ts": int(row["timestamp"]), "oi": float(row["sumOpenInterest"])} for row in history]
@@ -0,0 +1,448 @@
+from __future__ import annotations
+
+import asyncio
+import bisect
+import json
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Set, Tuple
+
+from .. import config
+from ..models import UniverseEvent
+from ..symbols import symbol_registry
+from .base import BaseExchangeAdapter
+from .http import SharedHttpSession, shared_http_session
+from .resilience import CircuitBreaker, CircuitOpenError, LatencyTracker, hedged
+
+
+def _ccxt():
+    # ccxt.async_support imports every exchange class (~0.5s); defer it until a client is needed.
+    import ccxt.async_support as ccxt
+
+    return ccxt
+
+
+def _retryable_errors() -> Tuple[type, ...]:
+    ccxt = _ccxt()
+    return (
+        ccxt.NetworkError,
+        ccxt.RequestTimeout,
+        ccxt.ExchangeNotAvailable,
+        ccxt.DDoSProtection,
+        ccxt.RateLimitExceeded,
+    )
+
+
+# Per-exchange ccxt settings for linear USDT perpetuals. ``fetchMarkets`` is narrowed to
+# derivatives so ``load_markets`` does not download the spot/option universes.
+EXCHANGE_PROFILES: Dict[str, Dict[str, Any]] = {
+    "bybit": {"ccxt_id": "bybit", "options": {"defaultType": "swap", "fetchMarkets": {"types": ["linear"]}}},
+    "okx": {"ccxt_id": "okx", "options": {"defaultType": "swap", "fetchMarkets": {"types": ["swap"]}}},
+    "mexc": {
+        "ccxt_id": "mexc",
+        "options": {"defaultType": "swap", "fetchMarkets": {"types": {"spot": False, "swap": {"linear": True, "inverse": False}}}},
+    },
+}
+
+
+class CcxtExchangeAdapter(BaseExchangeAdapter):
+    exchange_id = ""
+    ccxt_id = ""
+    ccxt_options: Mapping[str, Any] = MappingProxyType({})
+
+    def __init__(
+        self,
+        exchange_id: Optional[str] = None,
+        ccxt_id: Optional[str] = None,
+        options: Optional[Dict[str, Any]] = None,
+        http_session: Optional[SharedHttpSession] = None,
+    ) -> None:
+        if exchange_id is not None:
+            self.exchange_id = exchange_id.strip().lower()
+        profile = EXCHANGE_PROFILES.get(self.exchange_id, {})
+        self.ccxt_id = ccxt_id or profile.get("ccxt_id") or self.ccxt_id or self.exchange_id
+        if options is not None:
+            self.ccxt_options = options
+        elif "options" in profile:
+            self.ccxt_options = profile["options"]
+        self.logger = logging.getLogger(f"{self.__class__.__name__}[{self.exchange_id}]")
+        self._http_session = http_session or shared_http_session
+        self._session_attached = False
+        self._client_instance = None
+        self._markets_loaded = False
+        self._markets_refresh_task: Optional[asyncio.Task] = None
+        self._symbols_cache: List[str] = []
+        self._symbols_cached_at = 0.0
+        # Every scannable symbol, sorted; ``_symbols_cache`` is its TOP_SYMBOLS_LIMIT prefix.
+        self._universe: List[str] = []
+        # Listings found by ``refresh_universe``: scanned even when they sort past TOP_SYMBOLS_LIMIT.
+        self._new_listings: Set[str] = set()
+        self._ohlcv_cache: Dict[Tuple[str, str], Tuple[float, int, List[List[Any]]]] = {}
+        self._ohlcv_inflight: Dict[Tuple[str, str], Tuple[int, asyncio.Future]] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._latencies: Dict[str, LatencyTracker] = {}
+        self._hedge_counts: Dict[str, List[int]] = {}
+
+    @property
+    def _client(self):
+        if self._client_instance is None:
+            self._client_instance = self._create_client()
+        return self._client_instance
+
+    @_client.setter
+    def _client(self, client) -> None:
+        self._client_instance = client
+
+    def _create_client(self):
+        client_class = getattr(_ccxt(), self.ccxt_id, None)
+        if client_class is None:
+            raise ValueError(f"unknown ccxt exchange id: {self.ccxt_id}")
+        # Passing a session key marks the ccxt session as externally owned; the shared
+        # pooled session is attached on first use inside the running event loop.
+        return client_class(
+            {
+                "enableRateLimit": True,
+                "timeout": config.ADAPTER_TIMEOUT_MS,
+                "options": dict(self.ccxt_options),
+                "session": None,
+            }
+        )
+
+    @property
+    def supports_open_interest_history(self) -> bool:
+        return bool(getattr(self._client, "has", {}).get("fetchOpenInterestHistory", True))
+
+    async def _attach_session(self) -> None:
+        if self._session_attached:
+            return
+        self._client.session = await self._http_session.acquire()
+        self._session_attached = True
+
+    def _breaker(self, endpoint: str) -> CircuitBreaker:
+        breaker = self._breakers.get(endpoint)
+        if breaker is None:
+            breaker = self._breakers[endpoint] = CircuitBreaker()
+        return breaker
+
+    def _latency(self, endpoint: str) -> LatencyTracker:
+        tracker = self._latencies.get(endpoint)
+        if tracker is None:
+            tracker = self._latencies[endpoint] = LatencyTracker()
+        return tracker
+
+    def _hedge_delay(self, endpoint: str) -> Optional[float]:
+        if not config.ADAPTER_HEDGE_ENABLED:
+            return None
+        tracker = self._latency(endpoint)
+        if len(tracker) < config.ADAPTER_HEDGE_MIN_SAMPLES:
+            return None
+        return tracker.quantile(config.ADAPTER_HEDGE_QUANTILE)
+
+    def _allow_hedge(self, endpoint: str) -> bool:
+        # counts = [calls, hedges]; duplicates are capped at ADAPTER_HEDGE_MAX_RATIO of the calls.
+        counts = self._hedge_counts.setdefault(endpoint, [0, 0])
+        if counts[1] + 1 > config.ADAPTER_HEDGE_MAX_RATIO * counts[0]:
+            return False
+        counts[1] += 1
+        return True
+
+    async def _with_retry(self, operation_name: str, operation, hedge: bool = False):
+        await self._attach_session()
+        endpoint = operation_name.split(":", 1)[0]
+        breaker = self._breaker(endpoint)
+        attempts = max(1, config.ADAPTER_RETRY_ATTEMPTS)
+        base_delay = max(0.1, config.ADAPTER_RETRY_BASE_DELAY_SECONDS)
+        for attempt in range(1, attempts + 1):
+            if not breaker.allow():
+                raise CircuitOpenError(f"{self.exchange_id}:{endpoint} circuit is open, skipping {operation_name}")
+            delay = self._hedge_delay(endpoint) if hedge else None
+            self._hedge_counts.setdefault(endpoint, [0, 0])[0] += 1
+            started = time.monotonic()
+            settled = False
+            try:
+                if delay is None:
+                    result = await operation()
+                else:
+                    result = await hedged(operation, delay, lambda: self._allow_hedge(endpoint))
+            except _retryable_errors() as exc:
+                settled = True
+                breaker.record_failure()
+                is_last = attempt == attempts
+                self.logger.warning(
+                    "adapter operation failed (%s) attempt %s/%s: %s",
+                    operation_name,
+                    attempt,
+                    attempts,
+                    exc,
+                )
+                if is_last:
+                    raise
+            except Exception:
+                # The exchange answered (bad symbol, bad params): the endpoint itself is healthy.
+                settled = True
+                breaker.record_success()
+                raise
+            else:
+                settled = True
+                breaker.record_success()
+                self._latency(endpoint).record(time.monotonic() - started)
+                return result
+            finally:
+                if not settled:
+                    breaker.release()
+            await asyncio.sleep(base_delay * (2 ** (attempt - 1)))
+
+    @property
+    def _markets_cache_path(self) -> Path:
+        return config.MARKETS_CACHE_DIR / f"{self.exchange_id}.json"
+
+    def _read_markets_cache(self) -> Optional[Dict[str, Any]]:
+        if config.MARKETS_CACHE_TTL_SECONDS <= 0:
+            return None
+        path = self._markets_cache_path
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            self.logger.warning("ignoring unreadable markets cache: %s", path)
+            return None
+        if time.time() - float(payload.get("saved_at", 0)) > config.MARKETS_CACHE_TTL_SECONDS:
+            return None
+        if not payload.get("markets"):
+            return None
+        return payload
+
+    def _write_markets_cache(self) -> None:
+        if config.MARKETS_CACHE_TTL_SECONDS <= 0:
+            return
+        path = self._markets_cache_path
+        payload = {
+            "saved_at": time.time(),
+            "ccxt_id": self.ccxt_id,
+            "markets": list(self._client.markets.values()),
+            "currencies": dict(getattr(self._client, "currencies", None) or {}),
+        }
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(payload, default=str), encoding="utf-8")
+            os.replace(tmp_path, path)
+        except OSError:
+            self.logger.warning("failed to write markets cache: %s", path, exc_info=True)
+
+    async def _refresh_markets(self) -> None:
+        try:
+            await self._with_retry("load_markets", lambda: self._client.load_markets(reload=True))
+        except Exception:
+            self.logger.warning("background markets validation failed, keeping cached markets", exc_info=True)
+            return
+        self._write_markets_cache()
+        self._symbols_cached_at = 0.0
+
+    async def _ensure_markets_loaded(self) -> None:
+        if self._markets_loaded:
+            return
+        cached = self._read_markets_cache()
+        if cached is not None and cached.get("ccxt_id") == self.ccxt_id:
+            # Serve the scan from the on-disk copy right away and revalidate in the background.
+            self._client.set_markets(cached["markets"], cached.get("currencies") or None)
+            self._markets_loaded = True
+            self._markets_refresh_task = asyncio.create_task(self._refresh_markets())
+            return
+        await self._with_retry("load_markets", self._client.load_markets)
+        self._markets_loaded = True
+        self._write_markets_cache()
+
+    # Per-exchange hooks.
+
+    def _is_scannable_market(self, market: Dict[str, Any]) -> bool:
+        return bool(market.get("active") and market.get("swap") and market.get("linear") and market.get("quote") == "USDT")
+
+    def _open_interest_history_params(self, days: int) -> Dict[str, Any]:
+        return {"timeframe": "1d", "limit": days}
+
+    def _parse_open_interest_point(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        return {"ts": item.get("timestamp", 0), "oi": item.get("openInterestAmount", 0)}
+
+    def _parse_premium_index(self, item: Dict[str, Any]) -> Optional[Dict[str, float]]:
+        if item.get("fundingRate") is None:
+            return None
+        return {
+            "funding_rate": float(item["fundingRate"]),
+            "mark_price": float(item.get("markPrice") or 0.0),
+            "index_price": float(item.get("indexPrice") or 0.0),
+            "next_funding_ms": int(item.get("nextFundingTimestamp") or item.get("fundingTimestamp") or 0),
+            "ts": int(item.get("timestamp") or 0),
+        }
+
+    def _set_universe(self, symbols: List[str], now: float) -> None:
+        self._universe = symbols
+        if 0 < config.TOP_SYMBOLS_LIMIT < len(symbols):
+            kept = set(symbols[: config.TOP_SYMBOLS_LIMIT]) | self._new_listings
+            self._symbols_cache = [symbol for symbol in symbols if symbol in kept]
+        else:
+            self._symbols_cache = list(symbols)
+        self._symbols_cached_at = now
+
+    async def list_symbols(self) -> List[str]:
+        await self._ensure_markets_loaded()
+        now = time.monotonic()
+        if self._symbols_cache and now - self._symbols_cached_at < config.SYMBOLS_CACHE_TTL_SECONDS:
+            return list(self._symbols_cache)
+
+        symbols: List[str] = []
+        for market in self._client.markets.values():
+            if self._is_scannable_market(market):
+                symbols.append(str(market["symbol"]))
+                symbol_registry.register_market(self.exchange_id, market)
+
+        symbols.sort(key=lambda item: str(item))
+        self._set_universe(symbols, now)
+        return list(self._symbols_cache)
+
+    async def refresh_universe(self) -> List[UniverseEvent]:
+        """Diff a plain ``fetch_markets`` against the current universe and apply only the changes.
+
+        Unlike ``load_markets(reload=True)`` this skips currencies and leaves the client's market
+        index untouched unless a symbol was actually listed or delisted.
+        """
+        if not self._universe:
+            await self.list_symbols()
+        markets = await self._with_retry("fetch_markets", lambda: self._client.fetch_markets())
+        scannable = {str(market["symbol"]): market for market in markets if self._is_scannable_market(market)}
+        known = set(self._universe)
+        listed = sorted(symbol for symbol in scannable if symbol not in known)
+        delisted = [symbol for symbol in self._universe if symbol not in scannable]
+        if not listed and not delisted:
+            return []
+
+        self._client.set_markets(markets, getattr(self._client, "currencies", None) or None)
+        universe = [symbol for symbol in self._universe if symbol in scannable] if delisted else list(self._universe)
+        for symbol in listed:
+            bisect.insort(universe, symbol)
+            symbol_registry.register_market(self.exchange_id, scannable[symbol])
+        self._new_listings.update(listed)
+        self._new_listings.difference_update(delisted)
+        self._set_universe(universe, time.monotonic())
+        self._write_markets_cache()
+        for symbol in delisted:
+            for key in [key for key in self._ohlcv_cache if key[0] == symbol]:
+                del self._ohlcv_cache[key]
+
+        detected_at = datetime.now(timezone.utc)
+        self.logger.info("universe changed: listed=%s delisted=%s", listed, delisted)
+        return [
+            UniverseEvent(kind, symbol_registry.intern(self.exchange_id, symbol, market_type="linear_perp"), detected_at)
+            for kind, symbols in (("listed", listed), ("delisted", delisted))
+            for symbol in symbols
+        ]
+
+    def _cached_ohlcv(self, key: Tuple[str, str], limit: int) -> Optional[List[List[Any]]]:
+        cached = self._ohlcv_cache.get(key)
+        if cached is None:
+            return None
+        fetched_at, fetched_limit, candles = cached
+        now = time.time()
+        # A cached response is reused only inside the same candle bucket so a freshly closed
+        # candle is never served from a fetch made before it closed.
+        timeframe_seconds = self._client.parse_timeframe(key[1])
+        if (
+            fetched_limit < limit
+            or now - fetched_at >= config.OHLCV_CACHE_TTL_SECONDS
+            or int(now // timeframe_seconds) != int(fetched_at // timeframe_seconds)
+        ):
+            return None
+        return candles[-limit:]
+
+    async def _fetch_ohlcv_uncached(self, symbol: str, timeframe: str, limit: int) -> List[List[Any]]:
+        await self._ensure_markets_loaded()
+
+        async def _op():
+            return await self._client.fetch_ohlcv(symbol, timeframe=timeframe, limit=limit)
+
+        return await self._with_retry(f"fetch_ohlcv:{symbol}:{timeframe}", _op, hedge=True)
+
+    async def fetch_ohlcv(self, symbol: str, timeframe: str, limit: int) -> List[List[Any]]:
+        if config.OHLCV_CACHE_TTL_SECONDS <= 0 or limit <= 0:
+            return await self._fetch_ohlcv_uncached(symbol, timeframe, limit)
+
+        # Scanners run concurrently over the same symbols; an identical or wider kline request that
+        # is cached or already in flight serves the narrower one instead of a second round trip.
+        key = (symbol, timeframe)
+        cached = self._cached_ohlcv(key, limit)
+        if cached is not None:
+            return cached
+        inflight = self._ohlcv_inflight.get(key)
+        if inflight is not None and inflight[0] >= limit:
+            candles = await asyncio.shield(inflight[1])
+            return candles[-limit:]
+
+        started_at = time.time()
+        future = asyncio.ensure_future(self._fetch_ohlcv_uncached(symbol, timeframe, limit))
+        self._ohlcv_inflight[key] = (limit, future)
+        try:
+            candles = await asyncio.shield(future)
+        finally:
+            if self._ohlcv_inflight.get(key, (0, None))[1] is future:
+                del self._ohlcv_inflight[key]
+        self._ohlcv_cache[key] = (started_at, limit, candles)
+        return candles[-limit:]
+
+    async def fetch_open_interest_history(self, symbol: str, days: int) -> List[Dict[str, Any]]:
+        await self._ensure_markets_loaded()
+        params = self._open_interest_history_params(days)
+
+        async def _op():
+            return await self._client.fetch_open_interest_history(symbol, **params)
+
+        history = await self._with_retry(f"fetch_open_interest_history:{symbol}", _op, hedge=True)
+        return [self._parse_open_interest_point(item) for item in history]
+
+    async def fetch_premium_index(self) -> Dict[str, Dict[str, float]]:
+        await self._ensure_markets_loaded()
+        if not getattr(self._client, "has", {}).get("fetchFundingRates"):
+            return {}
+        rates = await self._with_retry("fetch_funding_rates", lambda: self._client.fetch_funding_rates())
+        scannable = set(await self.list_symbols())
+        result: Dict[str, Dict[str, float]] = {}
+        for symbol, item in (rates or {}).items():
+            if symbol not in scannable:
+                continue
+            parsed = self._parse_premium_index(item)
+            if parsed is not None:
+                result[symbol] = parsed
+        return result
+
+    async def fetch_24h_quote_volumes(self) -> Dict[str, float]:
+        await self._ensure_markets_loaded()
+        if not getattr(self._client, "has", {}).get("fetchTickers"):
+            return {}
+        tickers = await self._with_retry("fetch_tickers", lambda: self._client.fetch_tickers())
+        return {
+            str(symbol): float(ticker["quoteVolume"])
+            for symbol, ticker in tickers.items()
+            if ticker.get("quoteVolume") is not None
+        }
+
+    async def close(self) -> None:
+        if self._markets_refresh_task is not None and not self._markets_refresh_task.done():
+            self._markets_refresh_task.cancel()
+            try:
+                await self._markets_refresh_task
+            except asyncio.CancelledError:
+                pass
+            except Exception:
+                self.logger.exception("background markets refresh failed")
+        if self._client_instance is None:
+            return
+        try:
+            await self._client.close()
+        finally:
+            if self._session_attached:
+                self._session_attached = False
+                await self._http_session.release()
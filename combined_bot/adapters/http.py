@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import ssl
+from dataclasses import dataclass
+from typing import List, Optional
+
+import aiohttp
+
+from .. import config
+
+try:
+    import certifi
+except ImportError:  # pragma: no cover - certifi ships with ccxt
+    certifi = None
+
+
+@dataclass
+class RequestStats:
+    """Request and payload byte counters fed by an aiohttp trace config."""
+
+    requests: int = 0
+    errors: int = 0
+    bytes_sent: int = 0
+    bytes_received: int = 0
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        trace = aiohttp.TraceConfig()
+
+        async def _on_request_end(session, context, params) -> None:
+            self.requests += 1
+
+        async def _on_request_exception(session, context, params) -> None:
+            self.requests += 1
+            self.errors += 1
+
+        async def _on_chunk_sent(session, context, params) -> None:
+            self.bytes_sent += len(params.chunk)
+
+        async def _on_chunk_received(session, context, params) -> None:
+            self.bytes_received += len(params.chunk)
+
+        trace.on_request_end.append(_on_request_end)
+        trace.on_request_exception.append(_on_request_exception)
+        trace.on_request_chunk_sent.append(_on_chunk_sent)
+        trace.on_response_chunk_received.append(_on_chunk_received)
+        return trace
+
+
+class SharedHttpSession:
+    """One keep-alive aiohttp session shared by every exchange adapter.
+
+    The session is created lazily inside the running event loop and closed when
+    the last adapter releases it.
+    """
+
+    def __init__(
+        self,
+        limit: Optional[int] = None,
+        limit_per_host: Optional[int] = None,
+        dns_cache_ttl_seconds: Optional[int] = None,
+        keepalive_timeout_seconds: Optional[float] = None,
+    ) -> None:
+        self.limit = config.HTTP_POOL_LIMIT if limit is None else limit
+        self.limit_per_host = config.HTTP_POOL_LIMIT_PER_HOST if limit_per_host is None else limit_per_host
+        self.dns_cache_ttl_seconds = (
+            config.HTTP_DNS_CACHE_TTL_SECONDS if dns_cache_ttl_seconds is None else dns_cache_ttl_seconds
+        )
+        self.keepalive_timeout_seconds = (
+            config.HTTP_KEEPALIVE_TIMEOUT_SECONDS if keepalive_timeout_seconds is None else keepalive_timeout_seconds
+        )
+        self.trace_configs: List[aiohttp.TraceConfig] = []
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._users = 0
+
+    def _build_ssl_context(self) -> ssl.SSLContext:
+        if certifi is not None:
+            return ssl.create_default_context(cafile=certifi.where())
+        return ssl.create_default_context()
+
+    def _build_session(self) -> aiohttp.ClientSession:
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            ttl_dns_cache=self.dns_cache_ttl_seconds,
+            use_dns_cache=True,
+            keepalive_timeout=self.keepalive_timeout_seconds,
+            enable_cleanup_closed=True,
+            ssl=self._build_ssl_context(),
+        )
+        return aiohttp.ClientSession(connector=connector, trace_configs=list(self.trace_configs) or None)
+
+    @property
+    def session(self) -> Optional[aiohttp.ClientSession]:
+        return self._session
+
+    async def acquire(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = self._build_session()
+        self._users += 1
+        return self._session
+
+    async def release(self) -> None:
+        self._users = max(0, self._users - 1)
+        if self._users or self._session is None:
+            return
+        session, self._session = self._session, None
+        await session.close()
+
+
+shared_http_session = SharedHttpSession()
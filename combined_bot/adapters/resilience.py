@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import asyncio
+import bisect
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, List, Optional
+
+from .. import config
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling an endpoint whose circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """Error-rate circuit breaker for one exchange endpoint.
+
+    Outcomes of the last ``window`` calls are kept. Once at least ``min_calls``
+    are known and the failure share reaches ``error_rate``, the breaker opens
+    and calls fail fast for ``open_seconds``. After that a single probe call is
+    let through (half-open): success closes the breaker, failure reopens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        error_rate: Optional[float] = None,
+        min_calls: Optional[int] = None,
+        window: Optional[int] = None,
+        open_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.error_rate = config.ADAPTER_BREAKER_ERROR_RATE if error_rate is None else error_rate
+        self.min_calls = max(1, config.ADAPTER_BREAKER_MIN_CALLS if min_calls is None else min_calls)
+        self.open_seconds = config.ADAPTER_BREAKER_OPEN_SECONDS if open_seconds is None else open_seconds
+        self._outcomes: Deque[bool] = deque(maxlen=max(self.min_calls, config.ADAPTER_BREAKER_WINDOW if window is None else window))
+        self._failures = 0
+        self._clock = clock
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self.state = self.CLOSED
+
+    def allow(self) -> bool:
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN:
+            if self._clock() - self._opened_at < self.open_seconds:
+                return False
+            self.state = self.HALF_OPEN
+        if self._probe_in_flight:
+            return False
+        self._probe_in_flight = True
+        return True
+
+    def release(self) -> None:
+        """Give back a half-open probe slot when the call ended without a health verdict (e.g. cancelled)."""
+        if self.state == self.HALF_OPEN:
+            self._probe_in_flight = False
+
+    def _trip(self) -> None:
+        self.state = self.OPEN
+        self._opened_at = self._clock()
+        self._probe_in_flight = False
+
+    def _reset(self) -> None:
+        self.state = self.CLOSED
+        self._outcomes.clear()
+        self._failures = 0
+        self._probe_in_flight = False
+
+    def _append(self, failed: bool) -> None:
+        if len(self._outcomes) == self._outcomes.maxlen and self._outcomes[0]:
+            self._failures -= 1
+        self._outcomes.append(failed)
+        self._failures += int(failed)
+
+    def record_success(self) -> None:
+        if self.state == self.HALF_OPEN:
+            self._reset()
+            return
+        self._append(False)
+
+    def record_failure(self) -> None:
+        if self.state == self.HALF_OPEN:
+            self._trip()
+            return
+        self._append(True)
+        if len(self._outcomes) >= self.min_calls and self._failures / len(self._outcomes) >= self.error_rate:
+            self._trip()
+
+
+class LatencyTracker:
+    """Sliding window of successful call latencies with an O(window) quantile lookup."""
+
+    def __init__(self, window: int = 200) -> None:
+        self._recent: Deque[float] = deque(maxlen=window)
+        self._sorted: List[float] = []
+
+    def __len__(self) -> int:
+        return len(self._recent)
+
+    def record(self, seconds: float) -> None:
+        if len(self._recent) == self._recent.maxlen:
+            oldest = self._recent[0]
+            del self._sorted[bisect.bisect_left(self._sorted, oldest)]
+        self._recent.append(seconds)
+        bisect.insort(self._sorted, seconds)
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self._sorted:
+            return None
+        return self._sorted[min(len(self._sorted) - 1, int(q * (len(self._sorted) - 1)))]
+
+
+async def hedged(
+    operation: Callable[[], Awaitable[Any]], delay: float, allow_hedge: Callable[[], bool] = lambda: True
+) -> Any:
+    """Run ``operation``; if it has not finished after ``delay`` seconds, start a duplicate.
+
+    The first successful result wins and the other call is cancelled. If one
+    call fails, the other is still awaited; only when both fail is the first
+    error raised. ``allow_hedge`` is asked when the delay expires so callers
+    can cap the share of duplicated requests.
+    """
+    primary = asyncio.ensure_future(operation())
+    tasks = [primary]
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        if not done and allow_hedge():
+            tasks.append(asyncio.ensure_future(operation()))
+        first_error: Optional[BaseException] = None
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                if first_error is None:
+                    first_error = task.exception()
+        assert first_error is not None
+        raise first_error
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
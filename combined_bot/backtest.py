@@ -0,0 +1,385 @@
+"""Vectorized historical backtest for the volume, price and OI scanner rules.
+
+The rules mirror ``VolumeSpikeScanner``, ``PricePumpScanner`` and
+``OpenInterestScanner`` but are evaluated for every closed bar of every
+archived symbol at once with sliding-window array operations.
+
+Archive layout: one ``<SYMBOL>.npz`` file per symbol with the arrays
+``ohlcv_1h`` (N x 6), and optionally ``ohlcv_1d`` (N x 6) and ``oi_1d``
+(M x 2, ``[ts_ms, open_interest]``).
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field, fields, replace
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from . import config
+
+DEFAULT_HORIZONS_HOURS = (1, 4, 24)
+
+_TS, _OPEN, _HIGH, _LOW, _CLOSE, _VOLUME = range(6)
+
+
+@dataclass(frozen=True)
+class SymbolHistory:
+    symbol: str
+    ohlcv_1h: np.ndarray
+    ohlcv_1d: Optional[np.ndarray] = None
+    oi_1d: Optional[np.ndarray] = None
+
+
+@dataclass(frozen=True)
+class ParamSet:
+    min_vol_usd_last: float = config.MIN_VOL_USD_LAST
+    min_vol_ratio: float = config.MIN_VOL_RATIO
+    min_price_ratio: float = config.MIN_PRICE_RATIO
+    min_price_vol_usd_24h: float = config.MIN_PRICE_SCANNER_VOL_USD_24H
+    oi_days: int = config.OI_DAYS
+    oi_growth_pct: float = config.OI_GROWTH_PCT
+    oi_max_price_growth_pct: float = config.OI_MAX_PRICE_GROWTH_PCT
+    oi_min_avg_daily_vol_usd: float = config.OI_MIN_AVG_DAILY_VOL_USD
+
+
+@dataclass
+class RuleMetrics:
+    timeframe_hours: int
+    symbol_idx: np.ndarray
+    close_ts: np.ndarray
+    values: Dict[str, np.ndarray] = field(default_factory=dict)
+    forward_returns: Dict[int, np.ndarray] = field(default_factory=dict)
+
+    @classmethod
+    def concat(cls, timeframe_hours: int, parts: List["RuleMetrics"], horizons: Sequence[int]) -> "RuleMetrics":
+        if not parts:
+            empty_f = np.empty(0, dtype=np.float64)
+            return cls(
+                timeframe_hours=timeframe_hours,
+                symbol_idx=np.empty(0, dtype=np.int32),
+                close_ts=np.empty(0, dtype=np.int64),
+                forward_returns={h: empty_f for h in horizons},
+            )
+        return cls(
+            timeframe_hours=timeframe_hours,
+            symbol_idx=np.concatenate([p.symbol_idx for p in parts]),
+            close_ts=np.concatenate([p.close_ts for p in parts]),
+            values={name: np.concatenate([p.values[name] for p in parts]) for name in parts[0].values},
+            forward_returns={h: np.concatenate([p.forward_returns[h] for p in parts]) for h in horizons},
+        )
+
+
+def save_symbol_history(directory: Path, history: SymbolHistory) -> Path:
+    directory.mkdir(parents=True, exist_ok=True)
+    arrays: Dict[str, np.ndarray] = {"ohlcv_1h": np.asarray(history.ohlcv_1h, dtype=np.float64)}
+    if history.ohlcv_1d is not None:
+        arrays["ohlcv_1d"] = np.asarray(history.ohlcv_1d, dtype=np.float64)
+    if history.oi_1d is not None:
+        arrays["oi_1d"] = np.asarray(history.oi_1d, dtype=np.float64)
+    path = directory / f"{history.symbol}.npz"
+    np.savez(path, **arrays)
+    return path
+
+
+def load_archive(directory: Path, symbols: Optional[Iterable[str]] = None) -> List[SymbolHistory]:
+    wanted = {item.upper() for item in symbols} if symbols else None
+    histories: List[SymbolHistory] = []
+    for path in sorted(directory.glob("*.npz")):
+        symbol = path.stem.upper()
+        if wanted is not None and symbol not in wanted:
+            continue
+        with np.load(path) as data:
+            histories.append(
+                SymbolHistory(
+                    symbol=symbol,
+                    ohlcv_1h=np.asarray(data["ohlcv_1h"], dtype=np.float64),
+                    ohlcv_1d=np.asarray(data["ohlcv_1d"], dtype=np.float64) if "ohlcv_1d" in data else None,
+                    oi_1d=np.asarray(data["oi_1d"], dtype=np.float64) if "oi_1d" in data else None,
+                )
+            )
+    return histories
+
+
+def _window_sum(values: np.ndarray, window: int) -> np.ndarray:
+    # Entry j is the sum of values[j : j + window].
+    cumulative = np.concatenate(([0.0], np.cumsum(values, dtype=np.float64)))
+    return cumulative[window:] - cumulative[:-window]
+
+
+def _forward_returns(closes: np.ndarray, first_index: int, bars: int) -> np.ndarray:
+    entry = closes[first_index:]
+    result = np.full(entry.shape, np.nan, dtype=np.float64)
+    if bars <= 0:
+        return result
+    if bars < entry.shape[0]:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            result[:-bars] = entry[bars:] / entry[:-bars] - 1.0
+    return result
+
+
+def _safe_ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(denominator > 0, numerator / np.where(denominator > 0, denominator, 1.0), np.nan)
+
+
+def volume_metrics(candles: np.ndarray, symbol_idx: int, horizons: Sequence[int]) -> Optional[RuleMetrics]:
+    # Mirrors VolumeSpikeScanner: 48 closed 1h candles, previous 24h vs last 24h USD volume.
+    n = candles.shape[0]
+    if n < 48:
+        return None
+    usd = candles[:, _CLOSE] * candles[:, _VOLUME]
+    sums_24 = _window_sum(usd, 24)
+    last_usd = sums_24[24:]
+    prev_usd = sums_24[:-24]
+    closes = candles[:, _CLOSE]
+    return RuleMetrics(
+        timeframe_hours=1,
+        symbol_idx=np.full(n - 47, symbol_idx, dtype=np.int32),
+        close_ts=candles[47:, _TS].astype(np.int64),
+        values={"last_24h_volume_usd": last_usd, "ratio": _safe_ratio(last_usd, prev_usd)},
+        forward_returns={h: _forward_returns(closes, 47, h) for h in horizons},
+    )
+
+
+def price_metrics(candles: np.ndarray, symbol_idx: int, horizons: Sequence[int]) -> Optional[RuleMetrics]:
+    # Mirrors PricePumpScanner: 24 closed 1h candles, last close vs first close.
+    n = candles.shape[0]
+    if n < 24:
+        return None
+    closes = candles[:, _CLOSE]
+    usd = closes * candles[:, _VOLUME]
+    return RuleMetrics(
+        timeframe_hours=1,
+        symbol_idx=np.full(n - 23, symbol_idx, dtype=np.int32),
+        close_ts=candles[23:, _TS].astype(np.int64),
+        values={"price_ratio": _safe_ratio(closes[23:], closes[:-23]), "volume_usd": _window_sum(usd, 24)},
+        forward_returns={h: _forward_returns(closes, 23, h) for h in horizons},
+    )
+
+
+def oi_metrics(
+    candles: np.ndarray,
+    oi_hist: np.ndarray,
+    days: int,
+    symbol_idx: int,
+    horizons: Sequence[int],
+) -> Optional[RuleMetrics]:
+    # Mirrors OpenInterestScanner: OI growth, price growth and average USD volume over an OI_DAYS window.
+    if days < 2:
+        return None
+    common_ts, candle_pos, oi_pos = np.intersect1d(candles[:, _TS], oi_hist[:, 0], return_indices=True)
+    n = common_ts.shape[0]
+    if n < days:
+        return None
+    closes = candles[candle_pos, _CLOSE]
+    usd = closes * candles[candle_pos, _VOLUME]
+    oi_values = oi_hist[oi_pos, 1]
+    start = days - 1
+    oi_growth = _safe_ratio(oi_values[start:] - oi_values[:-start], oi_values[:-start]) * 100
+    price_growth = _safe_ratio(closes[start:] - closes[:-start], closes[:-start]) * 100
+    return RuleMetrics(
+        timeframe_hours=24,
+        symbol_idx=np.full(n - start, symbol_idx, dtype=np.int32),
+        close_ts=common_ts[start:].astype(np.int64),
+        values={
+            "oi_growth_pct": oi_growth,
+            "price_growth_pct": price_growth,
+            "avg_daily_vol_usd": _window_sum(usd, days) / days,
+        },
+        forward_returns={h: _forward_returns(closes, start, h // 24) for h in horizons},
+    )
+
+
+class BacktestDataset:
+    def __init__(self, histories: Sequence[SymbolHistory], horizons: Sequence[int] = DEFAULT_HORIZONS_HOURS) -> None:
+        self.histories = list(histories)
+        self.horizons = tuple(horizons)
+        self.volume = RuleMetrics.concat(
+            1, self._collect(lambda idx, h: volume_metrics(h.ohlcv_1h, idx, self.horizons)), self.horizons
+        )
+        self.price = RuleMetrics.concat(
+            1, self._collect(lambda idx, h: price_metrics(h.ohlcv_1h, idx, self.horizons)), self.horizons
+        )
+        self._oi_by_days: Dict[int, RuleMetrics] = {}
+
+    def _collect(self, builder) -> List[RuleMetrics]:
+        parts: List[RuleMetrics] = []
+        for idx, history in enumerate(self.histories):
+            metrics = builder(idx, history)
+            if metrics is not None:
+                parts.append(metrics)
+        return parts
+
+    def oi(self, days: int) -> RuleMetrics:
+        cached = self._oi_by_days.get(days)
+        if cached is None:
+            cached = RuleMetrics.concat(
+                24,
+                self._collect(
+                    lambda idx, h: oi_metrics(h.ohlcv_1d, h.oi_1d, days, idx, self.horizons)
+                    if h.ohlcv_1d is not None and h.oi_1d is not None
+                    else None
+                ),
+                self.horizons,
+            )
+            self._oi_by_days[days] = cached
+        return cached
+
+
+def volume_mask(metrics: RuleMetrics, params: ParamSet) -> np.ndarray:
+    values = metrics.values
+    if not values:
+        return np.zeros(0, dtype=bool)
+    return (values["last_24h_volume_usd"] >= params.min_vol_usd_last) & (values["ratio"] >= params.min_vol_ratio)
+
+
+def price_mask(metrics: RuleMetrics, params: ParamSet) -> np.ndarray:
+    values = metrics.values
+    if not values:
+        return np.zeros(0, dtype=bool)
+    return (values["price_ratio"] >= params.min_price_ratio) & (values["volume_usd"] >= params.min_price_vol_usd_24h)
+
+
+def oi_mask(metrics: RuleMetrics, params: ParamSet) -> np.ndarray:
+    values = metrics.values
+    if not values:
+        return np.zeros(0, dtype=bool)
+    return (
+        (values["oi_growth_pct"] >= params.oi_growth_pct)
+        & (values["price_growth_pct"] <= params.oi_max_price_growth_pct)
+        & (values["avg_daily_vol_usd"] >= params.oi_min_avg_daily_vol_usd)
+    )
+
+
+def summarize(metrics: RuleMetrics, mask: np.ndarray) -> Dict[str, Any]:
+    # An episode is a run of consecutive signalling bars of the same symbol.
+    previous = np.zeros_like(mask)
+    if mask.shape[0] > 1:
+        same_symbol = metrics.symbol_idx[1:] == metrics.symbol_idx[:-1]
+        previous[1:] = mask[:-1] & same_symbol
+    summary: Dict[str, Any] = {
+        "signals": int(mask.sum()),
+        "episodes": int((mask & ~previous).sum()),
+        "symbols": int(np.unique(metrics.symbol_idx[mask]).shape[0]),
+    }
+    for horizon, returns in metrics.forward_returns.items():
+        selected = returns[mask]
+        selected = selected[~np.isnan(selected)]
+        key = f"fwd_{horizon}h"
+        if selected.shape[0] == 0:
+            summary[f"{key}_mean"] = None
+            summary[f"{key}_median"] = None
+            summary[f"{key}_hit_rate"] = None
+            continue
+        summary[f"{key}_mean"] = float(selected.mean())
+        summary[f"{key}_median"] = float(np.median(selected))
+        summary[f"{key}_hit_rate"] = float((selected > 0).mean())
+    return summary
+
+
+def evaluate(dataset: BacktestDataset, params: ParamSet) -> Dict[str, Any]:
+    oi = dataset.oi(params.oi_days)
+    return {
+        "params": asdict(params),
+        "vol_spike": summarize(dataset.volume, volume_mask(dataset.volume, params)),
+        "price_pump": summarize(dataset.price, price_mask(dataset.price, params)),
+        "oi_spike": summarize(oi, oi_mask(oi, params)),
+    }
+
+
+def build_grid(base: ParamSet, grid: Dict[str, Sequence[Any]]) -> List[ParamSet]:
+    if not grid:
+        return [base]
+    names = list(grid)
+    return [replace(base, **dict(zip(names, combo))) for combo in itertools.product(*(grid[name] for name in names))]
+
+
+_WORKER_DATASET: Optional[BacktestDataset] = None
+
+
+def _init_worker(archive: str, symbols: Optional[List[str]], horizons: Tuple[int, ...]) -> None:
+    global _WORKER_DATASET
+    _WORKER_DATASET = BacktestDataset(load_archive(Path(archive), symbols), horizons)
+
+
+def _evaluate_chunk(chunk: List[ParamSet]) -> List[Dict[str, Any]]:
+    assert _WORKER_DATASET is not None
+    return [evaluate(_WORKER_DATASET, params) for params in chunk]
+
+
+def run_backtest(
+    archive: Path,
+    param_sets: Sequence[ParamSet],
+    symbols: Optional[List[str]] = None,
+    horizons: Sequence[int] = DEFAULT_HORIZONS_HOURS,
+    workers: int = 1,
+) -> List[Dict[str, Any]]:
+    horizons = tuple(horizons)
+    if workers <= 1 or len(param_sets) <= 1:
+        dataset = BacktestDataset(load_archive(archive, symbols), horizons)
+        return [evaluate(dataset, params) for params in param_sets]
+
+    # Each worker loads the archive and precomputes the rolling metrics once; parameter
+    # sets are then only threshold comparisons over the precomputed arrays.
+    chunk_size = max(1, len(param_sets) // (workers * 4))
+    chunks = [list(param_sets[i : i + chunk_size]) for i in range(0, len(param_sets), chunk_size)]
+    results: List[Dict[str, Any]] = []
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(str(archive), symbols, horizons),
+    ) as pool:
+        for chunk_result in pool.map(_evaluate_chunk, chunks):
+            results.extend(chunk_result)
+    return results
+
+
+def _parse_grid(items: Sequence[str]) -> Dict[str, List[Any]]:
+    types = {item.name: item.type for item in fields(ParamSet)}
+    grid: Dict[str, List[Any]] = {}
+    for item in items:
+        name, _, raw_values = item.partition("=")
+        name = name.strip()
+        if name not in types:
+            raise ValueError(f"unknown backtest parameter: {name}")
+        cast = int if types[name] in (int, "int") else float
+        grid[name] = [cast(value) for value in raw_values.split(",") if value.strip()]
+    return grid
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Vectorized backtest of the scanner rules over archived candles.")
+    parser.add_argument("--archive", type=Path, required=True, help="directory with <SYMBOL>.npz files")
+    parser.add_argument("--grid", action="append", default=[], help="parameter grid, e.g. min_vol_ratio=3,4,5")
+    parser.add_argument("--symbols", default="", help="comma-separated symbol subset")
+    parser.add_argument("--horizons", default=",".join(str(h) for h in DEFAULT_HORIZONS_HOURS))
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=getattr(logging, config.LOG_LEVEL, logging.INFO))
+    param_sets = build_grid(ParamSet(), _parse_grid(args.grid))
+    symbols = [item.strip().upper() for item in args.symbols.split(",") if item.strip()] or None
+    horizons = tuple(int(item) for item in args.horizons.split(",") if item.strip())
+
+    started = time.monotonic()
+    results = run_backtest(args.archive, param_sets, symbols=symbols, horizons=horizons, workers=args.workers)
+    for row in results:
+        sys.stdout.write(json.dumps(row, sort_keys=True) + "\n")
+    logging.getLogger(__name__).info(
+        "backtest finished param_sets=%s duration_sec=%.2f", len(param_sets), time.monotonic() - started
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -5,11 +5,17 @@ from pathlib import Path
 
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
 DATABASE_PATH = Path(os.getenv("DATABASE_PATH", "signals.sqlite3"))
+SIGNAL_JOURNAL_RETENTION_DAYS = int(os.getenv("SIGNAL_JOURNAL_RETENTION_DAYS", "90"))
+SIGNAL_ROLLUP_RETENTION_DAYS = int(os.getenv("SIGNAL_ROLLUP_RETENTION_DAYS", "730"))
 SCAN_INTERVAL_SECONDS = int(os.getenv("SCAN_INTERVAL_SECONDS", os.getenv("SCAN_INTERVAL", "300")))
 
 TG_BOT_TOKEN = os.getenv("TG_BOT_TOKEN", "").strip()
 _default_chat_id_raw = os.getenv("TG_DEFAULT_CHAT_ID", os.getenv("TG_ADMIN_CHAT_ID", "")).strip()
 TG_DEFAULT_CHAT_ID = int(_default_chat_id_raw) if _default_chat_id_raw else None
+TG_API_BASE_URL = os.getenv("TG_API_BASE_URL", "https://api.telegram.org").strip()
+TG_SEND_CONCURRENCY = int(os.getenv("TG_SEND_CONCURRENCY", "16"))
+TG_SEND_MAX_RETRIES = int(os.getenv("TG_SEND_MAX_RETRIES", "3"))
+TG_REQUEST_TIMEOUT_SECONDS = float(os.getenv("TG_REQUEST_TIMEOUT_SECONDS", "10"))
 
 MIN_VOL_USD_LAST = float(os.getenv("MIN_VOL_USD_LAST", "20000000"))
 MIN_VOL_RATIO = float(os.getenv("MIN_VOL_RATIO", "5.0"))
@@ -22,19 +28,71 @@ OI_GROWTH_PCT = float(os.getenv("OI_GROWTH_PCT", "50"))
 
 OI_MAX_PRICE_GROWTH_PCT = float(os.getenv("OI_MAX_PRICE_GROWTH_PCT", "50"))
 OI_MIN_AVG_DAILY_VOL_USD = float(os.getenv("OI_MIN_AVG_DAILY_VOL_USD", "5000000"))
+# Opt-in: a quiet last 24h does not bound the OI_DAYS average, so any value > 0 can change results.
+OI_MIN_TICKER_VOL_USD = float(os.getenv("OI_MIN_TICKER_VOL_USD", "0"))
 OI_SORT_BY = os.getenv("OI_SORT_BY", "oi_usd").strip().lower()
 _ALLOWED_OI_SORT_MODES = {"oi_usd", "oi_contracts", "price_growth", "avg_daily_vol_usd"}
 if OI_SORT_BY not in _ALLOWED_OI_SORT_MODES:
     OI_SORT_BY = "oi_usd"
 
+FUNDING_ZSCORE = float(os.getenv("FUNDING_ZSCORE", "3.0"))
+FUNDING_MIN_ABS_RATE = float(os.getenv("FUNDING_MIN_ABS_RATE", "0.0005"))
+BASIS_MIN_ABS_PCT = float(os.getenv("BASIS_MIN_ABS_PCT", "0.5"))
+FUNDING_HISTORY_SAMPLES = int(os.getenv("FUNDING_HISTORY_SAMPLES", "288"))
+FUNDING_MIN_SAMPLES = int(os.getenv("FUNDING_MIN_SAMPLES", "12"))
+FUNDING_SAMPLE_INTERVAL_SECONDS = float(os.getenv("FUNDING_SAMPLE_INTERVAL_SECONDS", "300"))
+
+ML_MODEL_PATH = Path(os.getenv("ML_MODEL_PATH", "pump_predictor_model.npz"))
+ML_MODEL_SHA256 = os.getenv("ML_MODEL_SHA256", "").strip().lower()
+ML_MIN_SCORE = float(os.getenv("ML_MIN_SCORE", "0.7"))
+ML_WORKERS = int(os.getenv("ML_WORKERS", "1"))
+ML_WORKER_MIN_ROWS = int(os.getenv("ML_WORKER_MIN_ROWS", "256"))
+
+CYCLE_DEADLINE_FRACTION = float(os.getenv("CYCLE_DEADLINE_FRACTION", "0.8"))
+CYCLE_GRACE_SECONDS = float(os.getenv("CYCLE_GRACE_SECONDS", "5"))
+SCANNER_BUDGET_SECONDS = float(os.getenv("SCANNER_BUDGET_SECONDS", "0"))
+SCANNER_BUDGETS = {
+    name.strip().lower(): float(value)
+    for name, _, value in (item.partition("=") for item in os.getenv("SCANNER_BUDGETS", "").split(",") if "=" in item)
+}
+SCANNER_SYMBOL_CONCURRENCY = int(os.getenv("SCANNER_SYMBOL_CONCURRENCY", "4"))
+
+SCHEDULER_ENABLED = os.getenv("SCHEDULER_ENABLED", "0").strip().lower() in {"1", "true", "yes", "on"}
+SCHEDULER_TICK_SECONDS = int(os.getenv("SCHEDULER_TICK_SECONDS", "30"))
+SCHEDULER_HOT_INTERVAL_SECONDS = float(os.getenv("SCHEDULER_HOT_INTERVAL_SECONDS", "60"))
+SCHEDULER_COLD_INTERVAL_SECONDS = float(os.getenv("SCHEDULER_COLD_INTERVAL_SECONDS", "900"))
+SCHEDULER_REQUEST_BUDGET_PER_MINUTE = float(os.getenv("SCHEDULER_REQUEST_BUDGET_PER_MINUTE", "160"))
+SCHEDULER_HEAT_DECAY = float(os.getenv("SCHEDULER_HEAT_DECAY", "0.5"))
+SCHEDULER_HOT_ZSCORE = float(os.getenv("SCHEDULER_HOT_ZSCORE", "3.0"))
+
 ENABLED_EXCHANGES = [item.strip().lower() for item in os.getenv("ENABLED_EXCHANGES", "binance").split(",") if item.strip()]
 SYMBOLS_CACHE_TTL_SECONDS = int(os.getenv("SYMBOLS_CACHE_TTL_SECONDS", "900"))
+MARKETS_CACHE_DIR = Path(os.getenv("MARKETS_CACHE_DIR", ".markets_cache"))
+MARKETS_CACHE_TTL_SECONDS = int(os.getenv("MARKETS_CACHE_TTL_SECONDS", "86400"))
+UNIVERSE_REFRESH_SECONDS = float(os.getenv("UNIVERSE_REFRESH_SECONDS", "120"))
+LISTING_EVENT_TTL_SECONDS = int(os.getenv("LISTING_EVENT_TTL_SECONDS", str(7 * 24 * 3600)))
+OHLCV_CACHE_TTL_SECONDS = float(os.getenv("OHLCV_CACHE_TTL_SECONDS", "60"))
+BINANCE_FAST_PARSE = os.getenv("BINANCE_FAST_PARSE", "1").strip().lower() in {"1", "true", "yes", "on"}
 TOP_SYMBOLS_LIMIT = int(os.getenv("TOP_SYMBOLS_LIMIT", "200"))
 
 ADAPTER_RETRY_ATTEMPTS = int(os.getenv("ADAPTER_RETRY_ATTEMPTS", "3"))
 ADAPTER_RETRY_BASE_DELAY_SECONDS = float(os.getenv("ADAPTER_RETRY_BASE_DELAY_SECONDS", "1.0"))
 ADAPTER_TIMEOUT_MS = int(os.getenv("ADAPTER_TIMEOUT_MS", "10000"))
 
+ADAPTER_BREAKER_ERROR_RATE = float(os.getenv("ADAPTER_BREAKER_ERROR_RATE", "0.5"))
+ADAPTER_BREAKER_MIN_CALLS = int(os.getenv("ADAPTER_BREAKER_MIN_CALLS", "10"))
+ADAPTER_BREAKER_WINDOW = int(os.getenv("ADAPTER_BREAKER_WINDOW", "50"))
+ADAPTER_BREAKER_OPEN_SECONDS = float(os.getenv("ADAPTER_BREAKER_OPEN_SECONDS", "30"))
+ADAPTER_HEDGE_ENABLED = os.getenv("ADAPTER_HEDGE_ENABLED", "0").strip().lower() in {"1", "true", "yes", "on"}
+ADAPTER_HEDGE_QUANTILE = float(os.getenv("ADAPTER_HEDGE_QUANTILE", "0.95"))
+ADAPTER_HEDGE_MIN_SAMPLES = int(os.getenv("ADAPTER_HEDGE_MIN_SAMPLES", "20"))
+ADAPTER_HEDGE_MAX_RATIO = float(os.getenv("ADAPTER_HEDGE_MAX_RATIO", "0.1"))
+
+HTTP_POOL_LIMIT = int(os.getenv("HTTP_POOL_LIMIT", "100"))
+HTTP_POOL_LIMIT_PER_HOST = int(os.getenv("HTTP_POOL_LIMIT_PER_HOST", "20"))
+HTTP_DNS_CACHE_TTL_SECONDS = int(os.getenv("HTTP_DNS_CACHE_TTL_SECONDS", "300"))
+HTTP_KEEPALIVE_TIMEOUT_SECONDS = float(os.getenv("HTTP_KEEPALIVE_TIMEOUT_SECONDS", "60"))
+
 KNOWN_QUOTE_ASSETS = tuple(
     item.strip().upper()
     for item in os.getenv("KNOWN_QUOTE_ASSETS", "USDT,USDC,BUSD,FDUSD,DAI,TUSD,PAX,USDP").split(",")
@@ -6,20 +6,56 @@ import time
 from contextlib import contextmanager
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Iterator, List
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
 
+from .. import config
 from ..models import SignalEvent, UserSettings
 
+_HOUR_SECONDS = 3600
+_DAY_SECONDS = 86400
+
+
+def _unix(moment: datetime) -> int:
+    return int(moment.timestamp())
+
+
+def _journal_table(day: int) -> str:
+    return "signal_journal_" + datetime.fromtimestamp(day, timezone.utc).strftime("%Y%m%d")
+
 
 class Database:
+    """SQLite state: user settings, dedup keys and the signal journal.
+
+    The journal is split into one table per UTC day (``signal_journal_YYYYMMDD``,
+    listed in ``signal_journal_partitions``) so retention drops whole tables
+    instead of deleting rows. Every write also updates ``signal_rollup_hourly``,
+    and ``signal_rollup_symbol_daily``, which answer the aggregate stats without
+    touching the raw rows.
+    """
+
     _PRUNE_INTERVAL_SECONDS = 3600
+    _KEY_CHUNK_SIZE = 500
 
-    def __init__(self, path: Path) -> None:
+    def __init__(
+        self,
+        path: Path,
+        journal_retention_days: Optional[int] = None,
+        rollup_retention_days: Optional[int] = None,
+    ) -> None:
         self.path = path
         self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.journal_retention_days = (
+            config.SIGNAL_JOURNAL_RETENTION_DAYS if journal_retention_days is None else journal_retention_days
+        )
+        self.rollup_retention_days = (
+            config.SIGNAL_ROLLUP_RETENTION_DAYS if rollup_retention_days is None else rollup_retention_days
+        )
         self._last_prune_at = 0.0
+        self._last_journal_prune_at = 0.0
+        self._journal_days: Set[int] = set()
         self._init_db()
         self.prune_expired_dedup(force=True)
+        self.prune_journal(force=True)
 
     @contextmanager
     def _connect(self) -> Iterator[sqlite3.Connection]:
@@ -42,10 +78,15 @@ class Database:
                     enabled_exchanges TEXT NOT NULL,
                     min_score_threshold REAL NOT NULL,
                     blacklist_symbols TEXT NOT NULL,
-                    timezone TEXT NOT NULL
+                    timezone TEXT NOT NULL,
+                    threshold_profiles TEXT NOT NULL DEFAULT '{}'
                 )
                 """
             )
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(user_settings)")}
+            if "threshold_profiles" not in columns:
+                # Databases created before per-user threshold profiles existed.
+                conn.execute("ALTER TABLE user_settings ADD COLUMN threshold_profiles TEXT NOT NULL DEFAULT '{}'")
             conn.execute(
                 """
                 CREATE TABLE IF NOT EXISTS signal_dedup (
@@ -54,20 +95,52 @@ class Database:
                 )
                 """
             )
+            conn.execute("CREATE TABLE IF NOT EXISTS signal_journal_partitions (day INTEGER PRIMARY KEY)")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS signal_rollup_hourly (
+                    hour INTEGER NOT NULL,
+                    scanner_id TEXT NOT NULL,
+                    alerts INTEGER NOT NULL,
+                    recipients INTEGER NOT NULL,
+                    score_sum REAL NOT NULL,
+                    score_max REAL NOT NULL,
+                    PRIMARY KEY (hour, scanner_id)
+                ) WITHOUT ROWID
+                """
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS signal_rollup_symbol_daily (
+                    day INTEGER NOT NULL,
+                    scanner_id TEXT NOT NULL,
+                    symbol TEXT NOT NULL,
+                    alerts INTEGER NOT NULL,
+                    score_max REAL NOT NULL,
+                    PRIMARY KEY (day, scanner_id, symbol)
+                ) WITHOUT ROWID
+                """
+            )
+            rows = conn.execute("SELECT day FROM signal_journal_partitions").fetchall()
+        self._journal_days = {row["day"] for row in rows}
 
     def upsert_user_settings(self, settings: UserSettings) -> None:
         with self._connect() as conn:
             conn.execute(
                 """
-                INSERT INTO user_settings(chat_id, is_active, enabled_scanners, enabled_exchanges, min_score_threshold, blacklist_symbols, timezone)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
+                INSERT INTO user_settings(
+                    chat_id, is_active, enabled_scanners, enabled_exchanges, min_score_threshold, blacklist_symbols, timezone,
+                    threshold_profiles
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
                 ON CONFLICT(chat_id) DO UPDATE SET
                     is_active=excluded.is_active,
                     enabled_scanners=excluded.enabled_scanners,
                     enabled_exchanges=excluded.enabled_exchanges,
                     min_score_threshold=excluded.min_score_threshold,
                     blacklist_symbols=excluded.blacklist_symbols,
-                    timezone=excluded.timezone
+                    timezone=excluded.timezone,
+                    threshold_profiles=excluded.threshold_profiles
                 """,
                 (
                     settings.chat_id,
@@ -77,6 +150,7 @@ class Database:
                     settings.min_score_threshold,
                     json.dumps(settings.blacklist_symbols),
                     settings.timezone,
+                    json.dumps(settings.threshold_profiles, sort_keys=True),
                 ),
             )
 
@@ -92,6 +166,7 @@ class Database:
                 min_score_threshold=row["min_score_threshold"],
                 blacklist_symbols=json.loads(row["blacklist_symbols"]),
                 timezone=row["timezone"],
+                threshold_profiles=json.loads(row["threshold_profiles"]),
             )
             for row in rows
         ]
@@ -118,3 +193,217 @@ class Database:
                 "INSERT OR REPLACE INTO signal_dedup(dedup_key, expires_at) VALUES (?, ?)",
                 (signal.dedup_key, int(expires.timestamp())),
             )
+
+    def find_duplicate_keys(self, dedup_keys: Sequence[str]) -> Set[str]:
+        self.prune_expired_dedup()
+        found: Set[str] = set()
+        with self._connect() as conn:
+            for start in range(0, len(dedup_keys), self._KEY_CHUNK_SIZE):
+                chunk = dedup_keys[start : start + self._KEY_CHUNK_SIZE]
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT dedup_key FROM signal_dedup WHERE dedup_key IN ({placeholders})",
+                    tuple(chunk),
+                ).fetchall()
+                found.update(row["dedup_key"] for row in rows)
+        return found
+
+    def remember_dedup_keys(self, items: Iterable[Tuple[str, int]]) -> None:
+        now_ts = int(datetime.now(timezone.utc).timestamp())
+        rows = [(dedup_key, now_ts + int(ttl_seconds)) for dedup_key, ttl_seconds in items]
+        if not rows:
+            return
+        with self._connect() as conn:
+            conn.executemany("INSERT OR REPLACE INTO signal_dedup(dedup_key, expires_at) VALUES (?, ?)", rows)
+
+    def _ensure_journal_partition(self, conn: sqlite3.Connection, day: int) -> str:
+        table = _journal_table(day)
+        if day in self._journal_days:
+            return table
+        conn.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                detected_at INTEGER NOT NULL,
+                scanner_id TEXT NOT NULL,
+                exchange TEXT NOT NULL,
+                symbol TEXT NOT NULL,
+                timeframe TEXT NOT NULL,
+                candle_close_at INTEGER NOT NULL,
+                score REAL NOT NULL,
+                recipients INTEGER NOT NULL,
+                model_version TEXT,
+                metrics TEXT NOT NULL
+            )
+            """
+        )
+        # Covering for "what did scanner X / symbol Y fire in a time range" lookups.
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_scanner_time ON {table}(scanner_id, detected_at, score)")
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_symbol_time ON {table}(symbol, detected_at, score)")
+        conn.execute("INSERT OR IGNORE INTO signal_journal_partitions(day) VALUES (?)", (day,))
+        self._journal_days.add(day)
+        return table
+
+    def record_signals(self, entries: Iterable[Tuple[SignalEvent, int]]) -> None:
+        """Append delivered signals with their recipient counts to the journal in one transaction."""
+        by_table: Dict[str, List[tuple]] = {}
+        hourly: Dict[Tuple[int, str], List[float]] = {}
+        daily: Dict[Tuple[int, str, str], List[float]] = {}
+        partitions: Dict[str, int] = {}
+        for signal, recipients in entries:
+            detected_at = _unix(signal.detected_at)
+            day = detected_at - detected_at % _DAY_SECONDS
+            table = _journal_table(day)
+            partitions[table] = day
+            symbol = signal.symbol.canonical_symbol
+            by_table.setdefault(table, []).append(
+                (
+                    detected_at,
+                    signal.scanner_id,
+                    signal.symbol.exchange,
+                    symbol,
+                    signal.timeframe,
+                    _unix(signal.candle_close_at),
+                    signal.score,
+                    recipients,
+                    signal.model_version,
+                    json.dumps(signal.metrics, sort_keys=True, separators=(",", ":")),
+                )
+            )
+            hour = hourly.setdefault((detected_at - detected_at % _HOUR_SECONDS, signal.scanner_id), [0, 0, 0.0, 0.0])
+            hour[0] += 1
+            hour[1] += recipients
+            hour[2] += signal.score
+            hour[3] = max(hour[3], signal.score)
+            symbol_day = daily.setdefault((day, signal.scanner_id, symbol), [0, 0.0])
+            symbol_day[0] += 1
+            symbol_day[1] = max(symbol_day[1], signal.score)
+        if not by_table:
+            return
+        with self._connect() as conn:
+            for table, rows in by_table.items():
+                self._ensure_journal_partition(conn, partitions[table])
+                conn.executemany(f"INSERT INTO {table} VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            conn.executemany(
+                """
+                INSERT INTO signal_rollup_hourly(hour, scanner_id, alerts, recipients, score_sum, score_max)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(hour, scanner_id) DO UPDATE SET
+                    alerts=alerts + excluded.alerts,
+                    recipients=recipients + excluded.recipients,
+                    score_sum=score_sum + excluded.score_sum,
+                    score_max=max(score_max, excluded.score_max)
+                """,
+                [(*key, *values) for key, values in hourly.items()],
+            )
+            conn.executemany(
+                """
+                INSERT INTO signal_rollup_symbol_daily(day, scanner_id, symbol, alerts, score_max)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(day, scanner_id, symbol) DO UPDATE SET
+                    alerts=alerts + excluded.alerts,
+                    score_max=max(score_max, excluded.score_max)
+                """,
+                [(*key, *values) for key, values in daily.items()],
+            )
+        self.prune_journal()
+
+    def prune_journal(self, force: bool = False, now: Optional[datetime] = None) -> None:
+        now_monotonic = time.monotonic()
+        if not force and now_monotonic - self._last_journal_prune_at < self._PRUNE_INTERVAL_SECONDS:
+            return
+        now_ts = _unix(now if now is not None else datetime.now(timezone.utc))
+        today = now_ts - now_ts % _DAY_SECONDS
+        expired = sorted(day for day in self._journal_days if day <= today - self.journal_retention_days * _DAY_SECONDS)
+        with self._connect() as conn:
+            for day in expired:
+                conn.execute(f"DROP TABLE IF EXISTS {_journal_table(day)}")
+                conn.execute("DELETE FROM signal_journal_partitions WHERE day = ?", (day,))
+                self._journal_days.discard(day)
+            # Rollups are keyed by time first, so these are range deletes on the primary key.
+            cutoff = now_ts - self.rollup_retention_days * _DAY_SECONDS
+            conn.execute("DELETE FROM signal_rollup_hourly WHERE hour < ?", (cutoff,))
+            conn.execute("DELETE FROM signal_rollup_symbol_daily WHERE day < ?", (cutoff - cutoff % _DAY_SECONDS,))
+        self._last_journal_prune_at = now_monotonic
+
+    @staticmethod
+    def _range(since: datetime, until: Optional[datetime]) -> Tuple[int, int]:
+        return _unix(since), _unix(until if until is not None else datetime.now(timezone.utc)) + 1
+
+    def alerts_per_scanner_per_day(
+        self, since: datetime, until: Optional[datetime] = None
+    ) -> List[Tuple[str, str, int]]:
+        """``(YYYY-MM-DD, scanner_id, alerts)`` from the hourly rollups; ``since`` is rounded down to the hour."""
+        start, end = self._range(since, until)
+        with self._connect() as conn:
+            rows = conn.execute(
+                """
+                SELECT hour - hour % 86400 AS day, scanner_id, SUM(alerts) AS alerts
+                FROM signal_rollup_hourly
+                WHERE hour >= ? AND hour < ?
+                GROUP BY day, scanner_id
+                ORDER BY day, scanner_id
+                """,
+                (start - start % _HOUR_SECONDS, end),
+            ).fetchall()
+        return [
+            (datetime.fromtimestamp(row["day"], timezone.utc).strftime("%Y-%m-%d"), row["scanner_id"], row["alerts"])
+            for row in rows
+        ]
+
+    def top_symbols(
+        self,
+        since: datetime,
+        until: Optional[datetime] = None,
+        limit: int = 10,
+        scanner_id: Optional[str] = None,
+    ) -> List[Tuple[str, int, float]]:
+        """``(symbol, alerts, max_score)`` ordered by alert count; ``since`` is rounded down to the UTC day."""
+        start, end = self._range(since, until)
+        query = (
+            "SELECT symbol, SUM(alerts) AS alerts, MAX(score_max) AS score_max FROM signal_rollup_symbol_daily "
+            "WHERE day >= ? AND day < ?"
+        )
+        params: List[Any] = [start - start % _DAY_SECONDS, end]
+        if scanner_id is not None:
+            query += " AND scanner_id = ?"
+            params.append(scanner_id)
+        query += " GROUP BY symbol ORDER BY alerts DESC, symbol LIMIT ?"
+        params.append(limit)
+        with self._connect() as conn:
+            rows = conn.execute(query, params).fetchall()
+        return [(row["symbol"], row["alerts"], row["score_max"]) for row in rows]
+
+    def journal_entries(
+        self,
+        since: datetime,
+        until: Optional[datetime] = None,
+        scanner_id: Optional[str] = None,
+        symbol: Optional[str] = None,
+        limit: int = 1000,
+    ) -> List[Dict[str, Any]]:
+        """Raw journal rows, newest first; only the day partitions overlapping the range are read."""
+        start, end = self._range(since, until)
+        filters = ["detected_at >= ?", "detected_at < ?"]
+        params: List[Any] = [start, end]
+        if scanner_id is not None:
+            filters.insert(0, "scanner_id = ?")
+            params.insert(0, scanner_id)
+        if symbol is not None:
+            filters.insert(0, "symbol = ?")
+            params.insert(0, symbol)
+        days = sorted((day for day in self._journal_days if start - _DAY_SECONDS < day < end), reverse=True)
+        entries: List[Dict[str, Any]] = []
+        with self._connect() as conn:
+            for day in days:
+                rows = conn.execute(
+                    f"SELECT * FROM {_journal_table(day)} WHERE {' AND '.join(filters)} "
+                    "ORDER BY detected_at DESC LIMIT ?",
+                    (*params, limit - len(entries)),
+                ).fetchall()
+                for row in rows:
+                    entry = dict(row)
+                    entry["metrics"] = json.loads(entry["metrics"])
+                    entries.append(entry)
+                if len(entries) >= limit:
+                    break
+        return entries
@@ -0,0 +1,414 @@
+"""Incremental per-series indicators shared by all scanners.
+
+A ``FeatureSeries`` holds the closed candles of one (exchange, symbol,
+timeframe) and every registered indicator over them. Each newly closed candle
+updates every indicator in O(1): rolling windows keep running sums, z-scores
+compare the newest value with a rolling window of the previous ones, EMAs are
+plain recursive updates. A cycle therefore costs O(new candles x indicators)
+instead of re-reducing the whole candle list in every scanner.
+
+Sources: ``open``, ``high``, ``low``, ``close``, ``volume``, ``usd_volume``
+(close x volume), ``typical_usd`` (typical price x volume, so VWAP is
+``window("typical_usd", n).sum / window("volume", n).sum``), ``abs_return``,
+``log_return`` and ``true_range`` (ATR is ``window("true_range", n).mean``).
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from ..adapters.base import BaseExchangeAdapter
+
+SeriesKey = Tuple[str, str, str]
+
+_TIMEFRAME_MS = {"m": 60_000, "h": 3_600_000, "d": 86_400_000}
+# Running sums are recomputed from the buffer every ``length * _RESYNC_EVERY`` pushes to bound float drift.
+_RESYNC_EVERY = 8
+
+
+def timeframe_ms(timeframe: str) -> int:
+    try:
+        return int(timeframe[:-1]) * _TIMEFRAME_MS[timeframe[-1]]
+    except (KeyError, ValueError, IndexError) as exc:
+        raise ValueError(f"unsupported timeframe: {timeframe}") from exc
+
+
+def _source_value(source: str, candle: Sequence[float], prev_close: Optional[float]) -> Optional[float]:
+    _, open_, high, low, close, volume = candle[:6]
+    if source == "close":
+        return close
+    if source == "usd_volume":
+        return close * volume
+    if source == "abs_return":
+        return abs(close / prev_close - 1.0) if prev_close else None
+    if source == "log_return":
+        return math.log(close / prev_close) if prev_close and close > 0 else None
+    if source == "true_range":
+        if prev_close is None:
+            return high - low
+        return max(high - low, abs(high - prev_close), abs(low - prev_close))
+    if source == "typical_usd":
+        return (high + low + close) / 3 * volume
+    if source == "open":
+        return open_
+    if source == "high":
+        return high
+    if source == "low":
+        return low
+    if source == "volume":
+        return volume
+    raise ValueError(f"unknown feature source: {source}")
+
+
+@dataclass(frozen=True)
+class Feature:
+    kind: str
+    source: str
+    length: int
+
+    @classmethod
+    def window(cls, source: str, length: int) -> "Feature":
+        return cls("window", source, length)
+
+    @classmethod
+    def zscore(cls, source: str, length: int) -> "Feature":
+        return cls("zscore", source, length)
+
+    @classmethod
+    def ema(cls, source: str, span: int) -> "Feature":
+        return cls("ema", source, span)
+
+    @property
+    def history(self) -> int:
+        # Candles needed before the feature is defined; a z-score also needs the newest value.
+        return self.length + 1 if self.kind == "zscore" else self.length
+
+
+class RollingWindow:
+    __slots__ = ("length", "_values", "_next", "_count", "_sum", "_sum_sq", "_pushes")
+
+    def __init__(self, length: int) -> None:
+        if length < 1:
+            raise ValueError("window length must be positive")
+        self.length = length
+        self._values = [0.0] * length
+        self._next = 0
+        self._count = 0
+        self._sum = 0.0
+        self._sum_sq = 0.0
+        self._pushes = 0
+
+    def push(self, value: float) -> None:
+        if self._count == self.length:
+            old = self._values[self._next]
+            self._sum -= old
+            self._sum_sq -= old * old
+        else:
+            self._count += 1
+        self._values[self._next] = value
+        self._sum += value
+        self._sum_sq += value * value
+        self._next = (self._next + 1) % self.length
+        self._pushes += 1
+        if self._pushes >= self.length * _RESYNC_EVERY:
+            values = self._values if self._count == self.length else self._values[: self._count]
+            self._sum = sum(values)
+            self._sum_sq = sum(value * value for value in values)
+            self._pushes = 0
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def full(self) -> bool:
+        return self._count == self.length
+
+    @property
+    def sum(self) -> float:
+        return self._sum
+
+    @property
+    def mean(self) -> float:
+        return self._sum / self._count if self._count else 0.0
+
+    @property
+    def variance(self) -> float:
+        if not self._count:
+            return 0.0
+        mean = self._sum / self._count
+        return max(0.0, self._sum_sq / self._count - mean * mean)
+
+    @property
+    def std(self) -> float:
+        return self.variance**0.5
+
+    @property
+    def first(self) -> float:
+        return self._values[self._next] if self.full else self._values[0]
+
+    @property
+    def last(self) -> float:
+        return self._values[self._next - 1]
+
+
+def zscore_against(history: RollingWindow, value: float) -> float:
+    """Z-score of ``value`` relative to the values currently held in ``history``."""
+    std = history.std if history.count >= 2 else 0.0
+    # A flat history leaves float residue in the running sums; treat it as zero variance.
+    return (value - history.mean) / std if std > 1e-12 + 1e-6 * abs(history.mean) else 0.0
+
+
+class _ZScore:
+    __slots__ = ("history", "value")
+
+    def __init__(self, length: int) -> None:
+        self.history = RollingWindow(length)
+        self.value = 0.0
+
+    def push(self, value: float) -> None:
+        self.value = zscore_against(self.history, value)
+        self.history.push(value)
+
+
+class _Ema:
+    __slots__ = ("alpha", "value")
+
+    def __init__(self, span: int) -> None:
+        self.alpha = 2.0 / (span + 1)
+        self.value: Optional[float] = None
+
+    def push(self, value: float) -> None:
+        self.value = value if self.value is None else self.value + self.alpha * (value - self.value)
+
+
+class FeatureSeries:
+    def __init__(self, timeframe: str, features: Sequence[Feature], capacity: int, version: int) -> None:
+        self.timeframe = timeframe
+        self.version = version
+        self.capacity = capacity
+        self.last_open_ms = -1
+        self._candles: Deque[Tuple[float, ...]] = deque(maxlen=capacity)
+        self._prev_close: Optional[float] = None
+        self._state: Dict[Feature, Any] = {}
+        for feature in features:
+            if feature.kind == "window":
+                self._state[feature] = RollingWindow(feature.length)
+            elif feature.kind == "zscore":
+                self._state[feature] = _ZScore(feature.length)
+            elif feature.kind == "ema":
+                self._state[feature] = _Ema(feature.length)
+            else:
+                raise ValueError(f"unknown feature kind: {feature.kind}")
+        self._by_source: Dict[str, List[Any]] = {}
+        for feature, state in self._state.items():
+            self._by_source.setdefault(feature.source, []).append(state)
+
+    def __len__(self) -> int:
+        return len(self._candles)
+
+    def push(self, candle: Sequence[float]) -> None:
+        row = tuple(float(value) for value in candle[:6])
+        for source, states in self._by_source.items():
+            value = _source_value(source, row, self._prev_close)
+            if value is None:
+                continue
+            for state in states:
+                state.push(value)
+        self._candles.append(row)
+        self._prev_close = row[4]
+        self.last_open_ms = int(row[0])
+
+    def window(self, source: str, length: int) -> RollingWindow:
+        return self._state[Feature.window(source, length)]
+
+    def zscore(self, source: str, length: int) -> float:
+        return self._state[Feature.zscore(source, length)].value
+
+    def ema(self, source: str, span: int) -> Optional[float]:
+        return self._state[Feature.ema(source, span)].value
+
+    def tail(self, count: int) -> List[Tuple[float, ...]]:
+        count = min(count, len(self._candles))
+        return list(self._candles)[len(self._candles) - count :] if count else []
+
+
+class FeatureStore:
+    """Feature series keyed by (exchange, symbol, timeframe), refreshed from the adapters."""
+
+    def __init__(self) -> None:
+        self._features: Dict[str, Set[Feature]] = {}
+        self._history: Dict[str, int] = {}
+        self._versions: Dict[str, int] = {}
+        self._series: Dict[SeriesKey, FeatureSeries] = {}
+        # source timeframe -> higher timeframes built from it instead of fetched.
+        self._derived: Dict[str, Set[str]] = {}
+        self._derived_from: Dict[str, str] = {}
+        self._resamplers: Dict[SeriesKey, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self._series)
+
+    def clear(self) -> None:
+        self._series.clear()
+        self._resamplers.clear()
+
+    def discard(self, exchange: str, symbol: str) -> None:
+        """Forget every series of a symbol, e.g. after it was delisted."""
+        for mapping in (self._series, self._resamplers):
+            for key in [key for key in mapping if key[0] == exchange and key[1] == symbol]:
+                del mapping[key]
+
+    def derive(self, timeframe: str, source_timeframe: str) -> None:
+        """Extend ``timeframe`` series from closed ``source_timeframe`` candles instead of fetching them.
+
+        Only a cold, outdated or gapped series is fetched at ``timeframe`` itself; after that every
+        bar that closes is aggregated from the source series other scanners already keep fresh.
+        """
+        from .resample import resample_ratio
+
+        resample_ratio(source_timeframe, timeframe)
+        self._derived.setdefault(source_timeframe, set()).add(timeframe)
+        self._derived_from[timeframe] = source_timeframe
+
+    def register(self, timeframe: str, *features: Feature, history: int = 0) -> None:
+        known = self._features.setdefault(timeframe, set())
+        added = set(features) - known
+        if not added and history <= self._history.get(timeframe, 0):
+            return
+        known.update(added)
+        self._history[timeframe] = max(self._history.get(timeframe, 0), history)
+        # Existing series lack the new indicators; they are rebuilt from a full fetch on next refresh.
+        self._versions[timeframe] = self._versions.get(timeframe, 0) + 1
+
+    def capacity(self, timeframe: str) -> int:
+        lengths = [feature.history for feature in self._features.get(timeframe, ())]
+        return max([self._history.get(timeframe, 0), 1, *lengths])
+
+    def series(self, exchange: str, symbol: str, timeframe: str) -> Optional[FeatureSeries]:
+        return self._series.get((exchange, symbol, timeframe))
+
+    def _new_series(self, key: SeriesKey) -> FeatureSeries:
+        timeframe = key[2]
+        series = FeatureSeries(
+            timeframe,
+            sorted(self._features.get(timeframe, ()), key=lambda item: (item.kind, item.source, item.length)),
+            self.capacity(timeframe),
+            self._versions.get(timeframe, 0),
+        )
+        self._series[key] = series
+        return series
+
+    def ingest(
+        self,
+        exchange: str,
+        symbol: str,
+        timeframe: str,
+        candles: Sequence[Sequence[Any]],
+        now_ms: Optional[int] = None,
+        rebuild: bool = False,
+    ) -> Tuple[FeatureSeries, bool]:
+        """Push the closed candles not seen yet; returns the series and whether it was rebuilt."""
+        now_ms = int(time.time() * 1000) if now_ms is None else now_ms
+        if isinstance(candles, np.ndarray):
+            # Fast-path adapters return float64 arrays; one C-level conversion beats per-cell numpy scalars.
+            candles = candles.tolist()
+        step = timeframe_ms(timeframe)
+        end = len(candles)
+        while end and int(float(candles[end - 1][0])) + step > now_ms:
+            end -= 1
+        key = (exchange, symbol, timeframe)
+        series = self._series.get(key)
+        if end == 0:
+            return (series if series is not None else self._new_series(key)), False
+        newest = int(float(candles[end - 1][0]))
+        if (
+            not rebuild
+            and series is not None
+            and series.version == self._versions.get(timeframe, 0)
+            and newest >= series.last_open_ms
+        ):
+            start = end
+            while start and int(float(candles[start - 1][0])) > series.last_open_ms:
+                start -= 1
+            if start == end:
+                return series, False
+            if int(float(candles[start][0])) - series.last_open_ms == step:
+                for candle in candles[start:end]:
+                    series.push(candle)
+                self._feed_derived(exchange, symbol, timeframe, candles[start:end], reset=False)
+                return series, False
+        # Cold, outdated, rewound or gapped: rebuild from what was fetched.
+        series = self._new_series(key)
+        for candle in candles[max(0, end - series.capacity) : end]:
+            series.push(candle)
+        self._feed_derived(exchange, symbol, timeframe, candles[:end], reset=True)
+        return series, True
+
+    def _feed_derived(
+        self, exchange: str, symbol: str, timeframe: str, candles: Sequence[Sequence[Any]], reset: bool
+    ) -> None:
+        for target in self._derived.get(timeframe, ()):
+            key = (exchange, symbol, target)
+            resampler = None if reset else self._resamplers.get(key)
+            if resampler is None:
+                from .resample import CandleResampler
+
+                resampler = self._resamplers[key] = CandleResampler(timeframe, target)
+            series = self._series.get(key)
+            for candle in candles:
+                row = resampler.push(candle)
+                if row is None or series is None or series.version != self._versions.get(target, 0):
+                    continue
+                # Only a bar that directly continues the target series is taken; anything else is
+                # left to the regular fetch path, which rebuilds the series.
+                if int(row[0]) - series.last_open_ms == resampler.target_step:
+                    series.push(row)
+
+    def _fetch_limit(self, key: SeriesKey, now_ms: int) -> int:
+        timeframe = key[2]
+        full = self.capacity(timeframe) + 1
+        series = self._series.get(key)
+        if series is None or series.version != self._versions.get(timeframe, 0) or series.last_open_ms < 0:
+            return full
+        step = timeframe_ms(timeframe)
+        missing = (now_ms // step * step - series.last_open_ms) // step - 1
+        if missing <= 0:
+            return 0
+        return min(full, missing + 1)
+
+    async def refresh(
+        self, adapter: BaseExchangeAdapter, exchange: str, symbol: str, timeframe: str, now_ms: Optional[int] = None
+    ) -> FeatureSeries:
+        """Fetch only the candles closed since the last update (a full window when cold) and ingest them."""
+        now_ms = int(time.time() * 1000) if now_ms is None else now_ms
+        key = (exchange, symbol, timeframe)
+        limit = self._fetch_limit(key, now_ms)
+        source = self._derived_from.get(timeframe)
+        if (
+            source is not None
+            and 0 < limit < self.capacity(timeframe) + 1
+            and (exchange, symbol, source) in self._series
+        ):
+            # A warm derived series only lacks bars that close in the source series; bring that up
+            # to date (usually free, other scanners refresh it every cycle) and check again.
+            await self.refresh(adapter, exchange, symbol, source, now_ms)
+            limit = self._fetch_limit(key, now_ms)
+        if limit == 0:
+            return self._series[key]
+        candles = await adapter.fetch_ohlcv(symbol, timeframe=timeframe, limit=limit)
+        series, rebuilt = self.ingest(exchange, symbol, timeframe, candles, now_ms)
+        full = self.capacity(timeframe) + 1
+        if rebuilt and limit < full:
+            candles = await adapter.fetch_ohlcv(symbol, timeframe=timeframe, limit=full)
+            series, _ = self.ingest(exchange, symbol, timeframe, candles, now_ms, rebuild=True)
+        return series
+
+
+feature_store = FeatureStore()
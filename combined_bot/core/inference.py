@@ -0,0 +1,170 @@
+"""Batched feature extraction and model evaluation for ``MachineLearningScanner``.
+
+Models are stored as plain ``.npz`` arrays and loaded with ``allow_pickle=False``:
+
+* ``kind="linear"``: ``weights`` (k), ``bias``;
+* ``kind="tree_ensemble"``: per-tree node arrays ``feature``, ``threshold``,
+  ``left``, ``right``, ``value`` (trees x nodes; leaves have ``left == -1``)
+  and ``base_score``.
+
+Both carry ``feature_names``, ``version`` and ``link`` (``logistic`` or
+``identity``). The functions in this module are module-level so they can run
+inside a process pool.
+"""
+
+from __future__ import annotations
+
+import io
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from .shared_arrays import SharedArraySpec, attach
+
+WINDOW_HOURS = 48
+
+FEATURE_NAMES: Tuple[str, ...] = (
+    "log_volume_ratio_24h",
+    "log_volume_usd_24h",
+    "return_1h",
+    "return_4h",
+    "return_24h",
+    "volatility_24h",
+    "volume_zscore_1h",
+    "range_24h",
+)
+
+_CLOSE, _HIGH, _LOW, _VOLUME = 4, 2, 3, 5
+
+
+@dataclass(frozen=True)
+class InferenceModel:
+    kind: str
+    version: str
+    feature_names: Tuple[str, ...]
+    link: str
+    arrays: Dict[str, np.ndarray]
+
+    @property
+    def feature_index(self) -> np.ndarray:
+        return np.asarray([FEATURE_NAMES.index(name) for name in self.feature_names], dtype=np.int64)
+
+
+def load_model(path: Path, content: Optional[bytes] = None) -> InferenceModel:
+    """Load ``path``, or ``content`` already read from it (e.g. bytes whose checksum was verified)."""
+    with np.load(io.BytesIO(content) if content is not None else path, allow_pickle=False) as data:
+        arrays = {name: np.asarray(data[name]) for name in data.files}
+    kind = str(arrays.pop("kind"))
+    version = str(arrays.pop("version", np.asarray(path.stem)))
+    link = str(arrays.pop("link", np.asarray("logistic")))
+    feature_names = tuple(str(name) for name in arrays.pop("feature_names"))
+    unknown = [name for name in feature_names if name not in FEATURE_NAMES]
+    if unknown:
+        raise ValueError(f"model uses unknown features: {unknown}")
+    if kind == "linear":
+        required = ("weights", "bias")
+    elif kind == "tree_ensemble":
+        required = ("feature", "threshold", "left", "right", "value", "base_score")
+    else:
+        raise ValueError(f"unsupported model kind: {kind}")
+    missing = [name for name in required if name not in arrays]
+    if missing:
+        raise ValueError(f"model file is missing arrays: {missing}")
+    return InferenceModel(kind=kind, version=version, feature_names=feature_names, link=link, arrays=arrays)
+
+
+def save_model(path: Path, model: InferenceModel) -> None:
+    np.savez(
+        path,
+        kind=np.asarray(model.kind),
+        version=np.asarray(model.version),
+        link=np.asarray(model.link),
+        feature_names=np.asarray(model.feature_names),
+        **model.arrays,
+    )
+
+
+def build_features(candles: np.ndarray) -> np.ndarray:
+    """Feature matrix for a (symbols x 48 x 6) stack of closed 1h candles."""
+    closes = candles[:, :, _CLOSE]
+    usd = closes * candles[:, :, _VOLUME]
+    prev_usd = usd[:, :24].sum(axis=1)
+    last_usd = usd[:, 24:].sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_closes = np.log(closes)
+        hourly_returns = np.diff(log_closes[:, 24:], axis=1)
+        history = usd[:, :-1]
+        std = history.std(axis=1)
+        features = np.column_stack(
+            [
+                np.log(last_usd / prev_usd),
+                np.log1p(last_usd),
+                log_closes[:, -1] - log_closes[:, -2],
+                log_closes[:, -1] - log_closes[:, -5],
+                log_closes[:, -1] - log_closes[:, 24],
+                hourly_returns.std(axis=1),
+                np.where(std > 0, (usd[:, -1] - history.mean(axis=1)) / np.where(std > 0, std, 1.0), 0.0),
+                (candles[:, 24:, _HIGH].max(axis=1) - candles[:, 24:, _LOW].min(axis=1)) / closes[:, -1],
+            ]
+        )
+    return np.nan_to_num(features, nan=0.0, posinf=0.0, neginf=0.0)
+
+
+def _apply_link(raw: np.ndarray, link: str) -> np.ndarray:
+    if link == "logistic":
+        return 1.0 / (1.0 + np.exp(-raw))
+    return raw
+
+
+def _predict_trees(arrays: Dict[str, np.ndarray], x: np.ndarray) -> np.ndarray:
+    n_trees, n_nodes = arrays["feature"].shape
+    feature = arrays["feature"].ravel().astype(np.int64)
+    threshold = arrays["threshold"].ravel()
+    offsets = np.arange(n_trees, dtype=np.int64) * n_nodes
+    # Child pointers become flat (tree, node) indices; leaves point at themselves.
+    flat_index = np.arange(n_trees * n_nodes, dtype=np.int64)
+    left_raw = arrays["left"].ravel()
+    is_leaf = left_raw < 0
+    left = np.where(is_leaf, flat_index, left_raw + np.repeat(offsets, n_nodes))
+    right = np.where(is_leaf, flat_index, arrays["right"].ravel() + np.repeat(offsets, n_nodes))
+    rows, n_features = x.shape
+    flat_x = np.ascontiguousarray(x).ravel()
+    row_base = (np.arange(rows, dtype=np.int64) * n_features)[:, None]
+    node = np.broadcast_to(offsets, (rows, n_trees)).copy()
+    # All rows walk all trees in lockstep: one flat gather per depth level instead of per row.
+    for _ in range(n_nodes):
+        if is_leaf.take(node).all():
+            break
+        go_left = flat_x.take(row_base + feature.take(node)) <= threshold.take(node)
+        node = np.where(go_left, left.take(node), right.take(node))
+    return arrays["value"].ravel().take(node).sum(axis=1) + float(arrays["base_score"])
+
+
+def predict(model: InferenceModel, features: np.ndarray) -> np.ndarray:
+    if features.shape[0] == 0:
+        return np.empty(0, dtype=np.float64)
+    x = features[:, model.feature_index]
+    if model.kind == "linear":
+        raw = x @ model.arrays["weights"].astype(np.float64) + float(model.arrays["bias"])
+    else:
+        raw = _predict_trees(model.arrays, x)
+    return _apply_link(raw, model.link)
+
+
+_WORKER_MODEL: Optional[InferenceModel] = None
+
+
+def init_worker(model: InferenceModel) -> None:
+    # Workers get the parent's verified arrays rather than re-reading a file that may have changed since.
+    global _WORKER_MODEL
+    _WORKER_MODEL = model
+
+
+def score_shared_slice_in_worker(spec: SharedArraySpec, start: int, stop: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Score rows ``start:stop`` of a shared ``(symbols, WINDOW_HOURS, 6)`` candle array; only results travel back."""
+    assert _WORKER_MODEL is not None
+    with attach(spec) as candles:
+        features = build_features(candles[start:stop])
+    return predict(_WORKER_MODEL, features), features
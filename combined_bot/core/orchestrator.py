@@ -3,14 +3,46 @@ from __future__ import annotations
 import asyncio
 import logging
 import time
-from typing import Dict, List
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+import numpy as np
 
 from .. import config
 from ..adapters.base import BaseExchangeAdapter
 from ..core.database import Database
+from ..core.scheduler import (
+    PrioritizedAdapterView,
+    ScheduledAdapterView,
+    SymbolScheduler,
+)
+from ..core.thresholds import ThresholdMatcher
 from ..delivery.telegram_dispatcher import TelegramDispatcher
-from ..models import SignalEvent
+from ..models import MarketSymbol, SignalEvent, UniverseEvent
 from ..scanners.base import BaseScanner
+from ..signal_batch import SignalBatch
+from ..symbols import symbol_registry
+
+# Pseudo scanner id users enable (like any scanner) to receive new-listing/delisting notices.
+LISTING_SCANNER_ID = "listing"
+
+
+@dataclass
+class ScannerRun:
+    duration_seconds: float = 0.0
+    skipped_symbols: int = 0
+    timed_out: bool = False
+
+
+@dataclass
+class CycleMetrics:
+    cycles: int = 0
+    overruns: int = 0
+    overrun_seconds_total: float = 0.0
+    scanner_timeouts: int = 0
+    skipped_symbols_total: int = 0
+    last_duration_seconds: float = 0.0
+    last_scanners: Dict[str, ScannerRun] = field(default_factory=dict)
 
 
 class Orchestrator:
@@ -21,79 +53,308 @@ class Orchestrator:
         database: Database,
         dispatcher: TelegramDispatcher,
         interval_seconds: int = config.SCAN_INTERVAL_SECONDS,
+        scheduler: Optional[SymbolScheduler] = None,
+        cycle_deadline_seconds: Optional[float] = None,
     ) -> None:
         self.adapters = adapters
         self.scanners = scanners
         self.database = database
         self.dispatcher = dispatcher
         self.interval_seconds = interval_seconds
+        self.scheduler = scheduler
+        self.cycle_deadline_seconds = (
+            interval_seconds * config.CYCLE_DEADLINE_FRACTION if cycle_deadline_seconds is None else cycle_deadline_seconds
+        )
+        self.metrics = CycleMetrics()
+        self.thresholds = ThresholdMatcher(scanners)
+        # Symbols cut off by a deadline; listed first next cycle (the scheduler keeps its own queue).
+        self._carryover: Dict[str, List[str]] = {}
+        # Filled by the background universe refresh, applied at the start of the next cycle.
+        self._universe_events: List[UniverseEvent] = []
         self.logger = logging.getLogger(self.__class__.__name__)
+        if scheduler is not None:
+            scheduler.requests_per_symbol = max(1, sum(getattr(scanner, "requests_per_symbol", 1) for scanner in scanners))
+            for scanner in scanners:
+                scanner.heat_observer = scheduler.observe
+
+    async def _scheduled_adapters(self, now: float) -> tuple[Dict[str, BaseExchangeAdapter], Dict[str, List[str]]]:
+        assert self.scheduler is not None
+        for exchange, adapter in self.adapters.items():
+            self.scheduler.sync(exchange, await adapter.list_symbols(), now)
+        due = self.scheduler.take_due(now, self.scheduler.budget(self.interval_seconds))
+        views: Dict[str, BaseExchangeAdapter] = {
+            exchange: ScheduledAdapterView(adapter, due.get(exchange, [])) for exchange, adapter in self.adapters.items()
+        }
+        return views, due
 
-    async def _collect_signals(self) -> List[SignalEvent]:
-        tasks = [scanner.scan(self.adapters) for scanner in self.scanners]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        signals: List[SignalEvent] = []
-        for result in results:
-            if isinstance(result, Exception):
-                self.logger.exception("scanner failed", exc_info=result)
+    async def _collect_signals(self, deadline: Optional[float] = None) -> SignalBatch:
+        if deadline is None:
+            deadline = time.monotonic() + self.cycle_deadline_seconds
+        if self.scheduler is None:
+            adapters = self.adapters
+            if self._carryover:
+                adapters = {
+                    exchange: PrioritizedAdapterView(adapter, self._carryover.get(exchange, []))
+                    for exchange, adapter in self.adapters.items()
+                }
+            batch, self._carryover = await self._run_scanners(adapters, deadline)
+            return batch
+        now = time.monotonic()
+        views, due = await self._scheduled_adapters(now)
+        skipped: Dict[str, List[str]] = {}
+        try:
+            batch, skipped = await self._run_scanners(views, deadline)
+            return batch
+        finally:
+            self.scheduler.complete(due, time.monotonic(), skipped)
+
+    async def _run_scanner(
+        self, scanner: BaseScanner, adapters: Dict[str, BaseExchangeAdapter], deadline: float
+    ) -> Tuple[Optional[SignalBatch], ScannerRun]:
+        scanner_id = getattr(scanner, "id", scanner.__class__.__name__)
+        started = time.monotonic()
+        budget = config.SCANNER_BUDGETS.get(scanner_id, config.SCANNER_BUDGET_SECONDS)
+        scanner_deadline = min(deadline, started + budget) if budget > 0 else deadline
+        scanner.deadline = scanner_deadline
+        scanner.skipped = {}
+        run = ScannerRun()
+        result = None
+        try:
+            # Scanners stop per-symbol work at their deadline themselves; the grace period only
+            # bounds the post-processing and scanners that ignore the deadline.
+            result = await asyncio.wait_for(
+                scanner.scan(adapters), timeout=max(0.0, scanner_deadline - started) + config.CYCLE_GRACE_SECONDS
+            )
+        except asyncio.TimeoutError:
+            run.timed_out = True
+            self.logger.warning("scanner %s overran its budget and was cancelled", scanner_id)
+        except Exception as exc:
+            self.logger.exception("scanner failed", exc_info=exc)
+        run.duration_seconds = time.monotonic() - started
+        run.skipped_symbols = sum(len(symbols) for symbols in scanner.skipped.values())
+        if result is None:
+            return None, run
+        return (result if isinstance(result, SignalBatch) else SignalBatch.from_events(result)), run
+
+    async def _run_scanners(
+        self, adapters: Dict[str, BaseExchangeAdapter], deadline: Optional[float] = None
+    ) -> Tuple[SignalBatch, Dict[str, List[str]]]:
+        if deadline is None:
+            deadline = time.monotonic() + self.cycle_deadline_seconds
+        results = await asyncio.gather(*(self._run_scanner(scanner, adapters, deadline) for scanner in self.scanners))
+        batches: List[SignalBatch] = []
+        skipped: Dict[str, List[str]] = {}
+        self.metrics.last_scanners = {}
+        for scanner, (batch, run) in zip(self.scanners, results):
+            self.metrics.last_scanners[getattr(scanner, "id", scanner.__class__.__name__)] = run
+            self.metrics.scanner_timeouts += int(run.timed_out)
+            if batch is not None:
+                batches.append(batch)
+            for exchange, symbols in scanner.skipped.items():
+                known = skipped.setdefault(exchange, [])
+                known.extend(symbol for symbol in symbols if symbol not in known)
+        self.metrics.skipped_symbols_total += sum(len(symbols) for symbols in skipped.values())
+        return SignalBatch.concat(batches), skipped
+
+    @staticmethod
+    def _blacklists(active_settings) -> Dict[int, FrozenSet[int]]:
+        # Resolved once per cycle so routing compares interned canonical ids, not strings.
+        return {settings.chat_id: symbol_registry.canonical_ids(settings.blacklist_symbols) for settings in active_settings}
+
+    @staticmethod
+    def _recipients(
+        scanner_id: str,
+        symbol: MarketSymbol,
+        score: float,
+        active_settings,
+        blacklists: Dict[int, FrozenSet[int]],
+        allowed: Optional[np.ndarray] = None,
+    ) -> List[int]:
+        # ``allowed`` is the threshold-profile verdict per user, aligned with ``active_settings``.
+        canonical_id = symbol.canonical_id
+        if canonical_id < 0:
+            canonical_id = symbol_registry.canonical_id(symbol.canonical_symbol)
+        chat_ids: List[int] = []
+        for index, settings in enumerate(active_settings):
+            if allowed is not None and not allowed[index]:
+                continue
+            if scanner_id not in settings.enabled_scanners:
+                continue
+            if symbol.exchange not in settings.enabled_exchanges:
+                continue
+            if canonical_id in blacklists.get(settings.chat_id, ()):
+                continue
+            if score < settings.min_score_threshold:
                 continue
-            signals.extend(result)
-        return signals
+            chat_ids.append(settings.chat_id)
+        return chat_ids
 
-    async def _deliver(self, signal: SignalEvent, active_settings) -> int:
+    @staticmethod
+    def _timezones(active_settings) -> Dict[int, str]:
+        return {settings.chat_id: settings.timezone for settings in active_settings if settings.timezone != "UTC"}
+
+    async def _deliver(
+        self,
+        signal: SignalEvent,
+        active_settings,
+        blacklists: Optional[Dict[int, FrozenSet[int]]] = None,
+    ) -> int:
+        if blacklists is None:
+            blacklists = self._blacklists(active_settings)
+        allowed = self.thresholds.match_event(signal, active_settings)
+        chat_ids = self._recipients(signal.scanner_id, signal.symbol, signal.score, active_settings, blacklists, allowed)
+        if not chat_ids:
+            return 0
+        return await self.dispatcher.send_signal_many(signal, chat_ids, self._timezones(active_settings))
+
+    async def _deliver_batch(self, batch: SignalBatch, active_settings, blacklists: Dict[int, FrozenSet[int]]) -> tuple[int, int]:
+        if not len(batch):
+            return 0, 0
+        dedup_keys = batch.dedup_keys()
+        known = self.database.find_duplicate_keys(dedup_keys)
+        timezones = self._timezones(active_settings)
+        # Every distinct threshold profile is checked against all rows at once.
+        allowed = self.thresholds.match(batch, active_settings)
+        seen: set[str] = set()
+        remembered: List[tuple[str, int]] = []
+        journal: List[tuple[SignalEvent, int]] = []
+        duplicates = 0
         delivered = 0
-        signal_symbol = signal.symbol.canonical_symbol
-        for settings in active_settings:
-            if signal.scanner_id not in settings.enabled_scanners:
-                continue
-            if signal.symbol.exchange not in settings.enabled_exchanges:
+        for row, dedup_key in enumerate(dedup_keys):
+            if dedup_key in known or dedup_key in seen:
+                duplicates += 1
                 continue
-            if signal_symbol in settings.blacklist_symbols:
+            seen.add(dedup_key)
+            chat_ids = self._recipients(
+                batch.scanner_id(row),
+                batch.symbol(row),
+                float(batch.scores[row]),
+                active_settings,
+                blacklists,
+                None if allowed is None else allowed[row],
+            )
+            if chat_ids:
+                # The SignalEvent is only materialised for rows that are actually rendered;
+                # the dispatcher renders it once per recipient timezone, not once per chat.
+                signal = batch.event(row)
+                sent = await self.dispatcher.send_signal_many(signal, chat_ids, timezones)
+                journal.append((signal, sent))
+                delivered += sent
+            remembered.append((dedup_key, int(batch.ttl_seconds[row])))
+        self.database.remember_dedup_keys(remembered)
+        self.database.record_signals(journal)
+        return delivered, duplicates
+
+    async def _refresh_universe_loop(self) -> None:
+        while True:
+            await asyncio.sleep(config.UNIVERSE_REFRESH_SECONDS)
+            for exchange, adapter in self.adapters.items():
+                try:
+                    self._universe_events.extend(await adapter.refresh_universe())
+                except Exception:
+                    self.logger.warning("universe refresh failed: %s", exchange, exc_info=True)
+
+    async def _apply_universe_events(self, active_settings, blacklists: Dict[int, FrozenSet[int]]) -> None:
+        events, self._universe_events = self._universe_events, []
+        if not events:
+            return
+        listed: Dict[str, List[str]] = {}
+        for event in events:
+            if event.kind == "listed":
+                listed.setdefault(event.symbol.exchange, []).append(event.symbol.raw_symbol)
+        # New listings are scanned this cycle, ahead of every other due symbol.
+        for exchange, symbols in listed.items():
+            if self.scheduler is not None:
+                self.scheduler.promote(exchange, symbols)
+            else:
+                self._carryover[exchange] = symbols + [
+                    symbol for symbol in self._carryover.get(exchange, []) if symbol not in symbols
+                ]
+        for scanner in self.scanners:
+            handler = getattr(scanner, "on_universe_events", None)
+            if handler is None:
                 continue
-            if signal.score < settings.min_score_threshold:
+            try:
+                handler(events)
+            except Exception:
+                self.logger.exception("scanner failed to apply universe events: %s", getattr(scanner, "id", scanner))
+
+        # A restart re-detects changes made while the bot was down; the dedup table keeps notices unique.
+        known = self.database.find_duplicate_keys([event.dedup_key for event in events])
+        timezones = self._timezones(active_settings)
+        remembered: List[tuple[str, int]] = []
+        for event in events:
+            if event.dedup_key in known:
                 continue
-            await self.dispatcher.send_signal(settings.chat_id, signal)
-            delivered += 1
-        return delivered
+            chat_ids = self._recipients(LISTING_SCANNER_ID, event.symbol, 1.0, active_settings, blacklists)
+            if chat_ids:
+                await self.dispatcher.send_universe_event(event, chat_ids, timezones)
+            remembered.append((event.dedup_key, config.LISTING_EVENT_TTL_SECONDS))
+        self.database.remember_dedup_keys(remembered)
+        listed_count = sum(len(symbols) for symbols in listed.values())
+        self.logger.info("applied universe events listed=%s delisted=%s", listed_count, len(events) - listed_count)
 
     async def run_once(self) -> None:
         # The current delivery flow is designed for a single process/worker.
         # Do not run multiple bot instances against the same database unless delivery reservation becomes atomic.
         cycle_started = time.monotonic()
         active_settings = self.database.get_active_user_settings()
-        signals = await self._collect_signals()
-        duplicates = 0
-        delivered = 0
-        for signal in signals:
-            if self.database.is_duplicate(signal):
-                duplicates += 1
-                continue
-            delivered += await self._deliver(signal, active_settings)
-            self.database.remember_signal(signal)
+        blacklists = self._blacklists(active_settings)
+        # Scanners gate candidates at the loosest active profile; the matcher narrows them per user.
+        self.thresholds.prepare(active_settings)
+        await self._apply_universe_events(active_settings, blacklists)
+        signals = await self._collect_signals(cycle_started + self.cycle_deadline_seconds)
+        delivered, duplicates = await self._deliver_batch(signals, active_settings, blacklists)
         elapsed = time.monotonic() - cycle_started
+        metrics = self.metrics
+        metrics.cycles += 1
+        metrics.last_duration_seconds = elapsed
+        overrun = elapsed - self.interval_seconds
+        if overrun > 0:
+            metrics.overruns += 1
+            metrics.overrun_seconds_total += overrun
+            self.logger.warning("cycle overran its interval by %.2fs", overrun)
+        skipped = sum(run.skipped_symbols for run in metrics.last_scanners.values())
         self.logger.info(
-            "cycle finished users=%s signals=%s delivered=%s duplicates=%s duration_sec=%.2f",
+            "cycle finished users=%s signals=%s delivered=%s duplicates=%s skipped_symbols=%s duration_sec=%.2f",
             len(active_settings),
             len(signals),
             delivered,
             duplicates,
+            skipped,
             elapsed,
         )
 
     async def run(self) -> None:
+        universe_task: Optional[asyncio.Task] = None
+        if config.UNIVERSE_REFRESH_SECONDS > 0:
+            universe_task = asyncio.create_task(self._refresh_universe_loop())
         try:
             while True:
+                started = time.monotonic()
                 await self.run_once()
-                await asyncio.sleep(self.interval_seconds)
+                # Keep a fixed cadence: a slow cycle shortens the pause instead of shifting the schedule.
+                await asyncio.sleep(max(0.0, self.interval_seconds - (time.monotonic() - started)))
         except asyncio.CancelledError:
             self.logger.info("orchestrator stopped")
             raise
         finally:
+            if universe_task is not None:
+                universe_task.cancel()
+                await asyncio.gather(universe_task, return_exceptions=True)
             for adapter in self.adapters.values():
                 try:
                     await adapter.close()
                 except Exception:
                     self.logger.exception("failed to close adapter")
+            for scanner in self.scanners:
+                close = getattr(scanner, "close", None)
+                if close is None:
+                    continue
+                try:
+                    await close()
+                except Exception:
+                    self.logger.exception("failed to close scanner: %s", getattr(scanner, "id", scanner))
             try:
                 await self.dispatcher.close()
             except Exception:
@@ -0,0 +1,79 @@
+"""Aggregate closed lower-timeframe candles into higher timeframes.
+
+Buckets are aligned to UTC epoch multiples of the target timeframe (``4h``
+starts at 00/04/08.. UTC, ``1d`` at midnight UTC), matching exchange klines.
+A target candle is only produced once every source candle of its bucket has
+closed, so a partial bar is never mistaken for a finished one.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any, List, Optional, Sequence
+
+from .features import timeframe_ms
+
+
+def resample_ratio(source_timeframe: str, target_timeframe: str) -> int:
+    source_step = timeframe_ms(source_timeframe)
+    target_step = timeframe_ms(target_timeframe)
+    if target_step <= source_step or target_step % source_step:
+        raise ValueError(f"cannot resample {source_timeframe} into {target_timeframe}")
+    return target_step // source_step
+
+
+class CandleResampler:
+    """Streaming OHLCV aggregator for one symbol: push source candles, get closed target candles."""
+
+    __slots__ = ("source_step", "target_step", "ratio", "_bucket", "_row", "_count", "_last_open")
+
+    def __init__(self, source_timeframe: str, target_timeframe: str) -> None:
+        self.ratio = resample_ratio(source_timeframe, target_timeframe)
+        self.source_step = timeframe_ms(source_timeframe)
+        self.target_step = timeframe_ms(target_timeframe)
+        self._bucket = -1
+        self._row: List[float] = []
+        self._count = 0
+        self._last_open = -1
+
+    def push(self, candle: Sequence[Any]) -> Optional[List[float]]:
+        open_ms = int(float(candle[0]))
+        if open_ms <= self._last_open:
+            return None
+        self._last_open = open_ms
+        _, open_, high, low, close, volume = (float(value) for value in candle[:6])
+        bucket = open_ms - open_ms % self.target_step
+        if bucket != self._bucket:
+            self._bucket = bucket
+            self._row = [float(bucket), open_, high, low, close, volume]
+            self._count = 1
+        else:
+            row = self._row
+            row[2] = max(row[2], high)
+            row[3] = min(row[3], low)
+            row[4] = close
+            row[5] += volume
+            self._count += 1
+        # A bucket with a missing source candle (exchange gap, late listing) is dropped, not guessed.
+        if open_ms + self.source_step == bucket + self.target_step and self._count == self.ratio:
+            return list(self._row)
+        return None
+
+
+def resample(
+    candles: Sequence[Sequence[Any]],
+    source_timeframe: str,
+    target_timeframe: str,
+    now_ms: Optional[int] = None,
+) -> List[List[float]]:
+    """Closed ``target_timeframe`` candles built from ``candles``; still-open source bars are ignored."""
+    now_ms = int(time.time() * 1000) if now_ms is None else now_ms
+    resampler = CandleResampler(source_timeframe, target_timeframe)
+    out: List[List[float]] = []
+    for candle in candles:
+        if int(float(candle[0])) + resampler.source_step > now_ms:
+            break
+        row = resampler.push(candle)
+        if row is not None:
+            out.append(row)
+    return out
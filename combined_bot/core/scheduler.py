@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .. import config
+from ..adapters.base import BaseExchangeAdapter
+
+SymbolKey = Tuple[str, str]
+
+
+@dataclass
+class SymbolState:
+    heat: float = 0.0
+    next_due: float = 0.0
+    last_scanned: float = 0.0
+    version: int = 0
+
+
+class ScheduledAdapterView:
+    """Adapter proxy whose ``list_symbols`` returns only the symbols due this tick."""
+
+    def __init__(self, adapter: BaseExchangeAdapter, symbols: List[str]) -> None:
+        self._adapter = adapter
+        self._symbols = list(symbols)
+
+    async def list_symbols(self) -> List[str]:
+        return list(self._symbols)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._adapter, name)
+
+
+class PrioritizedAdapterView:
+    """Adapter proxy that lists the given symbols first, e.g. the ones a deadline cut off last cycle."""
+
+    def __init__(self, adapter: BaseExchangeAdapter, first: List[str]) -> None:
+        self._adapter = adapter
+        self._first = list(first)
+
+    async def list_symbols(self) -> List[str]:
+        symbols = await self._adapter.list_symbols()
+        listed = set(symbols)
+        first = [symbol for symbol in self._first if symbol in listed]
+        promoted = set(first)
+        return first + [symbol for symbol in symbols if symbol not in promoted]
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._adapter, name)
+
+
+class SymbolScheduler:
+    """Earliest-deadline-first symbol scheduler with activity-dependent rescan intervals.
+
+    Scanners report a per-symbol "heat" (1.0 means a metric sits at its
+    signal threshold). Hot symbols are rescheduled after ``hot_interval``,
+    cold ones after ``cold_interval``; each tick only as many symbols are
+    handed out as the per-minute request budget allows.
+    """
+
+    def __init__(
+        self,
+        hot_interval_seconds: Optional[float] = None,
+        cold_interval_seconds: Optional[float] = None,
+        request_budget_per_minute: Optional[float] = None,
+        heat_decay: Optional[float] = None,
+        requests_per_symbol: int = 1,
+    ) -> None:
+        self.hot_interval_seconds = (
+            config.SCHEDULER_HOT_INTERVAL_SECONDS if hot_interval_seconds is None else hot_interval_seconds
+        )
+        self.cold_interval_seconds = max(
+            self.hot_interval_seconds,
+            config.SCHEDULER_COLD_INTERVAL_SECONDS if cold_interval_seconds is None else cold_interval_seconds,
+        )
+        self.request_budget_per_minute = (
+            config.SCHEDULER_REQUEST_BUDGET_PER_MINUTE if request_budget_per_minute is None else request_budget_per_minute
+        )
+        self.heat_decay = config.SCHEDULER_HEAT_DECAY if heat_decay is None else heat_decay
+        self.requests_per_symbol = max(1, requests_per_symbol)
+        self._states: Dict[SymbolKey, SymbolState] = {}
+        self._pending_heat: Dict[SymbolKey, float] = {}
+        self._heap: List[Tuple[float, int, SymbolKey, int]] = []
+        self._sequence = itertools.count()
+        self._budget_carry = 0.0
+        # Symbols handed out but cut off by a deadline; served before the heap on the next tick.
+        self._requeued: List[SymbolKey] = []
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def heat(self, exchange: str, symbol: str) -> float:
+        state = self._states.get((exchange, symbol))
+        return state.heat if state is not None else 0.0
+
+    def _push(self, key: SymbolKey, state: SymbolState) -> None:
+        state.version += 1
+        heapq.heappush(self._heap, (state.next_due, next(self._sequence), key, state.version))
+
+    def sync(self, exchange: str, symbols: Iterable[str], now: float) -> None:
+        symbols = list(symbols)
+        current = set(symbols)
+        for key in [key for key in self._states if key[0] == exchange and key[1] not in current]:
+            # Stale heap entries are skipped lazily once the state is gone.
+            del self._states[key]
+            self._pending_heat.pop(key, None)
+        for symbol in symbols:
+            key = (exchange, symbol)
+            if key not in self._states:
+                state = SymbolState(next_due=now)
+                self._states[key] = state
+                self._push(key, state)
+
+    def promote(self, exchange: str, symbols: Iterable[str]) -> None:
+        """Hand ``symbols`` out first on the next tick, ahead of every overdue symbol (e.g. new listings)."""
+        self._requeued.extend((exchange, symbol) for symbol in symbols)
+
+    def observe(self, exchange: str, symbol: str, heat: float) -> None:
+        key = (exchange, symbol)
+        if heat > self._pending_heat.get(key, 0.0):
+            self._pending_heat[key] = heat
+
+    def interval_for(self, heat: float) -> float:
+        closeness = min(1.0, max(0.0, heat))
+        return self.cold_interval_seconds - (self.cold_interval_seconds - self.hot_interval_seconds) * closeness
+
+    def budget(self, elapsed_seconds: float) -> int:
+        if self.request_budget_per_minute <= 0:
+            return len(self._states)
+        allowance = self.request_budget_per_minute * elapsed_seconds / 60 / self.requests_per_symbol
+        allowance += self._budget_carry
+        whole = int(allowance)
+        self._budget_carry = min(allowance - whole, 1.0)
+        return whole
+
+    def take_due(self, now: float, limit: int) -> Dict[str, List[str]]:
+        due: Dict[str, List[str]] = {}
+        taken = 0
+        requeued, self._requeued = self._requeued, []
+        for index, key in enumerate(requeued):
+            if taken >= limit:
+                self._requeued = requeued[index:]
+                break
+            state = self._states.get(key)
+            if state is None:
+                continue
+            # Drop the heap entry pushed alongside the requeue so the symbol is not handed out twice.
+            state.version += 1
+            due.setdefault(key[0], []).append(key[1])
+            taken += 1
+        while self._heap and taken < limit:
+            next_due, _, key, version = self._heap[0]
+            if next_due > now:
+                break
+            heapq.heappop(self._heap)
+            state = self._states.get(key)
+            if state is None or state.version != version:
+                continue
+            due.setdefault(key[0], []).append(key[1])
+            taken += 1
+        return due
+
+    def complete(
+        self, scanned: Dict[str, List[str]], now: float, skipped: Optional[Dict[str, List[str]]] = None
+    ) -> None:
+        """Reschedule the handed-out symbols; ``skipped`` ones keep their overdue slot and go first next tick."""
+        skipped_keys = {(exchange, symbol) for exchange, symbols in (skipped or {}).items() for symbol in symbols}
+        for exchange, symbols in scanned.items():
+            for symbol in symbols:
+                key = (exchange, symbol)
+                state = self._states.get(key)
+                if state is None:
+                    continue
+                if key in skipped_keys:
+                    self._requeued.append(key)
+                    self._push(key, state)
+                    continue
+                observed = self._pending_heat.pop(key, 0.0)
+                state.heat = max(observed, state.heat * self.heat_decay)
+                state.last_scanned = now
+                state.next_due = now + self.interval_for(state.heat)
+                self._push(key, state)
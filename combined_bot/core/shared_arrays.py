@@ -0,0 +1,71 @@
+"""NumPy arrays in ``multiprocessing.shared_memory`` passed to worker processes by name.
+
+The owner fills a ``SharedArray`` in place and hands its ``spec`` (name, shape,
+dtype) to the pool; workers ``attach`` to the same pages and read their slice
+without the array ever being pickled.
+"""
+
+from __future__ import annotations
+
+import sys
+from contextlib import contextmanager
+from multiprocessing import resource_tracker, shared_memory
+from typing import Iterator, Sequence, Tuple
+
+import numpy as np
+
+SharedArraySpec = Tuple[str, Tuple[int, ...], str]
+
+
+class SharedArray:
+    def __init__(self, shape: Sequence[int], dtype=np.float64) -> None:
+        dtype = np.dtype(dtype)
+        shape = tuple(int(size) for size in shape)
+        self._shm = shared_memory.SharedMemory(create=True, size=max(1, int(np.prod(shape)) * dtype.itemsize))
+        self.array = np.ndarray(shape, dtype=dtype, buffer=self._shm.buf)
+        self.spec: SharedArraySpec = (self._shm.name, shape, dtype.str)
+
+    def release(self) -> None:
+        """Unmap and remove the block; views of ``array`` must not outlive this call."""
+        if self._shm is None:
+            return
+        del self.array
+        self._shm.close()
+        self._shm.unlink()
+        self._shm = None
+
+    def __enter__(self) -> "SharedArray":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
+
+
+def share_tracker_with_workers() -> None:
+    """Start the resource tracker before a pool forks/spawns its workers.
+
+    Workers then register attached blocks with the owner's tracker instead of
+    starting their own, which would warn about and unlink the blocks at exit.
+    """
+    resource_tracker.ensure_running()
+
+
+def _open(name: str) -> shared_memory.SharedMemory:
+    # Only the owner unlinks; on 3.13+ attaching processes can opt out of the resource tracker.
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    return shared_memory.SharedMemory(name=name)
+
+
+@contextmanager
+def attach(spec: SharedArraySpec) -> Iterator[np.ndarray]:
+    """Read-only view of a ``SharedArray`` created in another process."""
+    name, shape, dtype = spec
+    shm = _open(name)
+    array = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+    array.flags.writeable = False
+    try:
+        yield array
+    finally:
+        del array
+        shm.close()
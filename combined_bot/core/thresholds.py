@@ -0,0 +1,117 @@
+"""Per-user threshold profiles evaluated against a cycle's metric matrix.
+
+Scanners declare their tunable gates in ``BaseScanner.thresholds`` (profile key
+-> metric column, upper bound or not) and gate candidates at the loosest value
+any active profile asks for. The matcher then decides, per signal row, which
+users' profiles it satisfies: identical profiles collapse to one row of a
+``(profiles, keys)`` matrix and are compared with all rows at once, so the cost
+grows with the number of distinct profiles, not users.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..models import SignalEvent, UserSettings
+from ..scanners.base import BaseScanner
+from ..signal_batch import SignalBatch
+
+
+class _ScannerProfiles:
+    __slots__ = ("keys", "metrics", "upper", "matrix", "user_profiles")
+
+    def __init__(
+        self, keys: Sequence[str], metrics: Sequence[str], upper: np.ndarray, matrix: np.ndarray, user_profiles: np.ndarray
+    ) -> None:
+        self.keys = tuple(keys)
+        self.metrics = tuple(metrics)
+        self.upper = upper
+        self.matrix = matrix
+        self.user_profiles = user_profiles
+
+    def passed(self, values: np.ndarray) -> np.ndarray:
+        """``values`` is ``(rows, keys)``; returns ``(profiles, rows)``. NaN never passes."""
+        ok = np.ones((self.matrix.shape[0], values.shape[0]), dtype=bool)
+        # One (profiles, rows) comparison per key: keys are few, profiles and rows are not.
+        for position, upper in enumerate(self.upper.tolist()):
+            limits = self.matrix[:, position, None]
+            observed = values[None, :, position]
+            ok &= observed <= limits if upper else observed >= limits
+        return ok
+
+
+class ThresholdMatcher:
+    def __init__(self, scanners: Sequence[BaseScanner]) -> None:
+        self.scanners = [scanner for scanner in scanners if getattr(scanner, "thresholds", None)]
+        self._profiles: Dict[str, _ScannerProfiles] = {}
+        self._settings: Optional[Sequence[UserSettings]] = None
+
+    def prepare(self, active_settings: Sequence[UserSettings]) -> None:
+        """Deduplicate the users' profiles and loosen every scanner's gates to the loosest one."""
+        self._profiles = {}
+        for scanner in self.scanners:
+            defaults = scanner.threshold_defaults()
+            keys = sorted(scanner.thresholds)
+            distinct: Dict[Tuple[float, ...], int] = {tuple(defaults[key] for key in keys): 0}
+            user_profiles: List[int] = []
+            for settings in active_settings:
+                overrides = settings.threshold_profiles.get(scanner.id)
+                if not overrides:
+                    user_profiles.append(0)
+                    continue
+                profile = tuple(float(overrides.get(key, defaults[key])) for key in keys)
+                user_profiles.append(distinct.setdefault(profile, len(distinct)))
+            upper = np.array([scanner.thresholds[key][1] for key in keys], dtype=bool)
+            matrix = np.array(list(distinct), dtype=np.float64).reshape(len(distinct), len(keys))
+            floors = np.where(upper, matrix.max(axis=0), matrix.min(axis=0))
+            scanner.threshold_floor = dict(zip(keys, floors.tolist()))
+            self._profiles[scanner.id] = _ScannerProfiles(
+                keys,
+                [scanner.thresholds[key][0] for key in keys],
+                upper,
+                matrix,
+                np.asarray(user_profiles, dtype=np.intp),
+            )
+        self._settings = active_settings
+
+    def _ensure(self, active_settings: Sequence[UserSettings]) -> None:
+        if active_settings is not self._settings:
+            self.prepare(active_settings)
+
+    def match(self, batch: SignalBatch, active_settings: Sequence[UserSettings]) -> Optional[np.ndarray]:
+        """``(rows, users)`` mask of which users' profiles each row satisfies; ``None`` when nothing is tunable."""
+        if not self.scanners or not len(batch):
+            return None
+        self._ensure(active_settings)
+        allowed: Optional[np.ndarray] = None
+        for code, scanner_id in enumerate(batch.scanner_ids):
+            profiles = self._profiles.get(scanner_id)
+            if profiles is None:
+                continue
+            rows = np.flatnonzero(batch.scanner_codes == code)
+            if not len(rows):
+                continue
+            values = np.empty((len(rows), len(profiles.keys)), dtype=np.float64)
+            for position, (metric, upper) in enumerate(zip(profiles.metrics, profiles.upper.tolist())):
+                # A gate the batch carries no column for cannot be checked; it passes.
+                if metric in batch.metric_names:
+                    values[:, position] = batch.metrics[rows, batch.metric_names.index(metric)]
+                else:
+                    values[:, position] = np.inf if not upper else -np.inf
+            if allowed is None:
+                allowed = np.ones((len(batch), len(active_settings)), dtype=bool)
+            allowed[rows] = profiles.passed(values).T[:, profiles.user_profiles]
+        return allowed
+
+    def match_event(self, signal: SignalEvent, active_settings: Sequence[UserSettings]) -> Optional[np.ndarray]:
+        if not self.scanners:
+            return None
+        self._ensure(active_settings)
+        profiles = self._profiles.get(signal.scanner_id)
+        if profiles is None:
+            return None
+        pairs = zip(profiles.metrics, profiles.upper.tolist())
+        values = np.array([[signal.metrics.get(metric, -np.inf if upper else np.inf) for metric, upper in pairs]], dtype=np.float64)
+        return profiles.passed(values)[:, 0][profiles.user_profiles]
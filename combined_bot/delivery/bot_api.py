@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from typing import Iterable, Optional
+
+import aiohttp
+
+from .. import config
+from ..adapters.http import SharedHttpSession, shared_http_session
+
+
+class BotApiError(RuntimeError):
+    def __init__(self, method: str, error_code: int, description: str, retry_after: Optional[float] = None) -> None:
+        super().__init__(f"{method} failed with {error_code}: {description}")
+        self.method = method
+        self.error_code = error_code
+        self.description = description
+        self.retry_after = retry_after
+
+
+# Raised before any request bytes reach Telegram, so a retry cannot duplicate the message.
+_NOT_SENT_ERRORS = (aiohttp.ClientConnectorError, aiohttp.ConnectionTimeoutError)
+
+
+class BotApiClient:
+    """Minimal Telegram Bot API client on top of the shared keep-alive aiohttp session.
+
+    Messages are serialised once with ``prepare``; each send only splices the
+    chat id into the pre-encoded JSON body and writes it to the pooled connection.
+
+    Only failures that prove the message was not taken are retried: connection
+    errors before the request went out, 429 and 5xx replies. A read timeout or
+    dropped connection after the body was sent is raised, since Telegram may
+    already have delivered the message. A 5xx from a proxy in front of an API
+    that did deliver can still produce a duplicate.
+    """
+
+    def __init__(
+        self,
+        token: str,
+        base_url: Optional[str] = None,
+        http: Optional[SharedHttpSession] = None,
+        concurrency: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        timeout_seconds: Optional[float] = None,
+    ) -> None:
+        self.logger = logging.getLogger(self.__class__.__name__)
+        base_url = (config.TG_API_BASE_URL if base_url is None else base_url).rstrip("/")
+        self._method_url = f"{base_url}/bot{token}/"
+        self._http = http if http is not None else shared_http_session
+        self.concurrency = max(1, config.TG_SEND_CONCURRENCY if concurrency is None else concurrency)
+        self.max_retries = max(0, config.TG_SEND_MAX_RETRIES if max_retries is None else max_retries)
+        self._timeout = aiohttp.ClientTimeout(
+            total=config.TG_REQUEST_TIMEOUT_SECONDS if timeout_seconds is None else timeout_seconds
+        )
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_lock = asyncio.Lock()
+
+    @staticmethod
+    def prepare(text: str, parse_mode: str = "HTML", disable_web_page_preview: bool = True) -> bytes:
+        """Encode everything of a ``sendMessage`` body except the chat id."""
+        payload = {"text": text, "parse_mode": parse_mode, "disable_web_page_preview": disable_web_page_preview}
+        return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode()[1:]
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            async with self._session_lock:
+                if self._session is None or self._session.closed:
+                    self._session = await self._http.acquire()
+        return self._session
+
+    async def _post(self, method: str, body: bytes) -> dict:
+        session = await self._get_session()
+        attempt = 0
+        while True:
+            try:
+                async with session.post(
+                    self._method_url + method,
+                    data=body,
+                    headers={"Content-Type": "application/json"},
+                    timeout=self._timeout,
+                ) as response:
+                    status = response.status
+                    try:
+                        reply = await response.json(content_type=None)
+                    except ValueError:
+                        reply = {"ok": False, "error_code": status, "description": "invalid JSON reply"}
+            except _NOT_SENT_ERRORS as exc:
+                if attempt >= self.max_retries:
+                    raise
+                delay = 0.5 * (2**attempt)
+                self.logger.warning("%s transport error, retrying in %.1fs: %s", method, delay, exc)
+            else:
+                if reply.get("ok"):
+                    return reply
+                error_code = int(reply.get("error_code", status))
+                retry_after = (reply.get("parameters") or {}).get("retry_after")
+                if attempt >= self.max_retries or not (error_code == 429 or error_code >= 500):
+                    raise BotApiError(method, error_code, str(reply.get("description", "")), retry_after)
+                delay = float(retry_after) if retry_after is not None else 0.5 * (2**attempt)
+                self.logger.warning("%s failed with %s, retrying in %.1fs", method, error_code, delay)
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def send_prepared(self, chat_id: int, prepared: bytes) -> None:
+        await self._post("sendMessage", b'{"chat_id":%d,%s' % (chat_id, prepared))
+
+    async def send_message(self, chat_id: int, text: str) -> None:
+        await self.send_prepared(chat_id, self.prepare(text))
+
+    async def send_many(self, chat_ids: Iterable[int], prepared: bytes) -> int:
+        """Send one prepared message to many chats; returns how many were accepted.
+
+        A failing chat (blocked bot, deleted chat) is logged and does not stop the fan-out.
+        """
+        queue = list(chat_ids)
+        sent = 0
+
+        async def _worker(offset: int) -> None:
+            nonlocal sent
+            for chat_id in queue[offset :: self.concurrency]:
+                try:
+                    await self.send_prepared(chat_id, prepared)
+                except Exception:
+                    self.logger.exception("failed to send message to chat %s", chat_id)
+                else:
+                    sent += 1
+
+        await asyncio.gather(*(_worker(offset) for offset in range(min(self.concurrency, len(queue)))))
+        return sent
+
+    async def close(self) -> None:
+        if self._session is None:
+            return
+        self._session = None
+        await self._http.release()
@@ -1,25 +1,51 @@
 from __future__ import annotations
 
-from datetime import timezone
+import logging
+from datetime import timezone, tzinfo
+from functools import lru_cache
 from html import escape
-from typing import Optional
-
-from telegram import Bot
+from typing import Callable, Dict, Iterable, List, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 from .. import config
-from ..models import SignalEvent
+from ..models import SignalEvent, UniverseEvent
+from .bot_api import BotApiClient
+
+
+@lru_cache(maxsize=256)
+def _zone(name: str) -> tzinfo:
+    if name.upper() == "UTC":
+        return timezone.utc
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        return timezone.utc
 
 
 class TelegramDispatcher:
-    def __init__(self, token: Optional[str] = None) -> None:
+    def __init__(self, token: Optional[str] = None, client: Optional[BotApiClient] = None) -> None:
+        self.logger = logging.getLogger(self.__class__.__name__)
         self._token = (token if token is not None else config.TG_BOT_TOKEN).strip()
-        self._bot: Optional[Bot] = Bot(token=self._token) if self._token else None
+        self._client = client
+        if self._client is None and self._token:
+            self._client = BotApiClient(self._token)
 
     @staticmethod
     def _binance_link(symbol: str) -> str:
         compact = symbol.replace("/", "").split(":", 1)[0].upper()
         return f"https://www.binance.com/en/futures/{compact}"
 
+    @classmethod
+    def _exchange_link(cls, exchange: str, symbol: str) -> str:
+        base, _, quote = symbol.split(":", 1)[0].upper().partition("/")
+        if exchange == "bybit":
+            return f"https://www.bybit.com/trade/usdt/{base}{quote}"
+        if exchange == "okx":
+            return f"https://www.okx.com/trade-swap/{base.lower()}-{quote.lower()}-swap"
+        if exchange == "mexc":
+            return f"https://futures.mexc.com/exchange/{base}_{quote}"
+        return cls._binance_link(symbol)
+
     @staticmethod
     def _format_metrics(signal: SignalEvent) -> str:
         metrics = signal.metrics
@@ -42,16 +68,31 @@ class TelegramDispatcher:
                 f"• price_growth_pct: <b>{metrics.get('price_growth_pct', 0.0):.2f}%</b>\n"
                 f"• avg_daily_vol_usd: <b>{metrics.get('avg_daily_vol_usd', 0.0):,.0f}</b>"
             )
+        if scanner == "funding_basis":
+            funding_pct = metrics.get("funding_rate", 0.0) * 100
+            lines = [f"• funding_rate: <b>{funding_pct:.4f}%</b> (z={metrics.get('funding_zscore', 0.0):+.2f})"]
+            if "basis_pct" in metrics:
+                lines.append(f"• basis: <b>{metrics['basis_pct']:+.3f}%</b> (z={metrics.get('basis_zscore', 0.0):+.2f})")
+            lines.append(f"• mark_price: <b>{metrics.get('mark_price', 0.0):.6g}</b>")
+            return "\n".join(lines)
+        if scanner == "ml_predictor":
+            return (
+                f"• ml_score: <b>{metrics.get('ml_score', 0.0):.3f}</b>\n"
+                f"• return_24h: <b>{metrics.get('return_24h', 0.0) * 100:.2f}%</b>\n"
+                f"• model: <b>{escape(signal.model_version or 'unknown')}</b>"
+            )
         return "\n".join(f"• {escape(str(key))}: <b>{value}</b>" for key, value in metrics.items())
 
-    def _format_message(self, signal: SignalEvent) -> str:
+    def _format_message(self, signal: SignalEvent, timezone_name: str = "UTC") -> str:
         symbol = escape(signal.symbol.canonical_symbol)
         scanner = escape(signal.scanner_id)
         exchange = escape(signal.symbol.exchange)
-        timestamp_utc = signal.candle_close_at.astimezone(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")
-        link = self._binance_link(signal.symbol.canonical_symbol)
+        zone = _zone(timezone_name)
+        label = "UTC" if zone is timezone.utc else escape(timezone_name)
+        candle_close = signal.candle_close_at.astimezone(zone).strftime("%Y-%m-%d %H:%M:%S")
+        link = self._exchange_link(signal.symbol.exchange, signal.symbol.canonical_symbol)
         metrics_block = self._format_metrics(signal)
-        emoji = {"vol_spike": "📊", "price_pump": "🚀", "oi_spike": "🧲"}.get(signal.scanner_id, "🔔")
+        emoji = {"vol_spike": "📊", "price_pump": "🚀", "oi_spike": "🧲", "ml_predictor": "🤖", "funding_basis": "💸"}.get(signal.scanner_id, "🔔")
         return (
             f"{emoji} <b>Signal detected</b>\n"
             f"• scanner: <b>{scanner}</b>\n"
@@ -59,17 +100,82 @@ class TelegramDispatcher:
             f"• exchange: <b>{exchange}</b>\n"
             f"• score: <b>{signal.score:.3f}</b>\n"
             f"• timeframe: <b>{escape(signal.timeframe)}</b>\n"
-            f"• candle_close: <b>{timestamp_utc}</b>\n"
+            f"• candle_close: <b>{candle_close} {label}</b>\n"
             f"{metrics_block}\n"
-            f"• binance: <a href=\"{link}\">open futures</a>"
+            f"• {exchange}: <a href=\"{link}\">open futures</a>"
         )
 
-    async def send_signal(self, chat_id: int, signal: SignalEvent) -> None:
-        if self._bot is None:
+    async def send_signal(self, chat_id: int, signal: SignalEvent, timezone_name: str = "UTC") -> None:
+        if self._client is None:
             return
-        await self._bot.send_message(chat_id=chat_id, text=self._format_message(signal), parse_mode="HTML", disable_web_page_preview=True)
+        await self._client.send_message(chat_id, self._format_message(signal, timezone_name))
+
+    def _format_universe_event(self, event: UniverseEvent, timezone_name: str = "UTC") -> str:
+        symbol = escape(event.symbol.canonical_symbol)
+        exchange = escape(event.symbol.exchange)
+        zone = _zone(timezone_name)
+        label = "UTC" if zone is timezone.utc else escape(timezone_name)
+        detected = event.detected_at.astimezone(zone).strftime("%Y-%m-%d %H:%M:%S")
+        title = "🆕 <b>New listing</b>" if event.kind == "listed" else "⛔ <b>Delisted</b>"
+        link = self._exchange_link(event.symbol.exchange, event.symbol.canonical_symbol)
+        return (
+            f"{title}\n"
+            f"• symbol: <b>{symbol}</b>\n"
+            f"• exchange: <b>{exchange}</b>\n"
+            f"• detected: <b>{detected} {label}</b>\n"
+            f"• {exchange}: <a href=\"{link}\">open futures</a>"
+        )
+
+    async def _fan_out(
+        self,
+        render: Callable[[str], str],
+        chat_ids: Iterable[int],
+        timezones: Optional[Dict[int, str]],
+        what: str,
+    ) -> int:
+        if self._client is None:
+            return 0
+        groups: Dict[str, List[int]] = {}
+        total = 0
+        for chat_id in chat_ids:
+            groups.setdefault(timezones.get(chat_id, "UTC") if timezones else "UTC", []).append(chat_id)
+            total += 1
+        sent = 0
+        for timezone_name, group in groups.items():
+            prepared = self._client.prepare(render(timezone_name))
+            sent += await self._client.send_many(group, prepared)
+        if sent != total:
+            self.logger.warning("%s delivered to %s of %s chats", what, sent, total)
+        return sent
+
+    async def send_signal_many(
+        self,
+        signal: SignalEvent,
+        chat_ids: Iterable[int],
+        timezones: Optional[Dict[int, str]] = None,
+    ) -> int:
+        """Fan one signal out to many chats, rendering it once per recipient timezone."""
+        return await self._fan_out(
+            lambda timezone_name: self._format_message(signal, timezone_name),
+            chat_ids,
+            timezones,
+            f"signal {signal.dedup_key}",
+        )
+
+    async def send_universe_event(
+        self,
+        event: UniverseEvent,
+        chat_ids: Iterable[int],
+        timezones: Optional[Dict[int, str]] = None,
+    ) -> int:
+        return await self._fan_out(
+            lambda timezone_name: self._format_universe_event(event, timezone_name),
+            chat_ids,
+            timezones,
+            f"{event.kind} event {event.symbol.exchange}:{event.symbol.canonical_symbol}",
+        )
 
     async def close(self) -> None:
-        if self._bot is None:
+        if self._client is None:
             return
-        await self._bot.shutdown()
+        await self._client.close()
@@ -2,18 +2,22 @@ from __future__ import annotations
 
 import asyncio
 import logging
+from typing import TYPE_CHECKING
 
 from combined_bot import config
-from combined_bot.adapters.base import BaseExchangeAdapter
-from combined_bot.adapters.binance import BinanceFuturesAdapter
-from combined_bot.core.database import Database
-from combined_bot.core.orchestrator import Orchestrator
-from combined_bot.delivery.telegram_dispatcher import TelegramDispatcher
 from combined_bot.models import UserSettings
-from combined_bot.scanners import OpenInterestScanner, PricePumpScanner, VolumeSpikeScanner
+
+if TYPE_CHECKING:
+    from combined_bot.adapters.base import BaseExchangeAdapter
+    from combined_bot.core.database import Database
+    from combined_bot.core.orchestrator import Orchestrator
+    from combined_bot.scanners.base import BaseScanner
 
 
 def _build_adapters() -> dict[str, BaseExchangeAdapter]:
+    from combined_bot.adapters.binance import BinanceFuturesAdapter
+    from combined_bot.adapters.ccxt_exchange import EXCHANGE_PROFILES, CcxtExchangeAdapter
+
     available_adapters = {
         "binance": BinanceFuturesAdapter,
     }
@@ -21,16 +25,39 @@ def _build_adapters() -> dict[str, BaseExchangeAdapter]:
     for exchange in config.ENABLED_EXCHANGES:
         exchange_id = exchange.strip().lower()
         adapter_class = available_adapters.get(exchange_id)
-        if adapter_class is None:
-            logging.getLogger(__name__).warning("exchange is not supported: %s", exchange)
+        if adapter_class is not None:
+            adapters[exchange_id] = adapter_class()
             continue
-        adapters[exchange_id] = adapter_class()
+        if exchange_id in EXCHANGE_PROFILES:
+            adapters[exchange_id] = CcxtExchangeAdapter(exchange_id)
+            continue
+        logging.getLogger(__name__).warning("exchange is not supported: %s", exchange)
     if not adapters:
         adapters["binance"] = BinanceFuturesAdapter()
         logging.getLogger(__name__).warning("no supported exchanges configured, falling back to binance")
     return adapters
 
 
+def _build_scanners() -> list[BaseScanner]:
+    from combined_bot.scanners import (
+        FundingBasisScanner,
+        MachineLearningScanner,
+        OpenInterestScanner,
+        PricePumpScanner,
+        VolumeSpikeScanner,
+    )
+
+    scanners: list[BaseScanner] = [
+        VolumeSpikeScanner(),
+        PricePumpScanner(),
+        OpenInterestScanner(),
+        FundingBasisScanner(),
+    ]
+    if config.ML_MODEL_PATH.exists():
+        scanners.append(MachineLearningScanner())
+    return scanners
+
+
 def _bootstrap_default_user(database: Database) -> None:
     if config.TG_DEFAULT_CHAT_ID is None:
         return
@@ -42,16 +69,26 @@ def _bootstrap_default_user(database: Database) -> None:
 
 
 def build_orchestrator() -> Orchestrator:
+    from combined_bot.core.database import Database
+    from combined_bot.core.orchestrator import Orchestrator
+    from combined_bot.core.scheduler import SymbolScheduler
+    from combined_bot.delivery.telegram_dispatcher import TelegramDispatcher
+
     logging.basicConfig(level=getattr(logging, config.LOG_LEVEL, logging.INFO))
     database = Database(config.DATABASE_PATH)
     _bootstrap_default_user(database)
     adapters = _build_adapters()
-    scanners = [
-        VolumeSpikeScanner(),
-        PricePumpScanner(),
-        OpenInterestScanner(),
-    ]
+    scanners = _build_scanners()
     dispatcher = TelegramDispatcher()
+    if config.SCHEDULER_ENABLED:
+        return Orchestrator(
+            adapters=adapters,
+            scanners=scanners,
+            database=database,
+            dispatcher=dispatcher,
+            interval_seconds=config.SCHEDULER_TICK_SECONDS,
+            scheduler=SymbolScheduler(),
+        )
     return Orchestrator(adapters=adapters, scanners=scanners, database=database, dispatcher=dispatcher)
 
 
@@ -2,14 +2,24 @@ from __future__ import annotations
 
 import hashlib
 import json
+import math
 import uuid
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from . import config
 
 
+def _finite_float(value: Any) -> Optional[float]:
+    # Non-numeric, NaN and infinite threshold values are dropped; zero and negative ones are valid gates.
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if math.isfinite(number) else None
+
+
 def _unique_normalized(items: List[str]) -> List[str]:
     unique: List[str] = []
     seen: set[str] = set()
@@ -30,6 +40,9 @@ class MarketSymbol:
     base_asset: str
     quote_asset: str
     is_active: bool = True
+    # Registry-assigned identifiers; -1 for symbols built outside SymbolRegistry.
+    symbol_id: int = field(default=-1, compare=False)
+    canonical_id: int = field(default=-1, compare=False)
 
     def __post_init__(self) -> None:
         object.__setattr__(self, "canonical_symbol", self.normalize_symbol(self.canonical_symbol))
@@ -41,10 +54,8 @@ class MarketSymbol:
         return raw_symbol.strip().upper().split(":", 1)[0]
 
     @classmethod
-    def from_raw(cls, exchange: str, raw_symbol: str, market_type: str = "spot") -> "MarketSymbol":
-        normalized = raw_symbol.strip().upper()
-        tradable_symbol = cls.normalize_symbol(normalized)
-
+    def split_symbol(cls, raw_symbol: str) -> Tuple[str, str, str]:
+        tradable_symbol = cls.normalize_symbol(raw_symbol)
         base = tradable_symbol
         quote = ""
         if "/" in tradable_symbol:
@@ -55,6 +66,12 @@ class MarketSymbol:
                     base, quote = tradable_symbol[: -len(known_quote)], known_quote
                     break
         canonical_symbol = f"{base}/{quote}" if quote else tradable_symbol
+        return canonical_symbol, base, quote
+
+    @classmethod
+    def from_raw(cls, exchange: str, raw_symbol: str, market_type: str = "spot") -> "MarketSymbol":
+        normalized = raw_symbol.strip().upper()
+        canonical_symbol, base, quote = cls.split_symbol(normalized)
         return cls(
             exchange=exchange.lower(),
             market_type=market_type,
@@ -91,6 +108,20 @@ class SignalEvent:
             self.raw_data_hash = hashlib.sha256(payload.encode()).hexdigest()
 
 
+@dataclass(frozen=True)
+class UniverseEvent:
+    """A symbol entering (``listed``) or leaving (``delisted``) an exchange's scannable universe."""
+
+    kind: str
+    symbol: MarketSymbol
+    detected_at: datetime
+
+    @property
+    def dedup_key(self) -> str:
+        raw = f"universe:{self.kind}:{self.symbol.exchange}:{self.symbol.canonical_symbol}"
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+
 @dataclass
 class UserSettings:
     chat_id: int
@@ -100,6 +131,8 @@ class UserSettings:
     min_score_threshold: float = 0.0
     blacklist_symbols: List[str] = field(default_factory=list)
     timezone: str = "UTC"
+    # scanner id -> {threshold key -> value}, e.g. {"vol_spike": {"min_vol_ratio": 3.0}}; unset keys use config.
+    threshold_profiles: Dict[str, Dict[str, float]] = field(default_factory=dict)
 
     def __post_init__(self) -> None:
         self.enabled_scanners = _unique_normalized(
@@ -113,3 +146,13 @@ class UserSettings:
             MarketSymbol.normalize_symbol(item) for item in self.blacklist_symbols if item.strip()
             ]
         )
+        profiles: Dict[str, Dict[str, float]] = {}
+        for scanner_id, profile in self.threshold_profiles.items():
+            cleaned = {
+                key.strip().lower(): number
+                for key, number in ((key, _finite_float(value)) for key, value in profile.items())
+                if key.strip() and number is not None
+            }
+            if scanner_id.strip() and cleaned:
+                profiles[scanner_id.strip().lower()] = cleaned
+        self.threshold_profiles = profiles
@@ -0,0 +1,224 @@
+"""One-shot scan: run N cycles of the scanners and stream the signals as JSONL.
+
+Nothing is written to the database and nothing is sent to Telegram; signals
+go to stdout (or ``--output``) as soon as their scanner finishes, and a timing
+report (requests, bytes, wall and CPU time per scanner) goes to stderr.
+
+    python -m combined_bot.scan --cycles 1 --scanner vol_spike,price_pump --symbols BTCUSDT,ETHUSDT
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from contextlib import ExitStack
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence, Set, TextIO, Tuple
+
+from . import config
+from .adapters.base import BaseExchangeAdapter
+from .adapters.http import RequestStats, shared_http_session
+from .core.scheduler import ScheduledAdapterView
+from .models import MarketSymbol, SignalEvent
+from .scanners.base import BaseScanner
+
+
+@dataclass
+class ScannerTiming:
+    runs: int = 0
+    signals: int = 0
+    wall_seconds: float = 0.0
+    # Only attributed when scanners run one at a time; concurrent scanners share one event loop.
+    cpu_seconds: Optional[float] = 0.0
+    requests: Optional[int] = 0
+    bytes_received: Optional[int] = 0
+
+
+def signal_record(signal: SignalEvent, cycle: int) -> Dict[str, object]:
+    return {
+        "cycle": cycle,
+        "scanner_id": signal.scanner_id,
+        "exchange": signal.symbol.exchange,
+        "symbol": signal.symbol.canonical_symbol,
+        "raw_symbol": signal.symbol.raw_symbol,
+        "timeframe": signal.timeframe,
+        "candle_close_at": signal.candle_close_at.isoformat(),
+        "detected_at": signal.detected_at.isoformat(),
+        "score": round(signal.score, 6),
+        "metrics": signal.metrics,
+        "model_version": signal.model_version,
+        "dedup_key": signal.dedup_key,
+    }
+
+
+async def restrict_symbols(
+    adapters: Dict[str, BaseExchangeAdapter], symbols: Sequence[str]
+) -> Dict[str, BaseExchangeAdapter]:
+    """Limit every adapter to the listed symbols; ``BTCUSDT``, ``BTC/USDT`` and ``BTC/USDT:USDT`` all match."""
+    wanted = {MarketSymbol.from_raw("", symbol).canonical_symbol for symbol in symbols}
+    restricted: Dict[str, BaseExchangeAdapter] = {}
+    for exchange, adapter in adapters.items():
+        listed = await adapter.list_symbols()
+        chosen = [raw for raw in listed if MarketSymbol.from_raw(exchange, raw).canonical_symbol in wanted]
+        restricted[exchange] = ScheduledAdapterView(adapter, chosen)
+    return restricted
+
+
+async def _timed_scan(
+    scanner: BaseScanner,
+    adapters: Dict[str, BaseExchangeAdapter],
+    timing: ScannerTiming,
+    stats: RequestStats,
+    deadline_seconds: float,
+    attribute: bool,
+):
+    scanner.deadline = time.monotonic() + deadline_seconds if deadline_seconds > 0 else None
+    scanner.skipped = {}
+    requests, received = stats.requests, stats.bytes_received
+    cpu_started = time.process_time()
+    started = time.monotonic()
+    try:
+        return await scanner.scan(adapters)
+    finally:
+        timing.runs += 1
+        timing.wall_seconds += time.monotonic() - started
+        if attribute:
+            timing.cpu_seconds += time.process_time() - cpu_started
+            timing.requests += stats.requests - requests
+            timing.bytes_received += stats.bytes_received - received
+        else:
+            timing.cpu_seconds = timing.requests = timing.bytes_received = None
+
+
+async def run_scan(
+    adapters: Dict[str, BaseExchangeAdapter],
+    scanners: Sequence[BaseScanner],
+    out: TextIO,
+    stats: RequestStats,
+    cycles: int = 1,
+    interval_seconds: float = 0.0,
+    concurrent: bool = False,
+    deadline_seconds: float = 0.0,
+) -> Dict[str, ScannerTiming]:
+    """Run ``cycles`` scan cycles and write each new signal to ``out`` when its scanner completes."""
+    logger = logging.getLogger("scan")
+    timings = {scanner.id: ScannerTiming() for scanner in scanners}
+    seen: Set[str] = set()
+
+    def _emit(cycle: int, scanner: BaseScanner, batch) -> None:
+        if batch is None:
+            return
+        for row in range(len(batch)):
+            signal = batch.event(row)
+            if signal.dedup_key in seen:
+                continue
+            seen.add(signal.dedup_key)
+            timings[scanner.id].signals += 1
+            out.write(json.dumps(signal_record(signal, cycle), sort_keys=True, default=str) + "\n")
+        out.flush()
+
+    async def _run(cycle: int, scanner: BaseScanner) -> Tuple[BaseScanner, object]:
+        try:
+            batch = await _timed_scan(scanner, adapters, timings[scanner.id], stats, deadline_seconds, not concurrent)
+        except Exception:
+            logger.exception("scanner failed: %s", scanner.id)
+            batch = None
+        return scanner, batch
+
+    for cycle in range(1, cycles + 1):
+        started = time.monotonic()
+        if concurrent:
+            for finished in asyncio.as_completed([_run(cycle, scanner) for scanner in scanners]):
+                _emit(cycle, *await finished)
+        else:
+            for scanner in scanners:
+                _emit(cycle, *await _run(cycle, scanner))
+        if cycle < cycles:
+            await asyncio.sleep(max(0.0, interval_seconds - (time.monotonic() - started)))
+    return timings
+
+
+def format_report(timings: Dict[str, ScannerTiming], stats: RequestStats, wall_seconds: float, cpu_seconds: float) -> str:
+    def _value(value, spec: str) -> str:
+        return "-" if value is None else format(value, spec)
+
+    lines = [f"{'scanner':<16} {'runs':>5} {'signals':>8} {'wall_s':>9} {'cpu_s':>9} {'requests':>9} {'kib_in':>10}"]
+    for scanner_id, timing in timings.items():
+        lines.append(
+            f"{scanner_id:<16} {timing.runs:>5} {timing.signals:>8} {timing.wall_seconds:>9.3f} "
+            f"{_value(timing.cpu_seconds, '.3f'):>9} {_value(timing.requests, 'd'):>9} "
+            f"{_value(None if timing.bytes_received is None else timing.bytes_received / 1024, '.1f'):>10}"
+        )
+    lines.append(
+        f"{'total':<16} {'':>5} {sum(t.signals for t in timings.values()):>8} {wall_seconds:>9.3f} {cpu_seconds:>9.3f} "
+        f"{stats.requests:>9} {stats.bytes_received / 1024:>10.1f}  (errors={stats.errors}, kib_out={stats.bytes_sent / 1024:.1f})"
+    )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    from .main import _build_adapters, _build_scanners
+
+    parser = argparse.ArgumentParser(description="Run scan cycles once and stream signals as JSONL.")
+    parser.add_argument("--cycles", type=int, default=1)
+    parser.add_argument("--interval", type=float, default=0.0, help="seconds between cycle starts")
+    parser.add_argument("--scanner", default="", help="comma-separated scanner ids (default: all)")
+    parser.add_argument("--symbols", default="", help="comma-separated symbol subset")
+    parser.add_argument("--exchanges", default="", help="comma-separated exchanges (default: ENABLED_EXCHANGES)")
+    parser.add_argument("--concurrent", action="store_true", help="run scanners concurrently like the bot does")
+    parser.add_argument("--deadline", type=float, default=0.0, help="per-scanner deadline in seconds (0 = none)")
+    parser.add_argument("--output", default="-", help="JSONL destination (default: stdout)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=getattr(logging, config.LOG_LEVEL, logging.INFO), stream=sys.stderr)
+    if args.exchanges:
+        config.ENABLED_EXCHANGES = [item.strip().lower() for item in args.exchanges.split(",") if item.strip()]
+    scanners = _build_scanners()
+    if args.scanner:
+        wanted = [item.strip() for item in args.scanner.split(",") if item.strip()]
+        unknown = sorted(set(wanted) - {scanner.id for scanner in scanners})
+        if unknown:
+            parser.error(f"unknown scanner(s): {', '.join(unknown)}")
+        scanners = [scanner for scanner in scanners if scanner.id in wanted]
+    symbols = [item.strip() for item in args.symbols.split(",") if item.strip()]
+
+    stats = RequestStats()
+    # Must be registered before the first adapter builds the shared session.
+    shared_http_session.trace_configs.append(stats.trace_config())
+
+    async def _main(out: TextIO) -> Tuple[Dict[str, ScannerTiming], float, float]:
+        adapters = _build_adapters()
+        cpu_started = time.process_time()
+        started = time.monotonic()
+        try:
+            scan_adapters = await restrict_symbols(adapters, symbols) if symbols else adapters
+            timings = await run_scan(
+                scan_adapters,
+                scanners,
+                out,
+                stats,
+                cycles=max(1, args.cycles),
+                interval_seconds=args.interval,
+                concurrent=args.concurrent,
+                deadline_seconds=args.deadline,
+            )
+            return timings, time.monotonic() - started, time.process_time() - cpu_started
+        finally:
+            for scanner in scanners:
+                await scanner.close()
+            for adapter in adapters.values():
+                await adapter.close()
+
+    with ExitStack() as stack:
+        out = sys.stdout if args.output == "-" else stack.enter_context(open(args.output, "w", encoding="utf-8"))
+        timings, wall_seconds, cpu_seconds = asyncio.run(_main(out))
+    sys.stderr.write(format_report(timings, stats, wall_seconds, cpu_seconds) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,9 +1,11 @@
+from .funding import FundingBasisScanner
 from .ml import MachineLearningScanner
 from .oi import OpenInterestScanner
 from .price import PricePumpScanner
 from .volume import VolumeSpikeScanner
 
 __all__ = [
+    "FundingBasisScanner",
     "MachineLearningScanner",
     "OpenInterestScanner",
     "PricePumpScanner",
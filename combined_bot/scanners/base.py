@@ -1,16 +1,48 @@
 from __future__ import annotations
 
+import asyncio
+import logging
+import math
+import time
 from abc import ABC, abstractmethod
 from datetime import datetime, timezone
-from typing import Dict, List
+from types import MappingProxyType
+from typing import (
+    Awaitable,
+    Callable,
+    ClassVar,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
 
+from .. import config
 from ..adapters.base import BaseExchangeAdapter
-from ..models import SignalEvent
+from ..adapters.resilience import CircuitOpenError
+from ..core.features import FeatureStore
+from ..models import UniverseEvent
+from ..signal_batch import SignalBatch
 
 
 class BaseScanner(ABC):
     id = "base"
     name = "Base Scanner"
+    metric_names: Tuple[str, ...] = ()
+    requests_per_symbol = 1
+    heat_observer: Optional[Callable[[str, str, float], None]] = None
+    # Set by the orchestrator for each cycle: a time.monotonic() deadline for per-symbol work,
+    # and the symbols the last scan had to give up on when it was reached.
+    deadline: Optional[float] = None
+    skipped: Mapping[str, List[str]] = MappingProxyType({})
+    store: Optional[FeatureStore] = None
+    # Gates users may tune per profile: key (lower-case config name) -> (metric column, is upper bound).
+    # The orchestrator sets ``threshold_floor`` each cycle to the loosest value any active profile uses.
+    thresholds: ClassVar[Mapping[str, Tuple[str, bool]]] = MappingProxyType({})
+    threshold_floor: Mapping[str, float] = MappingProxyType({})
 
     @staticmethod
     def _timeframe_seconds(timeframe: str) -> int:
@@ -29,7 +61,7 @@ class BaseScanner(ABC):
 
     @classmethod
     def _drop_open_candle(cls, candles: List[List[float]], timeframe: str) -> List[List[float]]:
-        if not candles:
+        if len(candles) == 0:
             return candles
         duration_seconds = cls._timeframe_seconds(timeframe)
         now_ts = int(datetime.now(timezone.utc).timestamp())
@@ -38,6 +70,89 @@ class BaseScanner(ABC):
             return candles[:-1]
         return candles
 
+    @staticmethod
+    def _last_value_zscore(values: List[float]) -> float:
+        if len(values) < 3:
+            return 0.0
+        history = values[:-1]
+        mean = sum(history) / len(history)
+        variance = sum((value - mean) ** 2 for value in history) / len(history)
+        if variance <= 0:
+            return 0.0
+        return (values[-1] - mean) / variance**0.5
+
+    def threshold_defaults(self) -> Dict[str, float]:
+        return {key: float(getattr(config, key.upper())) for key in self.thresholds}
+
+    def _threshold(self, key: str) -> float:
+        value = self.threshold_floor.get(key)
+        return value if value is not None else self.threshold_defaults()[key]
+
+    def _observe_heat(self, exchange: str, raw_symbol: str, heat: float) -> None:
+        # heat is the symbol's closeness to this scanner's signal condition; 1.0 means at the threshold.
+        if self.heat_observer is not None and not math.isnan(heat):
+            self.heat_observer(exchange, raw_symbol, heat)
+
+    async def _scan_symbols(
+        self,
+        adapters: Dict[str, BaseExchangeAdapter],
+        process: Callable[[str, BaseExchangeAdapter, str], Awaitable[None]],
+    ) -> None:
+        """Run ``process`` for every listed symbol, giving up on the rest once ``deadline`` passes.
+
+        Symbols are handed out in list order to a few concurrent workers. At the deadline the
+        in-flight calls are cancelled; whatever ``process`` recorded so far stays in place and the
+        unfinished symbols end up in ``skipped``.
+        """
+        work: List[Tuple[str, BaseExchangeAdapter, str]] = []
+        for exchange, adapter in adapters.items():
+            work.extend((exchange, adapter, raw_symbol) for raw_symbol in await adapter.list_symbols())
+        finished: Set[int] = set()
+        queue = iter(enumerate(work))
+        logger = logging.getLogger(self.__class__.__name__)
+        # exchange -> (symbols refused by an open circuit breaker, first refusal message).
+        circuit_open: Dict[str, Tuple[int, str]] = {}
+
+        async def _worker() -> None:
+            for index, (exchange, adapter, raw_symbol) in queue:
+                try:
+                    await process(exchange, adapter, raw_symbol)
+                except CircuitOpenError as exc:
+                    count, message = circuit_open.get(exchange, (0, str(exc)))
+                    circuit_open[exchange] = (count + 1, message)
+                except Exception:
+                    logger.exception("failed to process symbol: %s", raw_symbol)
+                finished.add(index)
+
+        workers = [asyncio.ensure_future(_worker()) for _ in range(min(max(1, config.SCANNER_SYMBOL_CONCURRENCY), len(work)))]
+        timeout = None if self.deadline is None else max(0.0, self.deadline - time.monotonic())
+        try:
+            if workers:
+                await asyncio.wait(workers, timeout=timeout)
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+        # An open breaker refuses every symbol of the exchange; one line per scan, not a traceback each.
+        for exchange, (count, message) in circuit_open.items():
+            logger.warning("%s: %d symbols not scanned, %s", exchange, count, message)
+        skipped: Dict[str, List[str]] = {}
+        for index, (exchange, _, raw_symbol) in enumerate(work):
+            if index not in finished:
+                skipped.setdefault(exchange, []).append(raw_symbol)
+        self.skipped = skipped
+
     @abstractmethod
-    async def scan(self, adapters: Dict[str, BaseExchangeAdapter]) -> List[SignalEvent]:
+    async def scan(self, adapters: Dict[str, BaseExchangeAdapter]) -> SignalBatch:
         raise NotImplementedError
+
+    def on_universe_events(self, events: Sequence[UniverseEvent]) -> None:
+        """Called before a cycle with the listings/delistings found since the previous one."""
+        if self.store is None:
+            return
+        for event in events:
+            if event.kind == "delisted":
+                self.store.discard(event.symbol.exchange, event.symbol.raw_symbol)
+
+    async def close(self) -> None:
+        return None
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import logging
+import math
+import time
+from typing import Dict, Optional, Sequence, Tuple
+
+from .. import config
+from ..adapters.base import BaseExchangeAdapter
+from ..adapters.resilience import CircuitOpenError
+from ..core.features import RollingWindow, zscore_against
+from ..models import UniverseEvent
+from ..signal_batch import SignalBatch, SignalBatchBuilder
+from ..symbols import symbol_registry
+from .base import BaseScanner
+
+_FUNDING_PERIOD_MS = 8 * 3600 * 1000
+
+
+class FundingBasisScanner(BaseScanner):
+    id = "funding_basis"
+    name = "Funding / Basis Extreme"
+    metric_names = ("funding_rate", "funding_zscore", "basis_pct", "basis_zscore", "mark_price")
+    # One bulk premium-index request per exchange and cycle, independent of the universe size.
+    requests_per_symbol = 0
+
+    def __init__(self, history_samples: Optional[int] = None) -> None:
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.history_samples = config.FUNDING_HISTORY_SAMPLES if history_samples is None else history_samples
+        self._history: Dict[Tuple[str, str], Tuple[RollingWindow, RollingWindow]] = {}
+        self._last_sample_at: Dict[str, float] = {}
+
+    def _windows(self, exchange: str, raw_symbol: str) -> Tuple[RollingWindow, RollingWindow]:
+        key = (exchange, raw_symbol)
+        windows = self._history.get(key)
+        if windows is None:
+            windows = (RollingWindow(self.history_samples), RollingWindow(self.history_samples))
+            self._history[key] = windows
+        return windows
+
+    def on_universe_events(self, events: Sequence[UniverseEvent]) -> None:
+        for event in events:
+            if event.kind == "delisted":
+                self._history.pop((event.symbol.exchange, event.symbol.raw_symbol), None)
+
+    async def scan(self, adapters: Dict[str, BaseExchangeAdapter]) -> SignalBatch:
+        signals = SignalBatchBuilder(self.id, "8h", self.metric_names, ttl_seconds=_FUNDING_PERIOD_MS // 1000)
+        now = time.time()
+        for exchange, adapter in adapters.items():
+            try:
+                premium = await adapter.fetch_premium_index()
+            except CircuitOpenError as exc:
+                self.logger.warning("premium index not fetched: %s", exc)
+                continue
+            except Exception:
+                self.logger.exception("failed to fetch premium index: %s", exchange)
+                continue
+            if not premium:
+                continue
+            for raw_symbol in await adapter.list_symbols():
+                item = premium.get(raw_symbol)
+                if item is None:
+                    continue
+                try:
+                    self._evaluate(signals, exchange, raw_symbol, item, now)
+                except Exception:
+                    self.logger.exception("failed to process symbol in funding scanner: %s", raw_symbol)
+            # Samples are spaced by FUNDING_SAMPLE_INTERVAL_SECONDS so the history length covers the
+            # same span however often the loop ticks; every symbol of the bulk response is recorded.
+            if now - self._last_sample_at.get(exchange, 0.0) >= config.FUNDING_SAMPLE_INTERVAL_SECONDS:
+                self._last_sample_at[exchange] = now
+                for key in [key for key in self._history if key[0] == exchange and key[1] not in premium]:
+                    del self._history[key]
+                for raw_symbol, item in premium.items():
+                    self._record(exchange, raw_symbol, item)
+        return signals.build()
+
+    @staticmethod
+    def _basis_pct(item: Dict[str, float]) -> float:
+        index_price = item.get("index_price", 0.0)
+        if index_price <= 0 or item.get("mark_price", 0.0) <= 0:
+            return float("nan")
+        return (item["mark_price"] - index_price) / index_price * 100
+
+    def _record(self, exchange: str, raw_symbol: str, item: Dict[str, float]) -> None:
+        funding_history, basis_history = self._windows(exchange, raw_symbol)
+        funding_history.push(item["funding_rate"])
+        basis_pct = self._basis_pct(item)
+        if not math.isnan(basis_pct):
+            basis_history.push(basis_pct)
+
+    def _evaluate(
+        self,
+        signals: SignalBatchBuilder,
+        exchange: str,
+        raw_symbol: str,
+        item: Dict[str, float],
+        now: float,
+    ) -> None:
+        funding_history, basis_history = self._windows(exchange, raw_symbol)
+        funding_rate = item["funding_rate"]
+        basis_pct = self._basis_pct(item)
+        funding_z = zscore_against(funding_history, funding_rate)
+        basis_z = zscore_against(basis_history, basis_pct) if not math.isnan(basis_pct) else 0.0
+        if funding_history.count < config.FUNDING_MIN_SAMPLES:
+            return
+
+        threshold = max(config.FUNDING_ZSCORE, 1e-9)
+        self._observe_heat(exchange, raw_symbol, max(abs(funding_z), abs(basis_z)) / threshold)
+        funding_extreme = abs(funding_z) >= threshold and abs(funding_rate) >= config.FUNDING_MIN_ABS_RATE
+        basis_extreme = (
+            basis_history.count >= config.FUNDING_MIN_SAMPLES
+            and abs(basis_z) >= threshold
+            and abs(basis_pct) >= config.BASIS_MIN_ABS_PCT
+        )
+        if not (funding_extreme or basis_extreme):
+            return
+        # One alert per symbol and funding period: the period's settlement time is the dedup timestamp.
+        period_ms = int(item.get("next_funding_ms") or 0)
+        if period_ms <= 0:
+            period_ms = (int(now * 1000) // _FUNDING_PERIOD_MS + 1) * _FUNDING_PERIOD_MS
+        signals.add(
+            symbol_registry.intern(exchange, raw_symbol, market_type="linear_perp"),
+            candle_close_ms=period_ms,
+            score=min(1.0, max(abs(funding_z), abs(basis_z)) / (2 * threshold)),
+            metrics=(funding_rate, funding_z, basis_pct, basis_z, item.get("mark_price", 0.0)),
+        )
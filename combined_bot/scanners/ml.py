@@ -1,34 +1,163 @@
 from __future__ import annotations
 
+import asyncio
 import hashlib
-import pickle
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from typing import Dict, List, Optional
+from types import MappingProxyType
+from typing import Dict, List, Optional, Tuple
 
+import numpy as np
+
+from .. import config
 from ..adapters.base import BaseExchangeAdapter
-from ..models import SignalEvent
+from ..adapters.resilience import CircuitOpenError
+from ..core import inference
+from ..core.features import FeatureStore, feature_store
+from ..core.shared_arrays import SharedArray, share_tracker_with_workers
+from ..signal_batch import SignalBatch, SignalBatchBuilder
+from ..symbols import symbol_registry
 from .base import BaseScanner
 
 
 class MachineLearningScanner(BaseScanner):
     id = "ml_predictor"
     name = "ML Predictor"
+    metric_names = ("ml_score", "return_24h", "log_volume_ratio_24h")
+    # Reads the shared 1h feature series that the volume and price scanners keep up to date.
+    requests_per_symbol = 0
+    thresholds = MappingProxyType({"ml_min_score": ("ml_score", False)})
 
-    def __init__(self, model_path: Optional[Path] = None, expected_sha256: Optional[str] = None) -> None:
-        self.model_path = model_path or Path("pump_predictor_model.pkl")
-        self.expected_sha256 = expected_sha256
-        self._model = None
+    def __init__(
+        self,
+        model_path: Optional[Path] = None,
+        expected_sha256: Optional[str] = None,
+        workers: Optional[int] = None,
+        min_score: Optional[float] = None,
+        store: Optional[FeatureStore] = None,
+    ) -> None:
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.store = store if store is not None else feature_store
+        self.store.register("1h", history=inference.WINDOW_HOURS)
+        self.model_path = model_path or config.ML_MODEL_PATH
+        self.expected_sha256 = (expected_sha256 if expected_sha256 is not None else config.ML_MODEL_SHA256).lower()
+        self.workers = config.ML_WORKERS if workers is None else workers
+        self.min_score = config.ML_MIN_SCORE if min_score is None else min_score
+        self._model: Optional[inference.InferenceModel] = None
+        self._pool: Optional[ProcessPoolExecutor] = None
         self._try_load_model()
 
+    @property
+    def model_version(self) -> Optional[str]:
+        return self._model.version if self._model is not None else None
+
+    def threshold_defaults(self) -> Dict[str, float]:
+        return {"ml_min_score": self.min_score}
+
     def _try_load_model(self) -> None:
-        if not self.model_path.exists() or not self.expected_sha256:
-            return
-        file_hash = hashlib.sha256(self.model_path.read_bytes()).hexdigest()
-        if file_hash != self.expected_sha256:
+        if not self.model_path.exists():
             return
-        with self.model_path.open("rb") as model_file:
-            self._model = pickle.load(model_file)
+        try:
+            # The checksum is taken over the very bytes that get parsed, so a file swapped after the
+            # check is never loaded.
+            content = self.model_path.read_bytes()
+            if self.expected_sha256 and hashlib.sha256(content).hexdigest() != self.expected_sha256:
+                self.logger.warning("model checksum mismatch, ML scanner disabled: %s", self.model_path)
+                return
+            self._model = inference.load_model(self.model_path, content)
+        except (OSError, KeyError, ValueError):
+            self.logger.exception("failed to load model, ML scanner disabled: %s", self.model_path)
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            share_tracker_with_workers()
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=inference.init_worker,
+                initargs=(self._model,),
+            )
+        return self._pool
+
+    def _score(self, candles: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        assert self._model is not None
+        features = inference.build_features(candles)
+        return inference.predict(self._model, features), features
+
+    async def _score_shared(self, shared: SharedArray) -> Tuple[np.ndarray, np.ndarray]:
+        """Score a shared candle stack in contiguous row slices, one pool task per slice."""
+        rows = shared.array.shape[0]
+        slices = max(1, min(self.workers, -(-rows // max(1, config.ML_WORKER_MIN_ROWS))))
+        bounds = np.linspace(0, rows, slices + 1).astype(int).tolist()
+        loop = asyncio.get_running_loop()
+        executor = self._executor()
+        try:
+            results = await asyncio.gather(
+                *(
+                    loop.run_in_executor(executor, inference.score_shared_slice_in_worker, shared.spec, start, stop)
+                    for start, stop in zip(bounds, bounds[1:])
+                )
+            )
+        except BrokenProcessPool:
+            self._pool = None
+            raise
+        return np.concatenate([scores for scores, _ in results]), np.concatenate([features for _, features in results])
+
+    async def _collect_candles(
+        self, adapters: Dict[str, BaseExchangeAdapter]
+    ) -> Tuple[List[Tuple[str, str]], List[List[Tuple[float, ...]]]]:
+        collected: Dict[Tuple[str, str], List[Tuple[float, ...]]] = {}
+
+        async def _process(exchange: str, adapter: BaseExchangeAdapter, raw_symbol: str) -> None:
+            try:
+                series = await self.store.refresh(adapter, exchange, raw_symbol, "1h")
+            except CircuitOpenError:
+                raise
+            except Exception:
+                self.logger.exception("failed to fetch candles in ML scanner: %s", raw_symbol)
+                return
+            if len(series) >= inference.WINDOW_HOURS:
+                collected[(exchange, raw_symbol)] = series.tail(inference.WINDOW_HOURS)
+
+        await self._scan_symbols(adapters, _process)
+        keys = list(collected)
+        windows = [collected[key] for key in keys]
+        return keys, windows
+
+    async def scan(self, adapters: Dict[str, BaseExchangeAdapter]) -> SignalBatch:
+        if self._model is None:
+            return SignalBatch.empty()
+        keys, windows = await self._collect_candles(adapters)
+        if not keys:
+            return SignalBatch.empty()
+
+        if self.workers <= 0:
+            candles = np.asarray(windows, dtype=np.float64)
+            close_ms = candles[:, -1, 0]
+            # Inline mode still keeps the event loop free for the other scanners and delivery.
+            scores, features = await asyncio.to_thread(self._score, candles)
+        else:
+            # Workers read their slice straight from shared memory; only scores and features come back.
+            with SharedArray((len(windows), inference.WINDOW_HOURS, 6)) as shared:
+                shared.array[:] = windows
+                close_ms = shared.array[:, -1, 0].copy()
+                scores, features = await self._score_shared(shared)
+
+        signals = SignalBatchBuilder(self.id, "1h", self.metric_names, model_version=self._model.version)
+        return_24h = features[:, inference.FEATURE_NAMES.index("return_24h")]
+        volume_ratio = features[:, inference.FEATURE_NAMES.index("log_volume_ratio_24h")]
+        for row in np.flatnonzero(scores >= self._threshold("ml_min_score")):
+            exchange, raw_symbol = keys[row]
+            signals.add(
+                symbol_registry.intern(exchange, raw_symbol, market_type="linear_perp"),
+                candle_close_ms=int(close_ms[row]),
+                score=float(min(1.0, max(0.0, scores[row]))),
+                metrics=(float(scores[row]), float(return_24h[row]), float(volume_ratio[row])),
+            )
+        return signals.build()
 
-    async def scan(self, adapters: Dict[str, BaseExchangeAdapter]) -> List[SignalEvent]:
-        _ = adapters
-        return []
+    async def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
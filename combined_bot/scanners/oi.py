@@ -2,20 +2,43 @@ from __future__ import annotations
 
 import logging
 from datetime import datetime, timezone
-from typing import Dict, List
+from types import MappingProxyType
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
 
 from .. import config
 from ..adapters.base import BaseExchangeAdapter
-from ..models import MarketSymbol, SignalEvent
+from ..adapters.resilience import CircuitOpenError
+from ..core.features import Feature, FeatureStore, feature_store, timeframe_ms
+from ..models import UniverseEvent
+from ..signal_batch import SignalBatch, SignalBatchBuilder
+from ..symbols import symbol_registry
 from .base import BaseScanner
 
 
 class OpenInterestScanner(BaseScanner):
     id = "oi_spike"
     name = "Open Interest Spike"
+    metric_names = ("oi_start", "oi_end", "oi_growth_pct", "price_growth_pct", "avg_daily_vol_usd", "oi_usd")
+    requests_per_symbol = 2
+    thresholds = MappingProxyType(
+        {
+            "oi_growth_pct": ("oi_growth_pct", False),
+            "oi_max_price_growth_pct": ("price_growth_pct", True),
+            "oi_min_avg_daily_vol_usd": ("avg_daily_vol_usd", False),
+        }
+    )
 
-    def __init__(self) -> None:
+    def __init__(self, store: Optional[FeatureStore] = None) -> None:
         self.logger = logging.getLogger(self.__class__.__name__)
+        self.store = store if store is not None else feature_store
+        self.window_days = config.OI_DAYS
+        self.store.register("1d", Feature.window("close", self.window_days), Feature.window("usd_volume", self.window_days))
+        # Daily bars are aggregated from the 1h klines the volume/price scanners already fetch.
+        self.store.derive("1d", "1h")
+        # Closed OI points per symbol, valid for the UTC day they were fetched on.
+        self._oi_history: Dict[Tuple[str, str], Tuple[int, List[Dict[str, float]]]] = {}
 
     def _sort_value(self, oi_end: float, avg_daily_vol_usd: float, price_growth_pct: float, end_close: float) -> float:
         mode = config.OI_SORT_BY
@@ -36,72 +59,115 @@ class OpenInterestScanner(BaseScanner):
             return oi_hist[:-1]
         return oi_hist
 
-    async def scan(self, adapters: Dict[str, BaseExchangeAdapter]) -> List[SignalEvent]:
-        signals_with_sort: List[tuple[float, SignalEvent]] = []
-        for exchange, adapter in adapters.items():
-            symbols = await adapter.list_symbols()
-            for raw_symbol in symbols:
+    def on_universe_events(self, events: Sequence[UniverseEvent]) -> None:
+        super().on_universe_events(events)
+        for event in events:
+            if event.kind == "delisted":
+                self._oi_history.pop((event.symbol.exchange, event.symbol.raw_symbol), None)
+
+    async def _closed_oi_history(self, adapter: BaseExchangeAdapter, exchange: str, raw_symbol: str) -> List[Dict[str, float]]:
+        # Daily OI points only close at 00:00 UTC, so one fetch per symbol per day is enough.
+        day_ms = timeframe_ms("1d")
+        today = int(datetime.now(timezone.utc).timestamp() * 1000) // day_ms
+        key = (exchange, raw_symbol)
+        cached = self._oi_history.get(key)
+        if cached is not None and cached[0] == today:
+            return cached[1]
+        oi_hist = self._drop_open_oi_point(await adapter.fetch_open_interest_history(raw_symbol, days=config.OI_DAYS + 1))
+        # A history that lags behind the last closed day is not cached; the next cycle asks again.
+        if oi_hist and int(float(oi_hist[-1].get("ts", 0))) >= (today - 1) * day_ms:
+            self._oi_history[key] = (today, oi_hist)
+        return oi_hist
+
+    def _price_growth_pct(self, start_close: float, end_close: float, avg_daily_vol_usd: float) -> Optional[float]:
+        """Price growth over the window, or ``None`` when the price or volume gate rejects it."""
+        if start_close <= 0:
+            return None
+        price_growth_pct = (end_close - start_close) / start_close * 100
+        if price_growth_pct > self._threshold("oi_max_price_growth_pct"):
+            return None
+        if avg_daily_vol_usd < self._threshold("oi_min_avg_daily_vol_usd"):
+            return None
+        return price_growth_pct
+
+    async def scan(self, adapters: Dict[str, BaseExchangeAdapter]) -> SignalBatch:
+        signals = SignalBatchBuilder(self.id, "1d", self.metric_names, ttl_seconds=config.OI_DAYS * 24 * 3600)
+        sort_values: List[float] = []
+        supported = {
+            exchange: adapter
+            for exchange, adapter in adapters.items()
+            if getattr(adapter, "supports_open_interest_history", True)
+        }
+        ticker_volumes: Dict[str, Dict[str, float]] = {}
+        # Opt-in (OI_MIN_TICKER_VOL_USD > 0); a profile that loosens the average-volume gate loosens it too.
+        min_ticker_vol_usd = min(config.OI_MIN_TICKER_VOL_USD, self._threshold("oi_min_avg_daily_vol_usd"))
+        if min_ticker_vol_usd > 0:
+            for exchange, adapter in supported.items():
                 try:
-                    oi_hist = await adapter.fetch_open_interest_history(raw_symbol, days=config.OI_DAYS + 1)
-                    oi_hist = self._drop_open_oi_point(oi_hist)
-                    candles = await adapter.fetch_ohlcv(raw_symbol, timeframe="1d", limit=config.OI_DAYS + 2)
-                    candles = self._drop_open_candle(candles, timeframe="1d")
-
-                    window_size = min(config.OI_DAYS, len(oi_hist), len(candles))
-                    if window_size < 2:
-                        continue
-                    aligned_oi = oi_hist[-window_size:]
-                    aligned_candles = candles[-window_size:]
-
-                    start = float(aligned_oi[0].get("oi", 0.0))
-                    end = float(aligned_oi[-1].get("oi", 0.0))
-                    if start <= 0:
-                        continue
-                    growth_pct = (end - start) / start * 100
-                    if growth_pct < config.OI_GROWTH_PCT:
-                        continue
-
-                    start_close = float(aligned_candles[0][4])
-                    end_close = float(aligned_candles[-1][4])
-                    if start_close <= 0:
-                        continue
-
-                    price_growth_pct = (end_close - start_close) / start_close * 100
-                    if price_growth_pct > config.OI_MAX_PRICE_GROWTH_PCT:
-                        continue
-
-                    avg_daily_vol_usd = (
-                        sum(float(candle[4]) * float(candle[5]) for candle in aligned_candles) / len(aligned_candles)
-                    )
-                    if avg_daily_vol_usd < config.OI_MIN_AVG_DAILY_VOL_USD:
-                        continue
-
-                    ts = int(aligned_oi[-1].get("ts", 0)) or int(datetime.now(tz=timezone.utc).timestamp() * 1000)
-                    signal = SignalEvent(
-                        scanner_id=self.id,
-                        symbol=MarketSymbol.from_raw(exchange, raw_symbol, market_type="linear_perp"),
-                        timeframe="1d",
-                        detected_at=datetime.now(timezone.utc),
-                        candle_close_at=datetime.fromtimestamp(ts / 1000, timezone.utc),
-                        score=min(1.0, growth_pct / 200),
-                        metrics={
-                            "oi_start": start,
-                            "oi_end": end,
-                            "oi_growth_pct": growth_pct,
-                            "price_growth_pct": price_growth_pct,
-                            "avg_daily_vol_usd": avg_daily_vol_usd,
-                            "oi_usd": end * end_close,
-                        },
-                        ttl_seconds=config.OI_DAYS * 24 * 3600,
-                    )
-                    sort_value = self._sort_value(
-                        end,
-                        signal.metrics["avg_daily_vol_usd"],
-                        signal.metrics["price_growth_pct"],
-                        end_close,
-                    )
-                    signals_with_sort.append((sort_value, signal))
+                    ticker_volumes[exchange] = await adapter.fetch_24h_quote_volumes()
+                except CircuitOpenError as exc:
+                    self.logger.warning("tickers for oi pre-filter not fetched: %s", exc)
                 except Exception:
-                    self.logger.exception("failed to process symbol in oi scanner: %s", raw_symbol)
-        signals_with_sort.sort(key=lambda item: item[0], reverse=True)
-        return [item[1] for item in signals_with_sort]
+                    self.logger.exception("failed to fetch tickers for oi pre-filter: %s", exchange)
+
+        async def _process(exchange: str, adapter: BaseExchangeAdapter, raw_symbol: str) -> None:
+            try:
+                # Filters run cheapest first: the bulk ticker, then daily bars (usually already in the
+                # store), and only the symbols that survive both cost an OI history request.
+                ticker_volume = ticker_volumes.get(exchange, {}).get(raw_symbol)
+                if ticker_volume is not None and ticker_volume < min_ticker_vol_usd:
+                    self._observe_heat(exchange, raw_symbol, 0.0)
+                    return
+                series = await self.store.refresh(adapter, exchange, raw_symbol, "1d")
+                if len(series) < 2:
+                    return
+                if len(series) >= self.window_days:
+                    closes = series.window("close", self.window_days)
+                    start_close, end_close = closes.first, closes.last
+                    avg_daily_vol_usd = series.window("usd_volume", self.window_days).mean
+                    price_growth_pct = self._price_growth_pct(start_close, end_close, avg_daily_vol_usd)
+                    if price_growth_pct is None:
+                        self._observe_heat(exchange, raw_symbol, 0.0)
+                        return
+
+                oi_hist = await self._closed_oi_history(adapter, exchange, raw_symbol)
+                window_size = min(config.OI_DAYS, len(oi_hist), len(series))
+                if window_size < 2:
+                    return
+                aligned_oi = oi_hist[-window_size:]
+
+                start = float(aligned_oi[0].get("oi", 0.0))
+                end = float(aligned_oi[-1].get("oi", 0.0))
+                if start <= 0:
+                    return
+                growth_pct = (end - start) / start * 100
+                min_growth_pct = self._threshold("oi_growth_pct")
+                self._observe_heat(exchange, raw_symbol, growth_pct / max(min_growth_pct, 1e-9))
+                if growth_pct < min_growth_pct:
+                    return
+
+                if window_size < self.window_days:
+                    # Short history (fresh listing): fall back to the raw tail of the series.
+                    aligned_candles = series.tail(window_size)
+                    start_close, end_close = aligned_candles[0][4], aligned_candles[-1][4]
+                    avg_daily_vol_usd = sum(candle[4] * candle[5] for candle in aligned_candles) / window_size
+                    price_growth_pct = self._price_growth_pct(start_close, end_close, avg_daily_vol_usd)
+                    if price_growth_pct is None:
+                        return
+
+                ts = int(aligned_oi[-1].get("ts", 0)) or int(datetime.now(tz=timezone.utc).timestamp() * 1000)
+                signals.add(
+                    symbol_registry.intern(exchange, raw_symbol, market_type="linear_perp"),
+                    candle_close_ms=ts,
+                    score=min(1.0, growth_pct / 200),
+                    metrics=(start, end, growth_pct, price_growth_pct, avg_daily_vol_usd, end * end_close),
+                )
+                sort_values.append(self._sort_value(end, avg_daily_vol_usd, price_growth_pct, end_close))
+            except CircuitOpenError:
+                raise
+            except Exception:
+                self.logger.exception("failed to process symbol in oi scanner: %s", raw_symbol)
+
+        await self._scan_symbols(supported, _process)
+        order = np.argsort(-np.asarray(sort_values, dtype=np.float64), kind="stable")
+        return signals.build().take(order)
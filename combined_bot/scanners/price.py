@@ -1,53 +1,76 @@
 from __future__ import annotations
 
 import logging
-from datetime import datetime, timezone
-from typing import Dict, List
+from types import MappingProxyType
+from typing import Dict, Optional
 
 from .. import config
 from ..adapters.base import BaseExchangeAdapter
-from ..models import MarketSymbol, SignalEvent
+from ..adapters.resilience import CircuitOpenError
+from ..core.features import Feature, FeatureStore, feature_store
+from ..signal_batch import SignalBatch, SignalBatchBuilder
+from ..symbols import symbol_registry
 from .base import BaseScanner
 
 
 class PricePumpScanner(BaseScanner):
     id = "price_pump"
     name = "24h Price Pump"
+    metric_names = ("price_ratio", "volume_usd")
+    requests_per_symbol = 1
+    thresholds = MappingProxyType(
+        {
+            "min_price_ratio": ("price_ratio", False),
+            "min_price_scanner_vol_usd_24h": ("volume_usd", False),
+        }
+    )
 
-    def __init__(self) -> None:
+    def __init__(self, store: Optional[FeatureStore] = None) -> None:
         self.logger = logging.getLogger(self.__class__.__name__)
+        self.store = store if store is not None else feature_store
+        self.store.register(
+            "1h",
+            Feature.window("close", 24),
+            Feature.window("usd_volume", 24),
+            Feature.zscore("abs_return", 22),
+        )
 
-    async def scan(self, adapters: Dict[str, BaseExchangeAdapter]) -> List[SignalEvent]:
-        signals: List[SignalEvent] = []
-        for exchange, adapter in adapters.items():
-            symbols = await adapter.list_symbols()
-            for raw_symbol in symbols:
-                try:
-                    candles = await adapter.fetch_ohlcv(raw_symbol, timeframe="1h", limit=25)
-                    candles = self._drop_open_candle(candles, timeframe="1h")
-                    if len(candles) < 24:
-                        continue
-                    first_close = float(candles[0][4])
-                    last_close = float(candles[-1][4])
-                    if first_close <= 0:
-                        continue
-                    ratio = last_close / first_close
-                    usd_volume = sum(float(c[4]) * float(c[5]) for c in candles)
-                    if ratio < config.MIN_PRICE_RATIO or usd_volume < config.MIN_PRICE_SCANNER_VOL_USD_24H:
-                        continue
-                    close_ts = int(candles[-1][0])
-                    signals.append(
-                        SignalEvent(
-                            scanner_id=self.id,
-                            symbol=MarketSymbol.from_raw(exchange, raw_symbol, market_type="linear_perp"),
-                            timeframe="1h",
-                            detected_at=datetime.now(timezone.utc),
-                            candle_close_at=datetime.fromtimestamp(close_ts / 1000, timezone.utc),
-                            direction="LONG",
-                            score=min(1.0, (ratio - 1.0) / max(config.PRICE_SCORE_MAX_RATIO - 1.0, 1e-9)),
-                            metrics={"price_ratio": ratio, "volume_usd": usd_volume},
-                        )
-                    )
-                except Exception:
-                    self.logger.exception("failed to process symbol in price scanner: %s", raw_symbol)
-        return signals
+    async def scan(self, adapters: Dict[str, BaseExchangeAdapter]) -> SignalBatch:
+        signals = SignalBatchBuilder(self.id, "1h", self.metric_names)
+        async def _process(exchange: str, adapter: BaseExchangeAdapter, raw_symbol: str) -> None:
+            try:
+                series = await self.store.refresh(adapter, exchange, raw_symbol, "1h")
+                closes = series.window("close", 24)
+                if not closes.full:
+                    return
+                first_close = closes.first
+                last_close = closes.last
+                if first_close <= 0:
+                    return
+                ratio = last_close / first_close
+                min_ratio = self._threshold("min_price_ratio")
+                self._observe_heat(
+                    exchange,
+                    raw_symbol,
+                    max(
+                        (ratio - 1.0) / max(min_ratio - 1.0, 1e-9),
+                        series.zscore("abs_return", 22) / config.SCHEDULER_HOT_ZSCORE,
+                    ),
+                )
+                usd_volume = series.window("usd_volume", 24).sum
+                if ratio < min_ratio or usd_volume < self._threshold("min_price_scanner_vol_usd_24h"):
+                    return
+                signals.add(
+                    symbol_registry.intern(exchange, raw_symbol, market_type="linear_perp"),
+                    candle_close_ms=series.last_open_ms,
+                    score=min(1.0, (ratio - 1.0) / max(config.PRICE_SCORE_MAX_RATIO - 1.0, 1e-9)),
+                    metrics=(ratio, usd_volume),
+                    direction="LONG",
+                )
+            except CircuitOpenError:
+                raise
+            except Exception:
+                self.logger.exception("failed to process symbol in price scanner: %s", raw_symbol)
+
+        await self._scan_symbols(adapters, _process)
+        return signals.build()
@@ -1,53 +1,74 @@
 from __future__ import annotations
 
 import logging
-from datetime import datetime, timezone
-from typing import Dict, List
+from types import MappingProxyType
+from typing import Dict, Optional
 
 from .. import config
 from ..adapters.base import BaseExchangeAdapter
-from ..models import MarketSymbol, SignalEvent
+from ..adapters.resilience import CircuitOpenError
+from ..core.features import Feature, FeatureStore, feature_store
+from ..signal_batch import SignalBatch, SignalBatchBuilder
+from ..symbols import symbol_registry
 from .base import BaseScanner
 
 
 class VolumeSpikeScanner(BaseScanner):
     id = "vol_spike"
     name = "Volume Spike"
+    metric_names = ("prev_24h_volume_usd", "last_24h_volume_usd", "ratio")
+    requests_per_symbol = 1
+    thresholds = MappingProxyType(
+        {
+            "min_vol_ratio": ("ratio", False),
+            "min_vol_usd_last": ("last_24h_volume_usd", False),
+        }
+    )
 
-    def __init__(self) -> None:
+    def __init__(self, store: Optional[FeatureStore] = None) -> None:
         self.logger = logging.getLogger(self.__class__.__name__)
+        self.store = store if store is not None else feature_store
+        self.store.register(
+            "1h",
+            Feature.window("usd_volume", 24),
+            Feature.window("usd_volume", 48),
+            Feature.zscore("usd_volume", 47),
+        )
 
-    async def scan(self, adapters: Dict[str, BaseExchangeAdapter]) -> List[SignalEvent]:
-        signals: List[SignalEvent] = []
-        for exchange, adapter in adapters.items():
-            symbols = await adapter.list_symbols()
-            for raw_symbol in symbols:
-                try:
-                    candles = await adapter.fetch_ohlcv(raw_symbol, timeframe="1h", limit=49)
-                    candles = self._drop_open_candle(candles, timeframe="1h")
-                    if len(candles) < 48:
-                        continue
-                    prev = candles[:24]
-                    last = candles[24:]
-                    prev_usd = sum(float(c[4]) * float(c[5]) for c in prev)
-                    last_usd = sum(float(c[4]) * float(c[5]) for c in last)
-                    if prev_usd <= 0:
-                        continue
-                    ratio = last_usd / prev_usd
-                    if last_usd < config.MIN_VOL_USD_LAST or ratio < config.MIN_VOL_RATIO:
-                        continue
-                    close_ts = int(candles[-1][0])
-                    signals.append(
-                        SignalEvent(
-                            scanner_id=self.id,
-                            symbol=MarketSymbol.from_raw(exchange, raw_symbol, market_type="linear_perp"),
-                            timeframe="1h",
-                            detected_at=datetime.now(timezone.utc),
-                            candle_close_at=datetime.fromtimestamp(close_ts / 1000, timezone.utc),
-                            score=min(1.0, ratio / 10),
-                            metrics={"prev_24h_volume_usd": prev_usd, "last_24h_volume_usd": last_usd, "ratio": ratio},
-                        )
-                    )
-                except Exception:
-                    self.logger.exception("failed to process symbol in volume scanner: %s", raw_symbol)
-        return signals
+    async def scan(self, adapters: Dict[str, BaseExchangeAdapter]) -> SignalBatch:
+        signals = SignalBatchBuilder(self.id, "1h", self.metric_names)
+        async def _process(exchange: str, adapter: BaseExchangeAdapter, raw_symbol: str) -> None:
+            try:
+                series = await self.store.refresh(adapter, exchange, raw_symbol, "1h")
+                both_days = series.window("usd_volume", 48)
+                if not both_days.full:
+                    return
+                last_usd = series.window("usd_volume", 24).sum
+                prev_usd = both_days.sum - last_usd
+                if prev_usd <= 0:
+                    return
+                ratio = last_usd / prev_usd
+                min_ratio = self._threshold("min_vol_ratio")
+                self._observe_heat(
+                    exchange,
+                    raw_symbol,
+                    max(
+                        ratio / max(min_ratio, 1e-9),
+                        series.zscore("usd_volume", 47) / config.SCHEDULER_HOT_ZSCORE,
+                    ),
+                )
+                if last_usd < self._threshold("min_vol_usd_last") or ratio < min_ratio:
+                    return
+                signals.add(
+                    symbol_registry.intern(exchange, raw_symbol, market_type="linear_perp"),
+                    candle_close_ms=series.last_open_ms,
+                    score=min(1.0, ratio / 10),
+                    metrics=(prev_usd, last_usd, ratio),
+                )
+            except CircuitOpenError:
+                raise
+            except Exception:
+                self.logger.exception("failed to process symbol in volume scanner: %s", raw_symbol)
+
+        await self._scan_symbols(adapters, _process)
+        return signals.build()
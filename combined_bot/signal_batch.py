@@ -0,0 +1,293 @@
+from __future__ import annotations
+
+import hashlib
+import math
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .models import MarketSymbol, SignalEvent
+from .symbols import SymbolRegistry, symbol_registry
+
+_DIRECTIONS: Tuple[Optional[str], ...] = (None, "LONG", "SHORT")
+
+
+class SignalBatch:
+    """Columnar set of candidate signals.
+
+    Rows are parallel arrays (scanner code, interned symbol id, timestamps,
+    score, metrics matrix). Dedup keys are computed in bulk on demand and
+    ``SignalEvent`` objects are only created for rows that get delivered.
+    """
+
+    def __init__(
+        self,
+        scanner_ids: Sequence[str],
+        timeframes: Sequence[str],
+        metric_names: Sequence[str],
+        scanner_codes: np.ndarray,
+        symbol_ids: np.ndarray,
+        candle_close_ms: np.ndarray,
+        detected_at_ms: np.ndarray,
+        scores: np.ndarray,
+        metrics: np.ndarray,
+        direction_codes: np.ndarray,
+        ttl_seconds: np.ndarray,
+        model_versions: Optional[Sequence[Optional[str]]] = None,
+        registry: Optional[SymbolRegistry] = None,
+    ) -> None:
+        self.scanner_ids = tuple(scanner_ids)
+        self.timeframes = tuple(timeframes)
+        self.metric_names = tuple(metric_names)
+        self.scanner_codes = scanner_codes
+        self.symbol_ids = symbol_ids
+        self.candle_close_ms = candle_close_ms
+        self.detected_at_ms = detected_at_ms
+        self.scores = scores
+        self.metrics = metrics
+        self.direction_codes = direction_codes
+        self.ttl_seconds = ttl_seconds
+        self.model_versions = tuple(model_versions) if model_versions is not None else (None,) * len(self.scanner_ids)
+        self.registry = registry if registry is not None else symbol_registry
+        self._dedup_keys: Optional[List[str]] = None
+
+    def __len__(self) -> int:
+        return int(self.symbol_ids.shape[0])
+
+    @classmethod
+    def empty(cls, registry: Optional[SymbolRegistry] = None) -> "SignalBatch":
+        return cls(
+            scanner_ids=(),
+            timeframes=(),
+            metric_names=(),
+            scanner_codes=np.empty(0, dtype=np.int16),
+            symbol_ids=np.empty(0, dtype=np.int32),
+            candle_close_ms=np.empty(0, dtype=np.int64),
+            detected_at_ms=np.empty(0, dtype=np.int64),
+            scores=np.empty(0, dtype=np.float64),
+            metrics=np.empty((0, 0), dtype=np.float64),
+            direction_codes=np.empty(0, dtype=np.int8),
+            ttl_seconds=np.empty(0, dtype=np.int32),
+            registry=registry,
+        )
+
+    @classmethod
+    def from_events(cls, events: Sequence[SignalEvent], registry: Optional[SymbolRegistry] = None) -> "SignalBatch":
+        registry = registry if registry is not None else symbol_registry
+        if not events:
+            return cls.empty(registry)
+        builders: Dict[Tuple[str, str, Optional[str]], SignalBatchBuilder] = {}
+        for event in events:
+            key = (event.scanner_id, event.timeframe, event.model_version)
+            builder = builders.get(key)
+            if builder is None:
+                builder = SignalBatchBuilder(
+                    event.scanner_id,
+                    event.timeframe,
+                    tuple(event.metrics),
+                    model_version=event.model_version,
+                    registry=registry,
+                )
+                builders[key] = builder
+            symbol = event.symbol
+            if symbol.symbol_id < 0:
+                symbol = registry.intern(symbol.exchange, symbol.raw_symbol, market_type=symbol.market_type)
+            builder.add(
+                symbol,
+                int(event.candle_close_at.timestamp() * 1000),
+                event.score,
+                [event.metrics.get(name, np.nan) for name in builder.metric_names],
+                direction=event.direction,
+                detected_at_ms=int(event.detected_at.timestamp() * 1000),
+                ttl_seconds=event.ttl_seconds,
+            )
+        return cls.concat([builder.build() for builder in builders.values()])
+
+    @classmethod
+    def concat(cls, batches: Sequence["SignalBatch"]) -> "SignalBatch":
+        batches = [batch for batch in batches if len(batch)]
+        if not batches:
+            return cls.empty()
+        if len(batches) == 1:
+            return batches[0]
+        scanner_keys: List[Tuple[str, str, Optional[str]]] = []
+        metric_names: List[str] = []
+        for batch in batches:
+            for key in zip(batch.scanner_ids, batch.timeframes, batch.model_versions):
+                if key not in scanner_keys:
+                    scanner_keys.append(key)
+            for name in batch.metric_names:
+                if name not in metric_names:
+                    metric_names.append(name)
+        scanner_codes: List[np.ndarray] = []
+        metrics: List[np.ndarray] = []
+        for batch in batches:
+            remap = np.array(
+                [scanner_keys.index(key) for key in zip(batch.scanner_ids, batch.timeframes, batch.model_versions)],
+                dtype=np.int16,
+            )
+            scanner_codes.append(remap[batch.scanner_codes])
+            columns = np.full((len(batch), len(metric_names)), np.nan, dtype=np.float64)
+            for position, name in enumerate(batch.metric_names):
+                columns[:, metric_names.index(name)] = batch.metrics[:, position]
+            metrics.append(columns)
+        merged = cls(
+            scanner_ids=[key[0] for key in scanner_keys],
+            timeframes=[key[1] for key in scanner_keys],
+            metric_names=metric_names,
+            scanner_codes=np.concatenate(scanner_codes),
+            symbol_ids=np.concatenate([batch.symbol_ids for batch in batches]),
+            candle_close_ms=np.concatenate([batch.candle_close_ms for batch in batches]),
+            detected_at_ms=np.concatenate([batch.detected_at_ms for batch in batches]),
+            scores=np.concatenate([batch.scores for batch in batches]),
+            metrics=np.concatenate(metrics),
+            direction_codes=np.concatenate([batch.direction_codes for batch in batches]),
+            ttl_seconds=np.concatenate([batch.ttl_seconds for batch in batches]),
+            model_versions=[key[2] for key in scanner_keys],
+            registry=batches[0].registry,
+        )
+        if all(batch._dedup_keys is not None for batch in batches):
+            merged._dedup_keys = [key for batch in batches for key in batch._dedup_keys or ()]
+        return merged
+
+    def take(self, indices: Iterable[int]) -> "SignalBatch":
+        index = np.asarray(list(indices) if not isinstance(indices, np.ndarray) else indices, dtype=np.int64)
+        taken = SignalBatch(
+            scanner_ids=self.scanner_ids,
+            timeframes=self.timeframes,
+            metric_names=self.metric_names,
+            scanner_codes=self.scanner_codes[index],
+            symbol_ids=self.symbol_ids[index],
+            candle_close_ms=self.candle_close_ms[index],
+            detected_at_ms=self.detected_at_ms[index],
+            scores=self.scores[index],
+            metrics=self.metrics[index],
+            direction_codes=self.direction_codes[index],
+            ttl_seconds=self.ttl_seconds[index],
+            model_versions=self.model_versions,
+            registry=self.registry,
+        )
+        if self._dedup_keys is not None:
+            taken._dedup_keys = [self._dedup_keys[i] for i in index.tolist()]
+        return taken
+
+    def scanner_id(self, row: int) -> str:
+        return self.scanner_ids[self.scanner_codes[row]]
+
+    def symbol(self, row: int) -> MarketSymbol:
+        return self.registry.by_id(int(self.symbol_ids[row]))
+
+    def dedup_keys(self) -> List[str]:
+        # Same key as SignalEvent.__post_init__; the per-symbol prefix and ISO timestamps
+        # are computed once per distinct value instead of once per row.
+        if self._dedup_keys is not None:
+            return self._dedup_keys
+        prefixes: Dict[Tuple[int, int], str] = {}
+        iso_by_ts: Dict[int, str] = {}
+        for ts in np.unique(self.candle_close_ms).tolist():
+            iso_by_ts[ts] = datetime.fromtimestamp(ts / 1000, timezone.utc).isoformat()
+        keys: List[str] = []
+        sha256 = hashlib.sha256
+        for code, symbol_id, ts in zip(
+            self.scanner_codes.tolist(), self.symbol_ids.tolist(), self.candle_close_ms.tolist()
+        ):
+            prefix = prefixes.get((code, symbol_id))
+            if prefix is None:
+                symbol = self.registry.by_id(symbol_id)
+                prefix = f"{self.scanner_ids[code]}:{symbol.exchange}:{symbol.canonical_symbol}:"
+                prefixes[(code, symbol_id)] = prefix
+            keys.append(sha256(f"{prefix}{iso_by_ts[ts]}".encode()).hexdigest())
+        self._dedup_keys = keys
+        return keys
+
+    def row_metrics(self, row: int) -> Dict[str, float]:
+        values = self.metrics[row].tolist()
+        return {name: value for name, value in zip(self.metric_names, values) if not math.isnan(value)}
+
+    def event(self, row: int) -> SignalEvent:
+        code = int(self.scanner_codes[row])
+        return SignalEvent(
+            scanner_id=self.scanner_ids[code],
+            symbol=self.symbol(row),
+            timeframe=self.timeframes[code],
+            detected_at=datetime.fromtimestamp(int(self.detected_at_ms[row]) / 1000, timezone.utc),
+            candle_close_at=datetime.fromtimestamp(int(self.candle_close_ms[row]) / 1000, timezone.utc),
+            direction=_DIRECTIONS[int(self.direction_codes[row])],
+            score=float(self.scores[row]),
+            metrics=self.row_metrics(row),
+            dedup_key=self.dedup_keys()[row],
+            ttl_seconds=int(self.ttl_seconds[row]),
+            model_version=self.model_versions[code],
+        )
+
+    def events(self) -> List[SignalEvent]:
+        return [self.event(row) for row in range(len(self))]
+
+
+class SignalBatchBuilder:
+    def __init__(
+        self,
+        scanner_id: str,
+        timeframe: str,
+        metric_names: Sequence[str],
+        ttl_seconds: int = 3600,
+        model_version: Optional[str] = None,
+        registry: Optional[SymbolRegistry] = None,
+    ) -> None:
+        self.scanner_id = scanner_id
+        self.timeframe = timeframe
+        self.metric_names = tuple(metric_names)
+        self.ttl_seconds = ttl_seconds
+        self.model_version = model_version
+        self.registry = registry if registry is not None else symbol_registry
+        self._symbol_ids: List[int] = []
+        self._candle_close_ms: List[int] = []
+        self._detected_at_ms: List[int] = []
+        self._scores: List[float] = []
+        self._metrics: List[Sequence[float]] = []
+        self._directions: List[int] = []
+        self._ttl_seconds: List[int] = []
+        self._now_ms = int(datetime.now(timezone.utc).timestamp() * 1000)
+
+    def __len__(self) -> int:
+        return len(self._symbol_ids)
+
+    def add(
+        self,
+        symbol: MarketSymbol,
+        candle_close_ms: int,
+        score: float,
+        metrics: Sequence[float],
+        direction: Optional[str] = None,
+        detected_at_ms: Optional[int] = None,
+        ttl_seconds: Optional[int] = None,
+    ) -> None:
+        if symbol.symbol_id < 0:
+            symbol = self.registry.intern(symbol.exchange, symbol.raw_symbol, market_type=symbol.market_type)
+        self._symbol_ids.append(symbol.symbol_id)
+        self._candle_close_ms.append(int(candle_close_ms))
+        self._detected_at_ms.append(self._now_ms if detected_at_ms is None else int(detected_at_ms))
+        self._scores.append(float(score))
+        self._metrics.append(metrics)
+        self._directions.append(_DIRECTIONS.index(direction))
+        self._ttl_seconds.append(self.ttl_seconds if ttl_seconds is None else int(ttl_seconds))
+
+    def build(self) -> SignalBatch:
+        if not self._symbol_ids:
+            return SignalBatch.empty(self.registry)
+        return SignalBatch(
+            scanner_ids=(self.scanner_id,),
+            timeframes=(self.timeframe,),
+            metric_names=self.metric_names,
+            scanner_codes=np.zeros(len(self._symbol_ids), dtype=np.int16),
+            symbol_ids=np.asarray(self._symbol_ids, dtype=np.int32),
+            candle_close_ms=np.asarray(self._candle_close_ms, dtype=np.int64),
+            detected_at_ms=np.asarray(self._detected_at_ms, dtype=np.int64),
+            scores=np.asarray(self._scores, dtype=np.float64),
+            metrics=np.asarray(self._metrics, dtype=np.float64).reshape(len(self._symbol_ids), len(self.metric_names)),
+            direction_codes=np.asarray(self._directions, dtype=np.int8),
+            ttl_seconds=np.asarray(self._ttl_seconds, dtype=np.int32),
+            model_versions=(self.model_version,),
+            registry=self.registry,
+        )
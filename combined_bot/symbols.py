@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from .models import MarketSymbol
+
+
+class SymbolRegistry:
+    """Interns one ``MarketSymbol`` per (exchange, instrument).
+
+    Symbols get a dense ``symbol_id``; every exchange listing of the same
+    canonical pair (``BTC/USDT``) shares one ``canonical_id``, which is what
+    cross-exchange grouping and blacklist matching compare against.
+    """
+
+    def __init__(self) -> None:
+        self._symbols: List[MarketSymbol] = []
+        self._by_raw: Dict[Tuple[str, str], MarketSymbol] = {}
+        self._by_canonical: Dict[Tuple[str, str], MarketSymbol] = {}
+        self._canonical_ids: Dict[str, int] = {}
+        self._canonical_names: List[str] = []
+        self._groups: List[List[MarketSymbol]] = []
+
+    def __len__(self) -> int:
+        return len(self._symbols)
+
+    def _canonical_id_for(self, canonical_symbol: str) -> int:
+        canonical_id = self._canonical_ids.get(canonical_symbol)
+        if canonical_id is None:
+            canonical_id = len(self._canonical_names)
+            self._canonical_ids[canonical_symbol] = canonical_id
+            self._canonical_names.append(canonical_symbol)
+            self._groups.append([])
+        return canonical_id
+
+    def _store(
+        self,
+        exchange: str,
+        raw_symbol: str,
+        market_type: str,
+        canonical_symbol: str,
+        base: str,
+        quote: str,
+        is_active: bool = True,
+    ) -> MarketSymbol:
+        normalized = raw_symbol.strip().upper()
+        existing = self._by_raw.get((exchange, normalized))
+        if existing is not None:
+            self._by_raw[(exchange, raw_symbol)] = existing
+            return existing
+        canonical_symbol = MarketSymbol.normalize_symbol(canonical_symbol)
+        symbol = MarketSymbol(
+            exchange=exchange,
+            market_type=market_type,
+            raw_symbol=normalized,
+            canonical_symbol=canonical_symbol,
+            base_asset=base,
+            quote_asset=quote,
+            is_active=is_active,
+            symbol_id=len(self._symbols),
+            canonical_id=self._canonical_id_for(canonical_symbol),
+        )
+        self._symbols.append(symbol)
+        self._groups[symbol.canonical_id].append(symbol)
+        self._by_raw[(exchange, normalized)] = symbol
+        self._by_raw[(exchange, raw_symbol)] = symbol
+        self._by_canonical.setdefault((exchange, canonical_symbol), symbol)
+        return symbol
+
+    def intern(self, exchange: str, raw_symbol: str, market_type: str = "spot") -> MarketSymbol:
+        # Hot path: scanners pass the exact raw symbol returned by list_symbols, so
+        # after the first sighting this is a single dict lookup with no parsing.
+        cached = self._by_raw.get((exchange, raw_symbol))
+        if cached is not None:
+            return cached
+        exchange = exchange.lower()
+        canonical_symbol, base, quote = MarketSymbol.split_symbol(raw_symbol)
+        return self._store(exchange, raw_symbol, market_type, canonical_symbol, base, quote)
+
+    def register_market(self, exchange: str, market: Mapping[str, Any], market_type: str = "linear_perp") -> MarketSymbol:
+        raw_symbol = str(market["symbol"])
+        cached = self._by_raw.get((exchange, raw_symbol))
+        if cached is not None:
+            return cached
+        base = str(market.get("base") or "")
+        quote = str(market.get("quote") or "")
+        if not base or not quote:
+            return self.intern(exchange, raw_symbol, market_type)
+        return self._store(
+            exchange.lower(),
+            raw_symbol,
+            market_type,
+            f"{base}/{quote}",
+            base,
+            quote,
+            is_active=bool(market.get("active", True)),
+        )
+
+    def get(self, exchange: str, symbol: str) -> Optional[MarketSymbol]:
+        found = self._by_raw.get((exchange, symbol))
+        if found is not None:
+            return found
+        return self._by_canonical.get((exchange, MarketSymbol.normalize_symbol(symbol)))
+
+    def by_id(self, symbol_id: int) -> MarketSymbol:
+        return self._symbols[symbol_id]
+
+    def canonical_id(self, symbol: str) -> int:
+        canonical_id = self._canonical_ids.get(symbol)
+        if canonical_id is not None:
+            return canonical_id
+        # Aliases (``BTCUSDT``, ``btc/usdt:usdt``) are parsed, not remembered: only canonical names are keys,
+        # so the map stays bounded by the pairs seen. Blacklists are stored canonical and hit the lookup above.
+        canonical_symbol, _, _ = MarketSymbol.split_symbol(symbol)
+        return self._canonical_id_for(canonical_symbol)
+
+    def canonical_name(self, canonical_id: int) -> str:
+        return self._canonical_names[canonical_id]
+
+    def group(self, canonical_id: int) -> Tuple[MarketSymbol, ...]:
+        return tuple(self._groups[canonical_id])
+
+    def group_for(self, symbol: MarketSymbol) -> Tuple[MarketSymbol, ...]:
+        if symbol.canonical_id < 0:
+            return self.group(self.canonical_id(symbol.canonical_symbol))
+        return self.group(symbol.canonical_id)
+
+    def canonical_ids(self, symbols: List[str]) -> frozenset:
+        return frozenset(self.canonical_id(item) for item in symbols)
+
+
+symbol_registry = SymbolRegistry()
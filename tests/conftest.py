@@ -0,0 +1,15 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _isolated_markets_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr("combined_bot.config.MARKETS_CACHE_DIR", tmp_path / "markets_cache")
+
+
+@pytest.fixture(autouse=True)
+def _isolated_feature_store():
+    from combined_bot.core.features import feature_store
+
+    feature_store.clear()
+    yield
+    feature_store.clear()
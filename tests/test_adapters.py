@@ -0,0 +1,226 @@
+import pytest
+
+pytest.importorskip("ccxt.async_support")
+
+import numpy as np
+from aiohttp import web
+
+from combined_bot.adapters.binance import BinanceFuturesAdapter
+from combined_bot.adapters.ccxt_exchange import CcxtExchangeAdapter
+from combined_bot.adapters.http import SharedHttpSession
+from combined_bot.main import _build_adapters
+
+_EXCHANGE_INFO = {
+    "symbols": [
+        {
+            "symbol": "BTCUSDT",
+            "pair": "BTCUSDT",
+            "contractType": "PERPETUAL",
+            "status": "TRADING",
+            "baseAsset": "BTC",
+            "quoteAsset": "USDT",
+            "marginAsset": "USDT",
+            "filters": [],
+        },
+        {
+            "symbol": "BTCUSDT_261225",
+            "pair": "BTCUSDT",
+            "contractType": "CURRENT_QUARTER",
+            "deliveryDate": 1798185600000,
+            "status": "TRADING",
+            "baseAsset": "BTC",
+            "quoteAsset": "USDT",
+            "marginAsset": "USDT",
+            "filters": [],
+        },
+    ]
+}
+_KLINE = [1735689600000, "100.0", "110.0", "90.0", "105.5", "12.5", 1735693199999, "1300", 10, "6", "600", "0"]
+_KLINES = [
+    [1735689600000 + i * 3600000, f"{100 + i * 0.1:.8f}", "110.00000001", "0.00000123", f"{105.5 + i:.4f}", f"{i * 7.3:.3f}",
+     1735693199999 + i * 3600000, "1300", 10, "6", "600", "0"]
+    for i in range(5)
+]
+_OI_HIST = [
+    {"symbol": "BTCUSDT", "sumOpenInterest": f"{75375.617 + i:.8f}", "sumOpenInterestValue": "3248828883.71", "timestamp": 1735689600000 + i * 86400000}
+    for i in range(3)
+]
+
+
+class _FakeBinance:
+    """Local HTTP stand-in for the Binance USDⓈ-M public endpoints."""
+
+    def __init__(self) -> None:
+        self.peers = set()
+        self.paths = []
+        self.runner = None
+        self.base_url = ""
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        self.peers.add(request.transport.get_extra_info("peername"))
+        self.paths.append(request.path)
+        if request.path == "/fapi/v1/exchangeInfo":
+            return web.json_response(_EXCHANGE_INFO)
+        if request.path == "/fapi/v1/klines":
+            limit = int(request.query.get("limit", "1"))
+            return web.json_response(_KLINES[:limit] if limit <= len(_KLINES) else [_KLINE] * limit)
+        if request.path == "/futures/data/openInterestHist":
+            return web.json_response(_OI_HIST)
+        return web.json_response({"code": -1, "msg": "not found"}, status=404)
+
+    async def start(self) -> None:
+        app = web.Application()
+        app.router.add_route("*", "/{tail:.*}", self._handle)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://127.0.0.1:{port}"
+
+    def point(self, adapter: CcxtExchangeAdapter) -> None:
+        api = adapter._client.urls["api"]
+        for key in ("fapiPublic", "fapiPublicV2", "fapiPublicV3", "fapiData"):
+            api[key] = api[key].replace("https://fapi.binance.com", self.base_url)
+
+    async def stop(self) -> None:
+        await self.runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_adapters_share_one_keep_alive_connection():
+    fake_binance = _FakeBinance()
+    await fake_binance.start()
+    http_session = SharedHttpSession()
+    first = BinanceFuturesAdapter(http_session=http_session)
+    second = BinanceFuturesAdapter(http_session=http_session)
+    fake_binance.point(first)
+    fake_binance.point(second)
+
+    symbols = await first.list_symbols()
+    await second.list_symbols()
+    candles = await first.fetch_ohlcv("BTC/USDT:USDT", timeframe="1h", limit=2)
+    await second.fetch_ohlcv("BTC/USDT:USDT", timeframe="1h", limit=2)
+
+    assert first._client.session is second._client.session
+    assert symbols == ["BTC/USDT:USDT"]
+    assert candles[0][4] == 105.5
+    assert len(fake_binance.paths) == 4
+    assert len(fake_binance.peers) == 1
+
+    await first.close()
+    assert http_session.session is not None
+    await second.close()
+    assert http_session.session is None
+    await fake_binance.stop()
+
+
+@pytest.mark.asyncio
+async def test_binance_fast_parse_matches_ccxt_path(monkeypatch):
+    monkeypatch.setattr("combined_bot.config.OHLCV_CACHE_TTL_SECONDS", 0)
+    fake_binance = _FakeBinance()
+    await fake_binance.start()
+    adapter = BinanceFuturesAdapter(http_session=SharedHttpSession())
+    fake_binance.point(adapter)
+
+    fast_candles = await adapter.fetch_ohlcv("BTC/USDT:USDT", timeframe="1h", limit=5)
+    fast_oi = await adapter.fetch_open_interest_history("BTC/USDT:USDT", days=3)
+    monkeypatch.setattr("combined_bot.config.BINANCE_FAST_PARSE", False)
+    ccxt_candles = await adapter.fetch_ohlcv("BTC/USDT:USDT", timeframe="1h", limit=5)
+    ccxt_oi = await adapter.fetch_open_interest_history("BTC/USDT:USDT", days=3)
+
+    assert fast_candles.dtype == np.float64 and fast_candles.shape == (5, 6)
+    assert fast_candles.tolist() == [[float(value) for value in row] for row in ccxt_candles]
+    assert fast_oi == [{"ts": int(point["ts"]), "oi": float(point["oi"])} for point in ccxt_oi]
+    assert fake_binance.paths.count("/fapi/v1/klines") == 2
+    assert fake_binance.paths.count("/futures/data/openInterestHist") == 2
+
+    await adapter.close()
+    await fake_binance.stop()
+
+
+@pytest.mark.asyncio
+async def test_generic_adapter_uses_exchange_profile():
+    http_session = SharedHttpSession()
+    adapter = CcxtExchangeAdapter("bybit", http_session=http_session)
+    await adapter._attach_session()
+
+    assert adapter.exchange_id == "bybit"
+    assert adapter._client.id == "bybit"
+    assert adapter._client.options["fetchMarkets"]["types"] == ["linear"]
+    assert adapter._client.session is http_session.session
+    assert adapter._client.own_session is False
+
+    await adapter.close()
+    assert http_session.session is None
+
+
+def test_build_adapters_creates_generic_adapters_for_known_profiles(monkeypatch):
+    monkeypatch.setattr("combined_bot.config.ENABLED_EXCHANGES", ["binance", "okx", "unknown"])
+    adapters = _build_adapters()
+
+    assert sorted(adapters) == ["binance", "okx"]
+    assert isinstance(adapters["binance"], BinanceFuturesAdapter)
+    assert type(adapters["okx"]) is CcxtExchangeAdapter
+    assert adapters["okx"].supports_open_interest_history is True
+
+
+class _CachingClient:
+    def __init__(self, markets):
+        self.markets = markets
+        self.currencies = {}
+        self.load_calls = []
+        self.set_calls = 0
+
+    async def load_markets(self, reload=False):
+        self.load_calls.append(reload)
+        return self.markets
+
+    def set_markets(self, markets, currencies=None):
+        self.set_calls += 1
+        self.markets = {market["symbol"]: market for market in markets}
+        self.currencies = currencies or {}
+
+    async def close(self):
+        return None
+
+
+@pytest.mark.asyncio
+async def test_markets_cache_serves_first_scan_and_revalidates_in_background(tmp_path, monkeypatch):
+    monkeypatch.setattr("combined_bot.config.MARKETS_CACHE_DIR", tmp_path)
+    market = {"symbol": "BTC/USDT:USDT", "base": "BTC", "quote": "USDT", "active": True, "swap": True, "linear": True}
+
+    cold = BinanceFuturesAdapter()
+    cold._client = _CachingClient({"BTC/USDT:USDT": market})
+    assert await cold.list_symbols() == ["BTC/USDT:USDT"]
+    await cold.close()
+    assert (tmp_path / "binance.json").exists()
+
+    warm = BinanceFuturesAdapter()
+    client = _CachingClient({})
+    warm._client = client
+    symbols = await warm.list_symbols()
+
+    assert symbols == ["BTC/USDT:USDT"]
+    assert client.set_calls == 1
+    await warm._markets_refresh_task
+    assert client.load_calls == [True]
+    await warm.close()
+
+
+@pytest.mark.asyncio
+async def test_expired_markets_cache_is_ignored(tmp_path, monkeypatch):
+    monkeypatch.setattr("combined_bot.config.MARKETS_CACHE_DIR", tmp_path)
+    monkeypatch.setattr("combined_bot.config.MARKETS_CACHE_TTL_SECONDS", 60)
+    (tmp_path / "binance.json").write_text(
+        '{"saved_at": 0, "ccxt_id": "binanceusdm", "markets": [{"symbol": "OLD/USDT:USDT"}], "currencies": {}}'
+    )
+    adapter = BinanceFuturesAdapter()
+    client = _CachingClient({})
+    adapter._client = client
+
+    await adapter.list_symbols()
+
+    assert client.set_calls == 0
+    assert client.load_calls == [False]
+    await adapter.close()
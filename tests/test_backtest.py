@@ -0,0 +1,100 @@
+import asyncio
+from pathlib import Path
+
+import numpy as np
+
+from combined_bot.backtest import (
+    BacktestDataset,
+    ParamSet,
+    SymbolHistory,
+    build_grid,
+    price_mask,
+    run_backtest,
+    save_symbol_history,
+    volume_mask,
+)
+from combined_bot.scanners.price import PricePumpScanner
+from combined_bot.scanners.volume import VolumeSpikeScanner
+
+_HOUR_MS = 3_600_000
+_DAY_MS = 24 * _HOUR_MS
+_START_MS = 1_704_067_200_000  # 2024-01-01T00:00:00Z
+
+
+def _synthetic_hourly(bars: int, seed: int = 7) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    closes = 100 * np.cumprod(1 + rng.normal(0, 0.03, bars))
+    volumes = rng.lognormal(12, 1.2, bars)
+    ts = _START_MS + np.arange(bars) * _HOUR_MS
+    return np.column_stack([ts, closes, closes, closes, closes, volumes])
+
+
+class _WindowAdapter:
+    def __init__(self, candles: np.ndarray) -> None:
+        self.candles = candles
+        self.end = 0
+
+    async def list_symbols(self):
+        return ["TEST/USDT:USDT"]
+
+    async def fetch_ohlcv(self, symbol, timeframe, limit):
+        _ = symbol, timeframe
+        # The last bar is still open, exactly as on the live exchange, and gets dropped by the scanner.
+        closed = self.candles[max(0, self.end - limit + 2) : self.end + 1].tolist()
+        return closed + [[4_102_444_800_000, 1.0, 1.0, 1.0, 1.0, 1.0]]
+
+
+def _replay(scanner, candles: np.ndarray, first_bar: int) -> list[bool]:
+    adapter = _WindowAdapter(candles)
+    fired = []
+    for end in range(first_bar, candles.shape[0]):
+        adapter.end = end
+        fired.append(bool(asyncio.run(scanner.scan({"binance": adapter}))))
+    return fired
+
+
+def test_vectorized_volume_rule_matches_scanner_replay(monkeypatch) -> None:
+    monkeypatch.setattr("combined_bot.config.MIN_VOL_USD_LAST", 1e6)
+    monkeypatch.setattr("combined_bot.config.MIN_VOL_RATIO", 1.5)
+    candles = _synthetic_hourly(200)
+    dataset = BacktestDataset([SymbolHistory("TEST", candles)], horizons=(1,))
+
+    mask = volume_mask(dataset.volume, ParamSet(min_vol_usd_last=1e6, min_vol_ratio=1.5))
+
+    assert mask.any()
+    assert mask.tolist() == _replay(VolumeSpikeScanner(), candles, first_bar=47)
+
+
+def test_vectorized_price_rule_matches_scanner_replay(monkeypatch) -> None:
+    monkeypatch.setattr("combined_bot.config.MIN_PRICE_RATIO", 1.1)
+    monkeypatch.setattr("combined_bot.config.MIN_PRICE_SCANNER_VOL_USD_24H", 1e6)
+    candles = _synthetic_hourly(200, seed=11)
+    dataset = BacktestDataset([SymbolHistory("TEST", candles)], horizons=(1,))
+
+    mask = price_mask(dataset.price, ParamSet(min_price_ratio=1.1, min_price_vol_usd_24h=1e6))
+
+    assert mask.any()
+    assert mask.tolist() == _replay(PricePumpScanner(), candles, first_bar=23)
+
+
+def test_run_backtest_grid_over_process_pool(tmp_path: Path) -> None:
+    hourly = _synthetic_hourly(24 * 40)
+    days = np.arange(40)
+    daily = np.column_stack(
+        [_START_MS + days * _DAY_MS, hourly[::24, 4], hourly[::24, 4], hourly[::24, 4], hourly[::24, 4], np.full(40, 1e6)]
+    )
+    oi = np.column_stack([_START_MS + days * _DAY_MS, 1000 * (1 + 0.05 * days)])
+    for symbol in ("AAAUSDT", "BBBUSDT"):
+        save_symbol_history(tmp_path, SymbolHistory(symbol, hourly, daily, oi))
+
+    base = ParamSet(oi_days=10, oi_min_avg_daily_vol_usd=0, oi_max_price_growth_pct=1e9)
+    grid = build_grid(base, {"oi_growth_pct": [10, 1000], "min_vol_ratio": [1, 100]})
+    inline = run_backtest(tmp_path, grid, horizons=(1, 24), workers=1)
+    pooled = run_backtest(tmp_path, grid, horizons=(1, 24), workers=2)
+
+    assert len(pooled) == 4
+    assert pooled == inline
+    by_growth = {row["params"]["oi_growth_pct"]: row["oi_spike"]["signals"] for row in inline}
+    assert by_growth[10] > 0
+    assert by_growth[1000] == 0
+    assert inline[0]["oi_spike"]["episodes"] == 2
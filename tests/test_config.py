@@ -25,3 +25,11 @@ def test_telegram_default_chat_id_alias(monkeypatch) -> None:
 
     importlib.reload(config)
     assert config.TG_DEFAULT_CHAT_ID == 987654321
+
+
+def test_oi_ticker_prefilter_is_opt_in(monkeypatch) -> None:
+    monkeypatch.delenv("OI_MIN_TICKER_VOL_USD", raising=False)
+    import combined_bot.config as config
+
+    importlib.reload(config)
+    assert config.OI_MIN_TICKER_VOL_USD == 0
@@ -0,0 +1,111 @@
+import asyncio
+
+from combined_bot.core.orchestrator import Orchestrator
+from combined_bot.core.scheduler import SymbolScheduler
+from combined_bot.scanners.base import BaseScanner
+from combined_bot.signal_batch import SignalBatch, SignalBatchBuilder
+from combined_bot.symbols import SymbolRegistry
+
+
+class _Adapter:
+    def __init__(self, symbols, slow) -> None:
+        self.symbols = symbols
+        self.slow = set(slow)
+
+    async def list_symbols(self):
+        return list(self.symbols)
+
+    async def fetch_ohlcv(self, symbol, timeframe, limit):
+        _ = timeframe, limit
+        await asyncio.sleep(10 if symbol in self.slow else 0)
+        return []
+
+
+class _SymbolScanner(BaseScanner):
+    id = "probe"
+
+    def __init__(self) -> None:
+        self.registry = SymbolRegistry()
+        self.order = []
+
+    async def scan(self, adapters):
+        builder = SignalBatchBuilder(self.id, "1h", (), registry=self.registry)
+
+        async def _process(exchange, adapter, raw_symbol):
+            self.order.append(raw_symbol)
+            await adapter.fetch_ohlcv(raw_symbol, "1h", 1)
+            builder.add(self.registry.intern(exchange, raw_symbol), 1_735_689_600_000, 1.0, ())
+
+        await self._scan_symbols(adapters, _process)
+        return builder.build()
+
+
+def test_deadline_cancels_stragglers_keeps_partial_results_and_promotes_skipped(monkeypatch) -> None:
+    monkeypatch.setattr("combined_bot.config.SCANNER_SYMBOL_CONCURRENCY", 2)
+    adapter = _Adapter(["A", "SLOW", "B", "C"], slow=["SLOW"])
+    scanner = _SymbolScanner()
+    orchestrator = Orchestrator(
+        adapters={"binance": adapter},
+        scanners=[scanner],
+        database=None,
+        dispatcher=None,
+        interval_seconds=1,
+        cycle_deadline_seconds=0.2,
+    )
+
+    batch = asyncio.run(orchestrator._collect_signals())
+
+    assert sorted(batch.symbol(row).raw_symbol for row in range(len(batch))) == ["A", "B", "C"]
+    assert orchestrator._carryover == {"binance": ["SLOW"]}
+    assert orchestrator.metrics.last_scanners["probe"].skipped_symbols == 1
+    assert not orchestrator.metrics.last_scanners["probe"].timed_out
+
+    adapter.slow.clear()
+    scanner.order.clear()
+    asyncio.run(orchestrator._collect_signals())
+
+    assert scanner.order == ["SLOW", "A", "B", "C"]
+    assert orchestrator._carryover == {}
+
+
+class _StuckScanner:
+    id = "stuck"
+
+    async def scan(self, adapters):
+        _ = adapters
+        await asyncio.sleep(10)
+        return SignalBatch.empty()
+
+
+class _Database:
+    def get_active_user_settings(self):
+        return []
+
+
+def test_scanner_ignoring_its_budget_is_cancelled_and_overrun_is_counted(monkeypatch) -> None:
+    monkeypatch.setattr("combined_bot.config.CYCLE_GRACE_SECONDS", 0.05)
+    monkeypatch.setattr("combined_bot.config.SCANNER_BUDGETS", {"stuck": 0.05})
+    orchestrator = Orchestrator(
+        adapters={},
+        scanners=[_StuckScanner()],
+        database=_Database(),
+        dispatcher=None,
+        interval_seconds=0.01,
+    )
+
+    asyncio.run(orchestrator.run_once())
+
+    assert orchestrator.metrics.scanner_timeouts == 1
+    assert orchestrator.metrics.last_scanners["stuck"].timed_out
+    assert orchestrator.metrics.overruns == 1
+    assert orchestrator.metrics.last_duration_seconds < 1
+
+
+def test_scheduler_hands_out_skipped_symbols_first() -> None:
+    scheduler = SymbolScheduler(hot_interval_seconds=30, cold_interval_seconds=600, request_budget_per_minute=0)
+    scheduler.sync("binance", ["A", "B", "C"], now=0.0)
+    due = scheduler.take_due(0.0, limit=2)
+    scheduler.complete(due, now=10.0, skipped={"binance": ["B"]})
+    scheduler.sync("binance", ["A", "B", "C", "D"], now=20.0)
+
+    assert scheduler.take_due(20.0, limit=2) == {"binance": ["B", "C"]}
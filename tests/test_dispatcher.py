@@ -1,5 +1,13 @@
+import asyncio
+import socket
 from datetime import datetime, timezone
 
+import aiohttp
+import pytest
+from aiohttp import web
+
+from combined_bot.adapters.http import SharedHttpSession
+from combined_bot.delivery.bot_api import BotApiClient
 from combined_bot.delivery.telegram_dispatcher import TelegramDispatcher
 from combined_bot.models import MarketSymbol, SignalEvent
 
@@ -22,3 +30,104 @@ def test_telegram_dispatcher_formats_volume_signal_message() -> None:
     assert "vol_spike" in message
     assert "open futures" in message
     assert "6.00x" in message
+
+
+async def _fake_bot_api(handler):
+    app = web.Application()
+    app.router.add_post("/bot{token}/{method}", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+def test_fan_out_renders_once_per_timezone_and_survives_failing_chats(monkeypatch) -> None:
+    received = []
+    throttled = set()
+
+    async def _handler(request):
+        payload = await request.json()
+        chat_id = payload["chat_id"]
+        if chat_id == 13:
+            return web.json_response({"ok": False, "error_code": 403, "description": "Forbidden: bot was blocked"})
+        if chat_id == 2 and chat_id not in throttled:
+            throttled.add(chat_id)
+            return web.json_response({"ok": False, "error_code": 429, "parameters": {"retry_after": 0}})
+        received.append((request.match_info["method"], chat_id, payload["text"], payload["parse_mode"]))
+        return web.json_response({"ok": True, "result": {"message_id": len(received)}})
+
+    renders = []
+    original = TelegramDispatcher._format_message
+
+    def _counting_format(self, signal, timezone_name="UTC"):
+        renders.append(timezone_name)
+        return original(self, signal, timezone_name)
+
+    monkeypatch.setattr(TelegramDispatcher, "_format_message", _counting_format)
+    signal = SignalEvent(
+        scanner_id="price_pump",
+        symbol=MarketSymbol.from_raw("binance", "ETH/USDT:USDT", market_type="linear_perp"),
+        timeframe="1h",
+        detected_at=datetime(2025, 1, 1, tzinfo=timezone.utc),
+        candle_close_at=datetime(2025, 1, 1, tzinfo=timezone.utc),
+        score=0.5,
+        metrics={"price_ratio": 1.4, "volume_usd": 5e7},
+    )
+
+    async def _run():
+        runner, base_url = await _fake_bot_api(_handler)
+        client = BotApiClient("123:abc", base_url=base_url, http=SharedHttpSession(), concurrency=3)
+        dispatcher = TelegramDispatcher(token="123:abc", client=client)
+        try:
+            return await dispatcher.send_signal_many(
+                signal, [1, 2, 3, 13, 4, 5], {4: "Europe/Moscow", 5: "Europe/Moscow", 13: "Europe/Moscow"}
+            )
+        finally:
+            await dispatcher.close()
+            await runner.cleanup()
+
+    sent = asyncio.run(_run())
+
+    assert sent == 5
+    assert sorted(renders) == ["Europe/Moscow", "UTC"]
+    assert sorted(chat_id for _, chat_id, _, _ in received) == [1, 2, 3, 4, 5]
+    assert {method for method, _, _, _ in received} == {"sendMessage"}
+    texts = {chat_id: text for _, chat_id, text, _ in received}
+    assert "2025-01-01 00:00:00 UTC" in texts[1]
+    assert "2025-01-01 03:00:00 Europe/Moscow" in texts[4]
+    assert texts[4] == texts[5]
+
+
+def test_bot_api_retries_only_errors_before_the_request_is_sent() -> None:
+    requests = []
+
+    async def _slow_handler(request):
+        requests.append(await request.json())
+        await asyncio.sleep(1.0)
+        return web.json_response({"ok": True, "result": {}})
+
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        closed_port = probe.getsockname()[1]
+
+    async def _run():
+        runner, base_url = await _fake_bot_api(_slow_handler)
+        http = SharedHttpSession()
+        slow = BotApiClient("123:abc", base_url=base_url, http=http, max_retries=2, timeout_seconds=0.2)
+        refused = BotApiClient("123:abc", base_url=f"http://127.0.0.1:{closed_port}", http=http, max_retries=1)
+        try:
+            # The body reached the server: a read timeout must not resend it.
+            with pytest.raises(asyncio.TimeoutError):
+                await slow.send_message(1, "hello")
+            with pytest.raises(aiohttp.ClientConnectorError):
+                await refused.send_message(1, "hello")
+        finally:
+            await slow.close()
+            await refused.close()
+            await runner.cleanup()
+
+    asyncio.run(_run())
+
+    assert len(requests) == 1
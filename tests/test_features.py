@@ -0,0 +1,87 @@
+import asyncio
+
+import numpy as np
+
+from combined_bot.core.features import Feature, FeatureStore
+
+_HOUR_MS = 3_600_000
+
+
+def _candles(count: int, seed: int = 3) -> list:
+    rng = np.random.default_rng(seed)
+    closes = 50 * np.cumprod(1 + rng.normal(0, 0.02, count))
+    volumes = rng.lognormal(10, 1, count)
+    return [[index * _HOUR_MS, c, c * 1.01, c * 0.98, c, v] for index, (c, v) in enumerate(zip(closes, volumes))]
+
+
+def test_incremental_indicators_match_full_recomputation() -> None:
+    store = FeatureStore()
+    store.register(
+        "1h",
+        Feature.window("usd_volume", 24),
+        Feature.window("true_range", 14),
+        Feature.zscore("usd_volume", 47),
+        Feature.ema("close", 20),
+    )
+    candles = _candles(1000)
+    series = None
+    for end in range(48, len(candles) + 1):
+        # Each call sees the latest 49 klines plus one still-open bar, as a live scan would.
+        series, _ = store.ingest("binance", "X", "1h", candles[max(0, end - 49) : end + 1], now_ms=end * _HOUR_MS)
+
+    closes = np.array([candle[4] for candle in candles])
+    usd = closes * np.array([candle[5] for candle in candles])
+    prev_close = np.concatenate([[np.nan], closes[:-1]])
+    highs = closes * 1.01
+    lows = closes * 0.98
+    true_range = np.nanmax(np.column_stack([highs - lows, abs(highs - prev_close), abs(lows - prev_close)]), axis=1)
+    ema = closes[0]
+    for close in closes[1:]:
+        ema += 2 / 21 * (close - ema)
+    history = usd[-48:-1]
+
+    assert series.last_open_ms == candles[-1][0]
+    assert np.isclose(series.window("usd_volume", 24).sum, usd[-24:].sum())
+    assert np.isclose(series.window("true_range", 14).mean, true_range[-14:].mean())
+    assert np.isclose(series.zscore("usd_volume", 47), (usd[-1] - history.mean()) / history.std())
+    # The EMA is seeded at the first candle of the initial 49-bar fetch.
+    assert np.isclose(series.ema("close", 20), ema, rtol=1e-6)
+
+
+class _Adapter:
+    def __init__(self, candles: list) -> None:
+        self.candles = candles
+        self.limits = []
+
+    async def fetch_ohlcv(self, symbol, timeframe, limit):
+        self.limits.append(limit)
+        return self.candles[-limit:]
+
+
+def test_refresh_fetches_only_new_candles_and_rebuilds_on_gap() -> None:
+    store = FeatureStore()
+    store.register("1h", Feature.window("close", 24), history=48)
+    candles = _candles(100)
+    adapter = _Adapter(candles[:60])
+
+    async def _refresh(now_ms):
+        return await store.refresh(adapter, "binance", "X", "1h", now_ms=now_ms)
+
+    # Bar 59 is still open at 59h30m.
+    asyncio.run(_refresh(59 * _HOUR_MS + 1_800_000))
+    asyncio.run(_refresh(59 * _HOUR_MS + 2_700_000))
+    adapter.candles = candles[:62]
+    series = asyncio.run(_refresh(61 * _HOUR_MS + 60_000))
+
+    assert adapter.limits == [49, 3]
+    assert series.last_open_ms == candles[60][0]
+    assert series.window("close", 24).last == candles[60][4]
+
+    # The exchange skipped a bar: the narrow fetch does not connect, so the window is refetched.
+    adapter.candles = candles[:61] + candles[62:70]
+    adapter.limits.clear()
+    series = asyncio.run(_refresh(69 * _HOUR_MS + 60_000))
+
+    assert adapter.limits == [9, 49]
+    assert len(series) == 48
+    assert series.last_open_ms == candles[68][0]
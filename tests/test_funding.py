@@ -0,0 +1,87 @@
+import asyncio
+
+from combined_bot.adapters.binance import BinanceFuturesAdapter
+from combined_bot.delivery.telegram_dispatcher import TelegramDispatcher
+from combined_bot.scanners import FundingBasisScanner
+
+_NEXT_FUNDING_MS = 1_735_718_400_000
+
+
+class _Adapter:
+    def __init__(self) -> None:
+        self.rates = {}
+        self.calls = 0
+
+    async def list_symbols(self):
+        return ["BTC/USDT:USDT", "ETH/USDT:USDT"]
+
+    async def fetch_premium_index(self):
+        self.calls += 1
+        return {
+            symbol: {"funding_rate": rate, "mark_price": 100.0, "index_price": 100.0, "next_funding_ms": _NEXT_FUNDING_MS}
+            for symbol, rate in self.rates.items()
+        }
+
+
+def test_funding_scanner_flags_extreme_rate_against_rolling_history(monkeypatch) -> None:
+    monkeypatch.setattr("combined_bot.config.FUNDING_SAMPLE_INTERVAL_SECONDS", 0)
+    monkeypatch.setattr("combined_bot.config.FUNDING_MIN_SAMPLES", 12)
+    scanner = FundingBasisScanner(history_samples=48)
+    adapter = _Adapter()
+
+    for cycle in range(20):
+        adapter.rates = {"BTC/USDT:USDT": 0.0001 + 0.00001 * (cycle % 3), "ETH/USDT:USDT": 0.0001}
+        assert len(asyncio.run(scanner.scan({"binance": adapter}))) == 0
+
+    adapter.rates = {"BTC/USDT:USDT": 0.003, "ETH/USDT:USDT": 0.0001}
+    batch = asyncio.run(scanner.scan({"binance": adapter}))
+
+    assert adapter.calls == 21
+    assert len(batch) == 1
+    event = batch.event(0)
+    assert event.symbol.raw_symbol == "BTC/USDT:USDT"
+    assert event.metrics["funding_zscore"] > 3
+    assert int(event.candle_close_at.timestamp() * 1000) == _NEXT_FUNDING_MS
+    message = TelegramDispatcher(token="")._format_message(event)
+    assert "funding_rate: <b>0.3000%</b>" in message
+    assert "basis: <b>+0.000%</b>" in message
+
+
+def test_binance_premium_index_is_one_bulk_call_filtered_to_universe() -> None:
+    adapter = BinanceFuturesAdapter()
+
+    class _Client:
+        def __init__(self):
+            self.has = {"fetchFundingRates": True}
+            self.calls = 0
+            self.session = None
+            self.markets = {
+                "BTCUSDT": {"symbol": "BTC/USDT:USDT", "active": True, "swap": True, "linear": True, "quote": "USDT"},
+            }
+
+        async def fetch_funding_rates(self):
+            self.calls += 1
+            return {
+                "BTC/USDT:USDT": {"fundingRate": 0.0002, "markPrice": 101.0, "indexPrice": 100.0, "fundingTimestamp": 5},
+                "BTC/USDT:USDT-250328": {"fundingRate": 0.0, "markPrice": 1.0, "indexPrice": 1.0},
+            }
+
+        async def close(self):
+            return None
+
+    client = _Client()
+    adapter._client = client
+    adapter._markets_loaded = True
+
+    async def _run():
+        try:
+            return await adapter.fetch_premium_index()
+        finally:
+            await adapter.close()
+
+    premium = asyncio.run(_run())
+
+    assert client.calls == 1
+    assert premium == {
+        "BTC/USDT:USDT": {"funding_rate": 0.0002, "mark_price": 101.0, "index_price": 100.0, "next_funding_ms": 5, "ts": 0}
+    }
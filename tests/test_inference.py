@@ -0,0 +1,184 @@
+import asyncio
+import hashlib
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from combined_bot.adapters.ccxt_exchange import CcxtExchangeAdapter
+from combined_bot.core import inference
+from combined_bot.core.features import FeatureStore
+from combined_bot.core.shared_arrays import SharedArray, attach
+from combined_bot.scanners import MachineLearningScanner
+
+
+def _tree_model() -> inference.InferenceModel:
+    # Two depth-2 trees over the feature matrix; leaves have left == -1.
+    return inference.InferenceModel(
+        kind="tree_ensemble",
+        version="trees-v1",
+        feature_names=("return_24h", "log_volume_ratio_24h"),
+        link="logistic",
+        arrays={
+            "feature": np.array([[0, 1, 0], [1, 0, 0]]),
+            "threshold": np.array([[0.1, 0.5, 0.0], [1.0, 0.0, 0.0]]),
+            "left": np.array([[1, -1, -1], [1, -1, -1]]),
+            "right": np.array([[2, -1, -1], [2, -1, -1]]),
+            "value": np.array([[0.0, -1.0, 2.0], [0.0, -0.5, 1.5]]),
+            "base_score": np.array(0.25),
+        },
+    )
+
+
+def _reference_predict(model: inference.InferenceModel, row: np.ndarray) -> float:
+    arrays = model.arrays
+    total = float(arrays["base_score"])
+    for tree in range(arrays["feature"].shape[0]):
+        node = 0
+        while arrays["left"][tree, node] >= 0:
+            feature = arrays["feature"][tree, node]
+            go_left = row[feature] <= arrays["threshold"][tree, node]
+            node = arrays["left"][tree, node] if go_left else arrays["right"][tree, node]
+        total += arrays["value"][tree, node]
+    return 1.0 / (1.0 + np.exp(-total))
+
+
+def test_tree_ensemble_roundtrips_npz_and_matches_per_row_walk(tmp_path: Path) -> None:
+    path = tmp_path / "model.npz"
+    inference.save_model(path, _tree_model())
+    model = inference.load_model(path)
+    features = np.random.default_rng(7).normal(size=(64, len(inference.FEATURE_NAMES)))
+
+    scores = inference.predict(model, features)
+
+    projected = features[:, model.feature_index]
+    assert model.version == "trees-v1"
+    assert np.allclose(scores, [_reference_predict(model, row) for row in projected])
+
+
+def _pump_candles(pumped: bool) -> list:
+    hour_ms = 3_600_000
+    start = (int(time.time()) // 3600 - 49) * hour_ms
+    candles = []
+    for index in range(50):
+        close = 1.0 + (0.02 * max(0, index - 24) if pumped else 0.0)
+        volume = 1_000_000.0 * (8 if pumped and index >= 24 else 1)
+        candles.append([start + index * hour_ms, close, close * 1.01, close * 0.99, close, volume])
+    return candles
+
+
+class _Client:
+    def __init__(self) -> None:
+        self.ohlcv_calls = []
+        self.markets = {}
+        self.session = None
+
+    def parse_timeframe(self, timeframe: str) -> int:
+        return {"1h": 3600, "1d": 86400}[timeframe]
+
+    async def load_markets(self):
+        return None
+
+    async def fetch_ohlcv(self, symbol, timeframe, limit):
+        self.ohlcv_calls.append((symbol, timeframe, limit))
+        await asyncio.sleep(0.01)
+        return _pump_candles(symbol.startswith("PUMP"))[-limit:]
+
+    async def close(self):
+        return None
+
+
+class _Adapter(CcxtExchangeAdapter):
+    exchange_id = "binance"
+
+    async def list_symbols(self):
+        return ["PUMP/USDT:USDT", "FLAT/USDT:USDT"]
+
+
+def _linear_model_file(tmp_path: Path) -> Path:
+    path = tmp_path / "linear.npz"
+    inference.save_model(
+        path,
+        inference.InferenceModel(
+            kind="linear",
+            version="linear-v3",
+            feature_names=("log_volume_ratio_24h", "return_24h"),
+            link="logistic",
+            arrays={"weights": np.array([2.0, 5.0]), "bias": np.array(-2.0)},
+        ),
+    )
+    return path
+
+
+def test_ml_scanner_scores_in_process_pool_and_reuses_cached_candles(tmp_path: Path) -> None:
+    adapter = _Adapter()
+    client = _Client()
+    adapter._client = client
+    adapter._markets_loaded = True
+    model_path = _linear_model_file(tmp_path)
+    digest = hashlib.sha256(model_path.read_bytes()).hexdigest()
+    scanner = MachineLearningScanner(model_path=model_path, expected_sha256=digest, workers=1, min_score=0.7)
+    # Swapped after verification: pool workers must keep scoring with the verified model.
+    model_path.write_bytes(b"not a model")
+
+    async def _run():
+        try:
+            # Another scanner's wider kline request is in flight when the ML scanner asks for the same symbol.
+            _, batch = await asyncio.gather(adapter.fetch_ohlcv("PUMP/USDT:USDT", "1h", 49), scanner.scan({"binance": adapter}))
+            return batch
+        finally:
+            await scanner.close()
+            await adapter.close()
+
+    batch = asyncio.run(_run())
+
+    assert client.ohlcv_calls == [("PUMP/USDT:USDT", "1h", 49), ("FLAT/USDT:USDT", "1h", 49)]
+    assert len(batch) == 1
+    event = batch.event(0)
+    assert event.symbol.raw_symbol == "PUMP/USDT:USDT"
+    assert event.model_version == "linear-v3"
+    assert event.metrics["ml_score"] >= 0.7
+
+
+def test_ml_scanner_refuses_model_with_wrong_checksum(tmp_path: Path) -> None:
+    scanner = MachineLearningScanner(model_path=_linear_model_file(tmp_path), expected_sha256="0" * 64, workers=0)
+
+    assert scanner.model_version is None
+    assert len(asyncio.run(scanner.scan({"binance": _Adapter()}))) == 0
+
+
+def test_ml_scanner_splits_shared_candles_across_workers(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr("combined_bot.config.ML_WORKER_MIN_ROWS", 1)
+    created = []
+    original_init = SharedArray.__init__
+
+    def _tracked_init(self, *args, **kwargs):
+        created.append(self)
+        original_init(self, *args, **kwargs)
+
+    monkeypatch.setattr(SharedArray, "__init__", _tracked_init)
+    model_path = _linear_model_file(tmp_path)
+
+    async def _scan(workers: int):
+        adapter = _Adapter()
+        adapter._client = _Client()
+        adapter._markets_loaded = True
+        scanner = MachineLearningScanner(model_path=model_path, workers=workers, min_score=0.0, store=FeatureStore())
+        try:
+            return await scanner.scan({"binance": adapter})
+        finally:
+            await scanner.close()
+            await adapter.close()
+
+    pooled = asyncio.run(_scan(2))
+    inline = asyncio.run(_scan(0))
+
+    assert len(pooled) == len(inline) == 2
+    assert np.array_equal(pooled.metrics, inline.metrics)
+    assert pooled.candle_close_ms.tolist() == inline.candle_close_ms.tolist()
+    # The block is unlinked once the cycle's scores are back.
+    assert len(created) == 1 and created[0]._shm is None
+    with pytest.raises(FileNotFoundError):
+        with attach(created[0].spec):
+            pass
@@ -1,7 +1,10 @@
+import asyncio
+from collections import Counter
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
 from combined_bot.core.database import Database
+from combined_bot.core.features import FeatureStore
 from combined_bot.models import MarketSymbol, SignalEvent, UserSettings
 from combined_bot.scanners.oi import OpenInterestScanner
 from combined_bot.scanners.volume import VolumeSpikeScanner
@@ -131,3 +134,145 @@ def test_drop_open_oi_point_excludes_unclosed_1d(monkeypatch) -> None:
     ]
     filtered = scanner._drop_open_oi_point(oi_hist)
     assert len(filtered) == 1
+
+
+class _CountingOiAdapter:
+    supports_open_interest_history = True
+
+    def __init__(self, daily, ticker_volumes):
+        self.daily = daily
+        self.ticker_volumes = ticker_volumes
+        self.calls = Counter()
+        self.today_ms = int(datetime.now(timezone.utc).timestamp() * 1000) // 86_400_000 * 86_400_000
+
+    async def list_symbols(self):
+        return list(self.ticker_volumes)
+
+    async def fetch_24h_quote_volumes(self):
+        self.calls["tickers"] += 1
+        return dict(self.ticker_volumes)
+
+    async def fetch_ohlcv(self, symbol, timeframe="1h", limit=500):
+        self.calls[("ohlcv", symbol)] += 1
+        close, volume, step = self.daily[symbol]
+        # ``limit`` daily bars ending with today's (still open) one.
+        return [
+            [self.today_ms - (limit - 1 - index) * 86_400_000, 0, 0, 0, close + step * index, volume]
+            for index in range(limit)
+        ]
+
+    async def fetch_open_interest_history(self, symbol, days=30):
+        self.calls[("oi", symbol)] += 1
+        return [{"ts": self.today_ms - (days - 1 - index) * 86_400_000, "oi": 100.0 + 40 * index} for index in range(days)]
+
+
+def test_oi_scanner_fetches_oi_only_for_daily_survivors_once_per_day(monkeypatch) -> None:
+    monkeypatch.setattr("combined_bot.config.OI_DAYS", 5)
+    monkeypatch.setattr("combined_bot.config.OI_GROWTH_PCT", 50)
+    monkeypatch.setattr("combined_bot.config.OI_MAX_PRICE_GROWTH_PCT", 50)
+    monkeypatch.setattr("combined_bot.config.OI_MIN_AVG_DAILY_VOL_USD", 1_000_000)
+    monkeypatch.setattr("combined_bot.config.OI_MIN_TICKER_VOL_USD", 1_000_000)
+    adapter = _CountingOiAdapter(
+        daily={
+            "THIN/USDT:USDT": (1.0, 1_000, 0.0),
+            "PUMP/USDT:USDT": (1.0, 10_000_000, 0.5),
+            "GOOD/USDT:USDT": (10.0, 1_000_000, 0.0),
+            "DUST/USDT:USDT": (1.0, 1_000_000, 0.0),
+        },
+        ticker_volumes={"THIN/USDT:USDT": 2e6, "PUMP/USDT:USDT": 5e7, "GOOD/USDT:USDT": 1e7, "DUST/USDT:USDT": 10.0},
+    )
+    scanner = OpenInterestScanner(store=FeatureStore())
+
+    batch = asyncio.run(scanner.scan({"binance": adapter}))
+    assert [signal.symbol.raw_symbol for signal in batch.events()] == ["GOOD/USDT:USDT"]
+    assert batch.events()[0].metrics["oi_growth_pct"] == 160.0
+    # The illiquid ticker costs nothing; the volume and price rejects cost only their daily bars.
+    assert adapter.calls == Counter(
+        {
+            "tickers": 1,
+            ("ohlcv", "THIN/USDT:USDT"): 1,
+            ("ohlcv", "PUMP/USDT:USDT"): 1,
+            ("ohlcv", "GOOD/USDT:USDT"): 1,
+            ("oi", "GOOD/USDT:USDT"): 1,
+        }
+    )
+
+    adapter.calls.clear()
+    batch = asyncio.run(scanner.scan({"binance": adapter}))
+    assert len(batch) == 1
+    # Same UTC day: daily bars and closed OI points are already known.
+    assert adapter.calls == Counter({"tickers": 1})
+
+
+def test_oi_scanner_keeps_quiet_last_day_symbols_without_ticker_prefilter(monkeypatch) -> None:
+    monkeypatch.setattr("combined_bot.config.OI_DAYS", 5)
+    monkeypatch.setattr("combined_bot.config.OI_GROWTH_PCT", 50)
+    monkeypatch.setattr("combined_bot.config.OI_MAX_PRICE_GROWTH_PCT", 50)
+    monkeypatch.setattr("combined_bot.config.OI_MIN_AVG_DAILY_VOL_USD", 1_000_000)
+    monkeypatch.setattr("combined_bot.config.OI_MIN_TICKER_VOL_USD", 0)
+    # Averages 10M a day over the window, but the last 24h traded only 100k: quiet accumulation.
+    adapter = _CountingOiAdapter(daily={"QUIET/USDT:USDT": (10.0, 1_000_000, 0.0)}, ticker_volumes={"QUIET/USDT:USDT": 1e5})
+    scanner = OpenInterestScanner(store=FeatureStore())
+
+    batch = asyncio.run(scanner.scan({"binance": adapter}))
+
+    assert [signal.symbol.raw_symbol for signal in batch.events()] == ["QUIET/USDT:USDT"]
+    assert adapter.calls["tickers"] == 0
+
+
+def _journal_signal(scanner_id: str, raw_symbol: str, detected_at: datetime, score: float) -> SignalEvent:
+    return SignalEvent(
+        scanner_id=scanner_id,
+        symbol=MarketSymbol.from_raw("binance", raw_symbol, market_type="linear_perp"),
+        timeframe="1h",
+        detected_at=detected_at,
+        candle_close_at=detected_at,
+        score=score,
+        metrics={"ratio": score * 10},
+    )
+
+
+def test_signal_journal_rollups_and_partition_retention(tmp_path: Path) -> None:
+    database = Database(tmp_path / "signals.sqlite3", journal_retention_days=2, rollup_retention_days=30)
+    day = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    database.record_signals(
+        [
+            (_journal_signal("vol_spike", "BTC/USDT:USDT", day + timedelta(hours=1), 0.5), 2),
+            (_journal_signal("vol_spike", "BTC/USDT:USDT", day + timedelta(hours=1, minutes=5), 0.9), 2),
+            (_journal_signal("price_pump", "ETH/USDT:USDT", day + timedelta(hours=3), 0.4), 1),
+            (_journal_signal("vol_spike", "ETH/USDT:USDT", day + timedelta(days=1, hours=2), 0.6), 1),
+        ]
+    )
+    database.record_signals([(_journal_signal("vol_spike", "BTC/USDT:USDT", day + timedelta(days=2), 0.7), 3)])
+    end = day + timedelta(days=3)
+
+    assert database.alerts_per_scanner_per_day(day, end) == [
+        ("2025-01-01", "price_pump", 1),
+        ("2025-01-01", "vol_spike", 2),
+        ("2025-01-02", "vol_spike", 1),
+        ("2025-01-03", "vol_spike", 1),
+    ]
+    assert database.top_symbols(day, end, limit=1) == [("BTC/USDT", 3, 0.9)]
+    assert database.top_symbols(day, end, scanner_id="price_pump") == [("ETH/USDT", 1, 0.4)]
+    entries = database.journal_entries(day, end, symbol="BTC/USDT", limit=2)
+    assert [entry["score"] for entry in entries] == [0.7, 0.9]
+    assert entries[1]["metrics"] == {"ratio": 9.0} and entries[1]["recipients"] == 2
+
+    with database._connect() as conn:
+        plan = " ".join(
+            row["detail"]
+            for row in conn.execute(
+                "EXPLAIN QUERY PLAN SELECT COUNT(*) FROM signal_journal_20250101 WHERE scanner_id = ? AND detected_at >= ?",
+                ("vol_spike", 0),
+            )
+        )
+    assert "COVERING INDEX signal_journal_20250101_scanner_time" in plan
+
+    database.prune_journal(force=True, now=day + timedelta(days=3, hours=12))
+
+    with database._connect() as conn:
+        tables = {row["name"] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert "signal_journal_20250101" not in tables and "signal_journal_20250103" in tables
+    assert [entry["score"] for entry in database.journal_entries(day, end)] == [0.7]
+    # Rollups outlive the raw partitions.
+    assert database.top_symbols(day, end, limit=1) == [("BTC/USDT", 3, 0.9)]
@@ -36,8 +36,9 @@ class _DummyDispatcher:
     def __init__(self):
         self.closed = False
 
-    async def send_signal(self, chat_id, signal):
-        _ = chat_id, signal
+    async def send_signal_many(self, signal, chat_ids, timezones=None):
+        _ = signal, timezones
+        return len(chat_ids)
 
     async def close(self):
         self.closed = True
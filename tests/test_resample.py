@@ -0,0 +1,71 @@
+import asyncio
+
+import numpy as np
+
+from combined_bot.core.features import Feature, FeatureStore
+from combined_bot.core.resample import resample
+
+_HOUR_MS = 3_600_000
+_DAY_MS = 24 * _HOUR_MS
+
+
+def _hourly(count: int, start_ms: int = 0, seed: int = 5) -> list:
+    rng = np.random.default_rng(seed)
+    closes = 20 * np.cumprod(1 + rng.normal(0, 0.01, count))
+    return [
+        [start_ms + index * _HOUR_MS, close * 0.999, close * 1.01, close * 0.98, close, float(rng.integers(1, 100))]
+        for index, close in enumerate(closes)
+    ]
+
+
+def test_resample_aligns_to_utc_and_skips_partial_and_gapped_buckets() -> None:
+    # Starts at 02:00, so the first 4h bucket (00:00-04:00) is incomplete.
+    candles = _hourly(30, start_ms=2 * _HOUR_MS)
+    del candles[12]  # 14:00 is missing: the 12:00-16:00 bucket is dropped.
+
+    bars = resample(candles, "1h", "4h", now_ms=32 * _HOUR_MS - 1)
+
+    assert [int(bar[0]) // _HOUR_MS for bar in bars] == [4, 8, 16, 20, 24]
+    first = [candle for candle in candles if 4 * _HOUR_MS <= candle[0] < 8 * _HOUR_MS]
+    assert bars[0] == [4 * _HOUR_MS, first[0][1], max(c[2] for c in first), min(c[3] for c in first), first[-1][4], sum(c[5] for c in first)]
+    # The 28:00-32:00 bucket closes only when its last hour does.
+    assert len(resample(candles, "1h", "4h", now_ms=32 * _HOUR_MS)) == 6
+
+
+class _Adapter:
+    def __init__(self, hourly: list, daily: list) -> None:
+        self.candles = {"1h": hourly, "1d": daily}
+        self.calls = []
+
+    async def fetch_ohlcv(self, symbol, timeframe, limit):
+        self.calls.append((timeframe, limit))
+        return self.candles[timeframe][-limit:]
+
+
+def test_derived_daily_series_is_extended_from_hourly_without_daily_requests() -> None:
+    store = FeatureStore()
+    store.register("1h", Feature.window("usd_volume", 24))
+    store.register("1d", Feature.window("close", 3))
+    store.derive("1d", "1h")
+    hourly = _hourly(24 * 6)
+    daily = resample(hourly, "1h", "1d", now_ms=6 * _DAY_MS)
+    adapter = _Adapter(hourly[: 4 * 24 + 12], daily[:4])
+
+    async def _refresh(timeframe, now_ms):
+        return await store.refresh(adapter, "binance", "X", timeframe, now_ms=now_ms)
+
+    now_ms = 4 * _DAY_MS + 12 * _HOUR_MS
+    asyncio.run(_refresh("1h", now_ms))
+    asyncio.run(_refresh("1d", now_ms))
+    assert adapter.calls == [("1h", 25), ("1d", 4)]
+
+    adapter.calls.clear()
+    for hour in range(4 * 24 + 13, 6 * 24 + 1):
+        adapter.candles["1h"] = hourly[:hour]
+        asyncio.run(_refresh("1h", (hour - 1) * _HOUR_MS + 60_000))
+    series = asyncio.run(_refresh("1d", 6 * _DAY_MS + 60_000))
+
+    assert {timeframe for timeframe, _ in adapter.calls} == {"1h"}
+    assert series.last_open_ms == 5 * _DAY_MS
+    assert series.tail(2) == [tuple(bar) for bar in daily[4:6]]
+    assert series.window("close", 3).last == daily[5][4]
@@ -0,0 +1,136 @@
+import asyncio
+import logging
+import time
+
+import ccxt.async_support as ccxt
+import pytest
+
+from combined_bot.adapters.binance import BinanceFuturesAdapter
+from combined_bot.adapters.resilience import CircuitBreaker, CircuitOpenError
+from combined_bot.core.features import FeatureStore
+from combined_bot.scanners.volume import VolumeSpikeScanner
+
+
+def test_breaker_opens_on_error_rate_and_recovers_through_single_probe() -> None:
+    now = [0.0]
+    breaker = CircuitBreaker(error_rate=0.5, min_calls=4, window=10, open_seconds=30, clock=lambda: now[0])
+    for failed in (False, True, False, True):
+        assert breaker.allow()
+        breaker.record_failure() if failed else breaker.record_success()
+
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+    now[0] = 31.0
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_success()
+
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow()
+
+
+class _Client:
+    def __init__(self, behaviour) -> None:
+        self.behaviour = behaviour
+        self.calls = 0
+        self.session = None
+        self.markets = {}
+
+    def parse_timeframe(self, timeframe):
+        return 3600
+
+    async def fetch_ohlcv(self, symbol, timeframe, limit):
+        self.calls += 1
+        return await self.behaviour(self.calls)
+
+    async def close(self):
+        return None
+
+
+def _adapter(client) -> BinanceFuturesAdapter:
+    adapter = BinanceFuturesAdapter()
+    adapter._client = client
+    adapter._markets_loaded = True
+    return adapter
+
+
+def test_degraded_exchange_fails_fast_once_the_breaker_opens(monkeypatch) -> None:
+    monkeypatch.setattr("combined_bot.config.BINANCE_FAST_PARSE", False)
+    monkeypatch.setattr("combined_bot.config.ADAPTER_RETRY_ATTEMPTS", 3)
+    monkeypatch.setattr("combined_bot.config.ADAPTER_RETRY_BASE_DELAY_SECONDS", 0.1)
+    monkeypatch.setattr("combined_bot.config.ADAPTER_BREAKER_MIN_CALLS", 5)
+
+    async def _down(_call):
+        raise ccxt.NetworkError("502 Bad Gateway")
+
+    client = _Client(_down)
+    adapter = _adapter(client)
+
+    async def _scan():
+        failures = []
+        try:
+            for index in range(100):
+                with pytest.raises((ccxt.NetworkError, CircuitOpenError)) as caught:
+                    await adapter.fetch_ohlcv(f"S{index}/USDT:USDT", "1h", 49)
+                failures.append(caught.type)
+        finally:
+            await adapter.close()
+        return failures
+
+    started = time.monotonic()
+    failures = asyncio.run(_scan())
+
+    # Without the breaker: 100 symbols x (0.1 + 0.2) s of backoff = 30 s.
+    assert time.monotonic() - started < 2
+    assert client.calls == 5
+    assert failures.count(CircuitOpenError) >= 97
+
+
+def test_slow_call_is_hedged_after_observed_p95(monkeypatch) -> None:
+    monkeypatch.setattr("combined_bot.config.BINANCE_FAST_PARSE", False)
+    monkeypatch.setattr("combined_bot.config.ADAPTER_HEDGE_ENABLED", True)
+    monkeypatch.setattr("combined_bot.config.ADAPTER_HEDGE_MIN_SAMPLES", 20)
+    monkeypatch.setattr("combined_bot.config.OHLCV_CACHE_TTL_SECONDS", 0)
+
+    async def _first_stalls(call):
+        await asyncio.sleep(5 if call == 21 else 0.01)
+        return [[call, 1, 1, 1, 1, 1]]
+
+    client = _Client(_first_stalls)
+    adapter = _adapter(client)
+
+    async def _run():
+        try:
+            for _ in range(20):
+                await adapter.fetch_ohlcv("BTC/USDT:USDT", "1h", 1)
+            started = time.monotonic()
+            candles = await adapter.fetch_ohlcv("BTC/USDT:USDT", "1h", 1)
+            return candles, time.monotonic() - started
+        finally:
+            await adapter.close()
+
+    candles, elapsed = asyncio.run(_run())
+
+    assert candles == [[22, 1, 1, 1, 1, 1]]
+    assert client.calls == 22
+    assert elapsed < 1
+
+
+class _OpenCircuitAdapter:
+    async def list_symbols(self):
+        return [f"S{index}/USDT:USDT" for index in range(50)]
+
+    async def fetch_ohlcv(self, symbol, timeframe="1h", limit=500):
+        raise CircuitOpenError(f"binance:ohlcv circuit is open, skipping fetch_ohlcv {symbol}")
+
+
+def test_open_circuit_is_logged_once_per_scan_without_tracebacks(caplog) -> None:
+    scanner = VolumeSpikeScanner(store=FeatureStore())
+
+    with caplog.at_level(logging.WARNING):
+        batch = asyncio.run(scanner.scan({"binance": _OpenCircuitAdapter()}))
+
+    assert len(batch) == 0
+    assert [(record.levelno, record.exc_info) for record in caplog.records] == [(logging.WARNING, None)]
+    assert "binance: 50 symbols not scanned" in caplog.records[0].getMessage()
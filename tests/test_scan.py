@@ -0,0 +1,84 @@
+import asyncio
+import io
+import json
+
+from aiohttp import web
+
+from combined_bot.adapters.http import RequestStats, SharedHttpSession
+from combined_bot.scan import format_report, restrict_symbols, run_scan
+from combined_bot.scanners.base import BaseScanner
+from combined_bot.signal_batch import SignalBatchBuilder
+from combined_bot.symbols import SymbolRegistry
+
+
+class _Adapter:
+    def __init__(self, base_url: str, http: SharedHttpSession) -> None:
+        self.base_url = base_url
+        self.http = http
+
+    async def list_symbols(self):
+        return ["BTC/USDT:USDT", "ETH/USDT:USDT", "SOL/USDT:USDT"]
+
+    async def fetch_ohlcv(self, symbol, timeframe, limit):
+        session = await self.http.acquire()
+        try:
+            async with session.get(f"{self.base_url}/klines", params={"symbol": symbol}) as response:
+                return await response.json()
+        finally:
+            await self.http.release()
+
+
+class _Scanner(BaseScanner):
+    id = "probe"
+
+    def __init__(self) -> None:
+        self.registry = SymbolRegistry()
+
+    async def scan(self, adapters):
+        builder = SignalBatchBuilder(self.id, "1h", ("close",), registry=self.registry)
+
+        async def _process(exchange, adapter, raw_symbol):
+            candles = await adapter.fetch_ohlcv(raw_symbol, "1h", 1)
+            builder.add(self.registry.intern(exchange, raw_symbol), candles[-1][0], 0.5, (candles[-1][4],))
+
+        await self._scan_symbols(adapters, _process)
+        return builder.build()
+
+
+def test_batch_scan_streams_jsonl_and_counts_requests_per_scanner() -> None:
+    async def _klines(request):
+        return web.json_response([[1_735_689_600_000, 1, 2, 0.5, 1.5, 10]])
+
+    async def _run():
+        app = web.Application()
+        app.router.add_get("/klines", _klines)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        stats = RequestStats()
+        http = SharedHttpSession()
+        http.trace_configs.append(stats.trace_config())
+        adapter = _Adapter(f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}", http)
+        out = io.StringIO()
+        try:
+            adapters = await restrict_symbols({"binance": adapter}, ["BTCUSDT", "eth/usdt"])
+            timings = await run_scan(adapters, [_Scanner()], out, stats, cycles=2)
+        finally:
+            await runner.cleanup()
+        return out.getvalue(), timings, stats
+
+    output, timings, stats = asyncio.run(_run())
+
+    records = [json.loads(line) for line in output.splitlines()]
+    # The second cycle finds the same candles: already streamed, so nothing new is written.
+    assert [(record["cycle"], record["raw_symbol"]) for record in records] == [
+        (1, "BTC/USDT:USDT"),
+        (1, "ETH/USDT:USDT"),
+    ]
+    assert records[0]["metrics"] == {"close": 1.5}
+    timing = timings["probe"]
+    assert (timing.runs, timing.signals, timing.requests) == (2, 2, 4)
+    assert stats.requests == 4 and timing.bytes_received == stats.bytes_received > 0
+    assert timing.cpu_seconds is not None and timing.cpu_seconds >= 0
+    assert format_report(timings, stats, 1.0, 0.5).splitlines()[1].split()[:4] == ["probe", "2", "2", f"{timing.wall_seconds:.3f}"]
@@ -0,0 +1,99 @@
+import asyncio
+
+from combined_bot.core.orchestrator import Orchestrator
+from combined_bot.core.scheduler import SymbolScheduler
+from combined_bot.main import build_orchestrator
+from combined_bot.signal_batch import SignalBatch
+
+
+def test_scheduler_hands_out_at_most_budget_symbols_per_tick() -> None:
+    scheduler = SymbolScheduler(hot_interval_seconds=30, cold_interval_seconds=600, request_budget_per_minute=120)
+    scheduler.sync("binance", [f"S{i}" for i in range(10)], now=0.0)
+
+    budget = scheduler.budget(elapsed_seconds=2)
+    due = scheduler.take_due(now=0.0, limit=budget)
+
+    assert budget == 4
+    assert due == {"binance": ["S0", "S1", "S2", "S3"]}
+
+
+def test_hot_symbols_are_rescanned_more_often_within_budget() -> None:
+    scheduler = SymbolScheduler(hot_interval_seconds=30, cold_interval_seconds=600, request_budget_per_minute=60)
+    symbols = [f"S{i}" for i in range(20)]
+    scheduler.sync("binance", symbols, now=0.0)
+    scans = {symbol: 0 for symbol in symbols}
+    handed_out = 0
+
+    for tick in range(0, 3600, 30):
+        now = float(tick)
+        due = scheduler.take_due(now, scheduler.budget(30))
+        for symbol in due.get("binance", []):
+            scans[symbol] += 1
+            handed_out += 1
+            scheduler.observe("binance", symbol, 1.5 if symbol == "S7" else 0.05)
+        scheduler.complete(due, now)
+
+    assert handed_out <= 60 * 60
+    assert scans["S7"] > 3 * scans["S0"]
+    assert scheduler.heat("binance", "S7") >= 1.0
+
+
+class _RecordingScanner:
+    id = "recording"
+    requests_per_symbol = 2
+    heat_observer = None
+
+    def __init__(self) -> None:
+        self.seen = []
+
+    async def scan(self, adapters):
+        for exchange, adapter in adapters.items():
+            for symbol in await adapter.list_symbols():
+                self.seen.append(symbol)
+                self.heat_observer(exchange, symbol, 1.0)
+        return SignalBatch.empty()
+
+
+class _Adapter:
+    async def list_symbols(self):
+        return ["A", "B", "C", "D"]
+
+
+def test_orchestrator_scans_only_due_symbols_and_wires_heat() -> None:
+    scanner = _RecordingScanner()
+    scheduler = SymbolScheduler(hot_interval_seconds=30, cold_interval_seconds=600, request_budget_per_minute=8)
+    orchestrator = Orchestrator(
+        adapters={"binance": _Adapter()},
+        scanners=[scanner],
+        database=None,
+        dispatcher=None,
+        interval_seconds=30,
+        scheduler=scheduler,
+    )
+
+    asyncio.run(orchestrator._collect_signals())
+
+    assert scheduler.requests_per_symbol == 2
+    assert scanner.seen == ["A", "B"]
+    assert scheduler.heat("binance", "A") == 1.0
+    assert scheduler.heat("binance", "C") == 0.0
+
+
+def test_build_orchestrator_wires_the_scheduler_when_enabled(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr("combined_bot.config.SCHEDULER_ENABLED", True)
+    monkeypatch.setattr("combined_bot.config.DATABASE_PATH", tmp_path / "signals.sqlite3")
+    monkeypatch.setattr("combined_bot.config.TG_DEFAULT_CHAT_ID", None)
+    monkeypatch.setattr("combined_bot.config.ENABLED_EXCHANGES", ["binance"])
+
+    orchestrator = build_orchestrator()
+
+    assert isinstance(orchestrator.scheduler, SymbolScheduler)
+
+    async def _close():
+        for adapter in orchestrator.adapters.values():
+            await adapter.close()
+        for scanner in orchestrator.scanners:
+            await scanner.close()
+        await orchestrator.dispatcher.close()
+
+    asyncio.run(_close())
@@ -0,0 +1,107 @@
+import asyncio
+from datetime import datetime, timezone
+from pathlib import Path
+
+from combined_bot.core.database import Database
+from combined_bot.core.orchestrator import Orchestrator
+from combined_bot.models import MarketSymbol, SignalEvent, UserSettings
+from combined_bot.signal_batch import SignalBatch, SignalBatchBuilder
+from combined_bot.symbols import SymbolRegistry
+
+_TS = datetime(2025, 1, 1, tzinfo=timezone.utc)
+_TS_MS = int(_TS.timestamp() * 1000)
+
+
+def _volume_batch(registry: SymbolRegistry, symbols) -> SignalBatch:
+    builder = SignalBatchBuilder("vol_spike", "1h", ("prev_24h_volume_usd", "last_24h_volume_usd", "ratio"), registry=registry)
+    for index, raw_symbol in enumerate(symbols):
+        builder.add(
+            registry.intern("binance", raw_symbol, market_type="linear_perp"),
+            candle_close_ms=_TS_MS,
+            score=0.1 * (index + 1),
+            metrics=(1_000_000.0, 6_000_000.0, 6.0),
+        )
+    return builder.build()
+
+
+def test_batch_dedup_keys_match_signal_event() -> None:
+    registry = SymbolRegistry()
+    batch = _volume_batch(registry, ["BTC/USDT:USDT", "ETH/USDT:USDT"])
+    expected = SignalEvent(
+        scanner_id="vol_spike",
+        symbol=MarketSymbol.from_raw("binance", "ETH/USDT:USDT", market_type="linear_perp"),
+        timeframe="1h",
+        detected_at=_TS,
+        candle_close_at=_TS,
+    )
+
+    assert batch.dedup_keys()[1] == expected.dedup_key
+
+
+def test_batch_materializes_event_lazily_with_metrics() -> None:
+    registry = SymbolRegistry()
+    batch = _volume_batch(registry, ["BTC/USDT:USDT"])
+
+    event = batch.event(0)
+
+    assert event.symbol is registry.get("binance", "BTC/USDT:USDT")
+    assert event.metrics == {"prev_24h_volume_usd": 1_000_000.0, "last_24h_volume_usd": 6_000_000.0, "ratio": 6.0}
+    assert event.candle_close_at == _TS
+    assert event.raw_data_hash
+    assert event.dedup_key == batch.dedup_keys()[0]
+
+
+def test_batch_concat_aligns_metric_columns_and_take_reorders() -> None:
+    registry = SymbolRegistry()
+    volume = _volume_batch(registry, ["BTC/USDT:USDT"])
+    price = SignalBatchBuilder("price_pump", "1h", ("price_ratio", "volume_usd"), registry=registry)
+    price.add(registry.intern("binance", "SOL/USDT:USDT"), _TS_MS, 0.9, (1.5, 2e7), direction="LONG")
+
+    merged = SignalBatch.concat([volume, price.build()])
+    reordered = merged.take([1, 0])
+
+    assert len(merged) == 2
+    assert merged.metric_names == ("prev_24h_volume_usd", "last_24h_volume_usd", "ratio", "price_ratio", "volume_usd")
+    assert reordered.event(0).scanner_id == "price_pump"
+    assert reordered.event(0).direction == "LONG"
+    assert reordered.event(0).metrics == {"price_ratio": 1.5, "volume_usd": 2e7}
+    assert reordered.dedup_keys() == [merged.dedup_keys()[1], merged.dedup_keys()[0]]
+
+
+class _Scanner:
+    def __init__(self, batch):
+        self.batch = batch
+
+    async def scan(self, adapters):
+        _ = adapters
+        return self.batch
+
+
+class _Dispatcher:
+    def __init__(self):
+        self.sent = []
+
+    async def send_signal_many(self, signal, chat_ids, timezones=None):
+        _ = timezones
+        self.sent.extend((chat_id, signal.symbol.canonical_symbol) for chat_id in chat_ids)
+        return len(chat_ids)
+
+
+def test_orchestrator_dedups_batch_in_bulk(tmp_path: Path, monkeypatch) -> None:
+    registry = SymbolRegistry()
+    batch = _volume_batch(registry, ["BTC/USDT:USDT", "ETH/USDT:USDT", "SOL/USDT:USDT"])
+    database = Database(tmp_path / "signals.sqlite3")
+    database.upsert_user_settings(UserSettings(chat_id=7, min_score_threshold=0.15))
+    dispatcher = _Dispatcher()
+    orchestrator = Orchestrator(adapters={}, scanners=[_Scanner(batch)], database=database, dispatcher=dispatcher)
+
+    materialized = []
+    original_event = SignalBatch.event
+    monkeypatch.setattr(SignalBatch, "event", lambda self, row: materialized.append(row) or original_event(self, row))
+
+    asyncio.run(orchestrator.run_once())
+    asyncio.run(orchestrator.run_once())
+
+    assert dispatcher.sent == [(7, "ETH/USDT"), (7, "SOL/USDT")]
+    assert materialized == [1, 2]
+    assert database.find_duplicate_keys(batch.dedup_keys()) == set(batch.dedup_keys())
@@ -0,0 +1,84 @@
+import asyncio
+from datetime import datetime, timezone
+
+from combined_bot.core.orchestrator import Orchestrator
+from combined_bot.models import MarketSymbol, SignalEvent, UserSettings
+from combined_bot.symbols import SymbolRegistry, symbol_registry
+
+
+def test_registry_interns_one_symbol_per_instrument() -> None:
+    registry = SymbolRegistry()
+    first = registry.intern("binance", "BTC/USDT:USDT", market_type="linear_perp")
+    second = registry.intern("binance", "BTC/USDT:USDT", market_type="linear_perp")
+    lowercase = registry.intern("binance", "btc/usdt:usdt", market_type="linear_perp")
+
+    assert first is second
+    assert first is lowercase
+    assert first.canonical_symbol == "BTC/USDT"
+    assert registry.by_id(first.symbol_id) is first
+    assert registry.get("binance", "BTC/USDT") is first
+    assert len(registry) == 1
+
+
+def test_registry_register_market_uses_market_base_and_quote() -> None:
+    registry = SymbolRegistry()
+    market = {"symbol": "1000PEPE/USDT:USDT", "base": "1000PEPE", "quote": "USDT", "active": True}
+
+    symbol = registry.register_market("binance", market)
+
+    assert symbol.base_asset == "1000PEPE"
+    assert symbol.quote_asset == "USDT"
+    assert registry.intern("binance", "1000PEPE/USDT:USDT") is symbol
+
+
+def test_registry_groups_same_asset_across_exchanges() -> None:
+    registry = SymbolRegistry()
+    binance = registry.intern("binance", "BTC/USDT:USDT", market_type="linear_perp")
+    bybit = registry.intern("bybit", "BTC/USDT:USDT", market_type="linear_perp")
+    other = registry.intern("bybit", "ETH/USDT:USDT", market_type="linear_perp")
+
+    assert binance is not bybit
+    assert binance.canonical_id == bybit.canonical_id != other.canonical_id
+    assert registry.group_for(binance) == (binance, bybit)
+    assert registry.canonical_id("BTCUSDT") == binance.canonical_id
+    assert registry.canonical_id("btc/usdt:usdt") == binance.canonical_id
+    assert "BTCUSDT" not in registry._canonical_ids and "btc/usdt:usdt" not in registry._canonical_ids
+    assert registry.canonical_name(binance.canonical_id) == "BTC/USDT"
+
+
+class _RecordingDispatcher:
+    def __init__(self) -> None:
+        self.sent = []
+
+    async def send_signal_many(self, signal, chat_ids, timezones=None):
+        _ = timezones
+        self.sent.extend((chat_id, signal.symbol.canonical_symbol) for chat_id in chat_ids)
+        return len(chat_ids)
+
+
+def test_orchestrator_blacklist_matches_by_canonical_id() -> None:
+    dispatcher = _RecordingDispatcher()
+    orchestrator = Orchestrator(adapters={}, scanners=[], database=None, dispatcher=dispatcher)
+    ts = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    users = [
+        UserSettings(chat_id=1, blacklist_symbols=["BTCUSDT"]),
+        UserSettings(chat_id=2, blacklist_symbols=["ETH/USDT"]),
+    ]
+    interned = SignalEvent(
+        scanner_id="vol_spike",
+        symbol=symbol_registry.intern("binance", "BTC/USDT:USDT", market_type="linear_perp"),
+        timeframe="1h",
+        detected_at=ts,
+        candle_close_at=ts,
+    )
+    ad_hoc = SignalEvent(
+        scanner_id="vol_spike",
+        symbol=MarketSymbol.from_raw("binance", "ETHUSDT", market_type="linear_perp"),
+        timeframe="1h",
+        detected_at=ts,
+        candle_close_at=ts,
+    )
+
+    assert asyncio.run(orchestrator._deliver(interned, users)) == 1
+    assert asyncio.run(orchestrator._deliver(ad_hoc, users)) == 1
+    assert dispatcher.sent == [(2, "BTC/USDT"), (1, "ETH/USDT")]
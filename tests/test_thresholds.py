@@ -0,0 +1,139 @@
+import asyncio
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+
+from combined_bot.core.database import Database
+from combined_bot.core.features import FeatureStore
+from combined_bot.core.orchestrator import Orchestrator
+from combined_bot.core.thresholds import ThresholdMatcher
+from combined_bot.models import UserSettings
+from combined_bot.scanners.oi import OpenInterestScanner
+from combined_bot.scanners.volume import VolumeSpikeScanner
+from combined_bot.signal_batch import SignalBatchBuilder
+from combined_bot.symbols import SymbolRegistry
+
+_TS_MS = int(datetime(2025, 1, 1, tzinfo=timezone.utc).timestamp() * 1000)
+
+
+def _volume_batch(registry: SymbolRegistry, rows):
+    builder = SignalBatchBuilder("vol_spike", "1h", VolumeSpikeScanner.metric_names, registry=registry)
+    for raw_symbol, last_usd, ratio in rows:
+        builder.add(
+            registry.intern("binance", raw_symbol, market_type="linear_perp"),
+            candle_close_ms=_TS_MS,
+            score=0.5,
+            metrics=(last_usd / ratio, last_usd, ratio),
+        )
+    return builder.build()
+
+
+def test_matcher_deduplicates_profiles_and_loosens_scanner_floor(monkeypatch) -> None:
+    monkeypatch.setattr("combined_bot.config.MIN_VOL_RATIO", 5.0)
+    monkeypatch.setattr("combined_bot.config.MIN_VOL_USD_LAST", 20_000_000)
+    scanner = VolumeSpikeScanner(store=FeatureStore())
+    matcher = ThresholdMatcher([scanner])
+    profiles = [{}, {"min_vol_ratio": 3.0}, {"min_vol_ratio": 8.0, "min_vol_usd_last": 1_000_000}]
+    users = [
+        UserSettings(chat_id=index, threshold_profiles={"vol_spike": profiles[index % 3]} if index % 3 else {})
+        for index in range(10_000)
+    ]
+
+    matcher.prepare(users)
+    registry = SymbolRegistry()
+    batch = _volume_batch(registry, [("AAA/USDT:USDT", 30e6, 4.0), ("BBB/USDT:USDT", 5e6, 9.0), ("CCC/USDT:USDT", 30e6, 6.0)])
+    allowed = matcher.match(batch, users)
+
+    assert matcher._profiles["vol_spike"].matrix.shape == (3, 2)
+    assert scanner.threshold_floor == {"min_vol_ratio": 3.0, "min_vol_usd_last": 1_000_000}
+    assert allowed.shape == (3, 10_000)
+    # Row 0: only the loose ratio profile; row 1: only the low-volume profile; row 2: default and loose.
+    assert allowed[:, :3].tolist() == [[False, True, False], [False, False, True], [True, True, False]]
+    assert allowed.sum(axis=1).tolist() == [3333, 3333, 6667]
+
+
+def test_zero_and_negative_profile_values_are_kept_and_non_finite_dropped(monkeypatch) -> None:
+    settings = UserSettings(
+        chat_id=1,
+        threshold_profiles={
+            "oi_spike": {"oi_max_price_growth_pct": 0, "oi_growth_pct": float("nan"), "oi_min_avg_daily_vol_usd": "n/a"},
+            "vol_spike": {"min_vol_ratio": 0, "min_vol_usd_last": float("inf")},
+        },
+    )
+    assert settings.threshold_profiles == {"oi_spike": {"oi_max_price_growth_pct": 0.0}, "vol_spike": {"min_vol_ratio": 0.0}}
+
+    monkeypatch.setattr("combined_bot.config.OI_MAX_PRICE_GROWTH_PCT", 50)
+    scanner = OpenInterestScanner(store=FeatureStore())
+    strict = UserSettings(chat_id=2, threshold_profiles={"oi_spike": {"oi_max_price_growth_pct": -5}})
+    matcher = ThresholdMatcher([scanner])
+    matcher.prepare([settings, strict])
+    builder = SignalBatchBuilder("oi_spike", "1d", ("oi_growth_pct", "price_growth_pct"), registry=SymbolRegistry())
+    builder.add(builder.registry.intern("binance", "AAA/USDT:USDT"), _TS_MS, 0.5, (60.0, -2.0))
+    allowed = matcher.match(builder.build(), [settings, strict])
+
+    # A price that fell 2% passes the 0% cap but not the -5% one; neither falls back to the default 50.
+    assert allowed.tolist() == [[True, False]]
+
+
+def test_upper_bound_gate_and_missing_metric(monkeypatch) -> None:
+    monkeypatch.setattr("combined_bot.config.OI_MAX_PRICE_GROWTH_PCT", 50)
+    scanner = OpenInterestScanner(store=FeatureStore())
+    matcher = ThresholdMatcher([scanner])
+    users = [UserSettings(chat_id=1), UserSettings(chat_id=2, threshold_profiles={"oi_spike": {"oi_max_price_growth_pct": 80}})]
+
+    matcher.prepare(users)
+    builder = SignalBatchBuilder("oi_spike", "1d", ("oi_growth_pct", "price_growth_pct"), registry=SymbolRegistry())
+    builder.add(builder.registry.intern("binance", "AAA/USDT:USDT"), _TS_MS, 0.5, (60.0, 70.0))
+    allowed = matcher.match(builder.build(), users)
+
+    assert scanner.threshold_floor["oi_max_price_growth_pct"] == 80
+    # avg_daily_vol_usd is not in the batch, so that gate cannot reject the row.
+    assert allowed.tolist() == [[False, True]]
+
+
+class _Scanner(VolumeSpikeScanner):
+    def __init__(self, batch):
+        self.batch = batch
+
+    async def scan(self, adapters):
+        _ = adapters
+        return self.batch
+
+
+class _Dispatcher:
+    def __init__(self):
+        self.sent = []
+
+    async def send_signal_many(self, signal, chat_ids, timezones=None):
+        _ = timezones
+        self.sent.extend((chat_id, signal.symbol.canonical_symbol) for chat_id in chat_ids)
+        return len(chat_ids)
+
+
+def test_orchestrator_routes_rows_by_stored_profiles(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr("combined_bot.config.MIN_VOL_RATIO", 5.0)
+    monkeypatch.setattr("combined_bot.config.MIN_VOL_USD_LAST", 20_000_000)
+    path = tmp_path / "signals.sqlite3"
+    # A database from before threshold profiles existed is migrated in place.
+    with sqlite3.connect(path) as conn:
+        conn.execute(
+            "CREATE TABLE user_settings (chat_id INTEGER PRIMARY KEY, is_active INTEGER NOT NULL, enabled_scanners TEXT NOT NULL,"
+            " enabled_exchanges TEXT NOT NULL, min_score_threshold REAL NOT NULL, blacklist_symbols TEXT NOT NULL, timezone TEXT NOT NULL)"
+        )
+        conn.execute("""INSERT INTO user_settings VALUES (1, 1, '["vol_spike"]', '["binance"]', 0, '[]', 'UTC')""")
+    database = Database(path)
+    database.upsert_user_settings(UserSettings(chat_id=2, threshold_profiles={" VOL_SPIKE ": {"Min_Vol_Ratio": 3}}))
+    assert [settings.threshold_profiles for settings in database.get_active_user_settings()] == [
+        {},
+        {"vol_spike": {"min_vol_ratio": 3.0}},
+    ]
+
+    registry = SymbolRegistry()
+    batch = _volume_batch(registry, [("AAA/USDT:USDT", 30e6, 4.0), ("BBB/USDT:USDT", 30e6, 6.0)])
+    scanner = _Scanner(batch)
+    dispatcher = _Dispatcher()
+    orchestrator = Orchestrator(adapters={}, scanners=[scanner], database=database, dispatcher=dispatcher)
+    asyncio.run(orchestrator.run_once())
+
+    assert scanner.threshold_floor == {"min_vol_ratio": 3.0, "min_vol_usd_last": 20_000_000}
+    assert sorted(dispatcher.sent) == [(1, "BBB/USDT"), (2, "AAA/USDT"), (2, "BBB/USDT")]
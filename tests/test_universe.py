@@ -0,0 +1,142 @@
+import asyncio
+from datetime import datetime, timezone
+from pathlib import Path
+
+from combined_bot.adapters.binance import BinanceFuturesAdapter
+from combined_bot.core.database import Database
+from combined_bot.core.orchestrator import Orchestrator
+from combined_bot.core.scheduler import SymbolScheduler
+from combined_bot.models import UniverseEvent, UserSettings
+from combined_bot.symbols import symbol_registry
+
+
+def _market(symbol: str, active: bool = True) -> dict:
+    return {
+        "symbol": symbol,
+        "id": symbol.split(":")[0].replace("/", ""),
+        "base": symbol.split("/")[0],
+        "quote": "USDT",
+        "active": active,
+        "swap": True,
+        "linear": True,
+        "info": {"contractType": "PERPETUAL"},
+    }
+
+
+class _Client:
+    def __init__(self, markets) -> None:
+        self.session = None
+        self.markets = {market["symbol"]: market for market in markets}
+        self.listing = list(markets)
+        self.fetches = 0
+        self.set_markets_calls = 0
+
+    async def fetch_markets(self):
+        self.fetches += 1
+        return list(self.listing)
+
+    def set_markets(self, markets, currencies=None):
+        self.set_markets_calls += 1
+        self.markets = {market["symbol"]: market for market in markets}
+
+    async def close(self):
+        return None
+
+
+def test_refresh_universe_reports_listings_and_updates_symbols_incrementally(monkeypatch) -> None:
+    monkeypatch.setattr("combined_bot.config.MARKETS_CACHE_TTL_SECONDS", 0)
+    client = _Client([_market("BTC/USDT:USDT"), _market("ETH/USDT:USDT")])
+    adapter = BinanceFuturesAdapter()
+    adapter._client = client
+    adapter._markets_loaded = True
+
+    async def _run():
+        try:
+            before = await adapter.list_symbols()
+            unchanged = await adapter.refresh_universe()
+            client.listing = [_market("BTC/USDT:USDT"), _market("ETH/USDT:USDT", active=False), _market("NEW/USDT:USDT")]
+            events = await adapter.refresh_universe()
+            return before, unchanged, events, await adapter.list_symbols()
+        finally:
+            await adapter.close()
+
+    before, unchanged, events, after = asyncio.run(_run())
+
+    assert before == ["BTC/USDT:USDT", "ETH/USDT:USDT"]
+    assert unchanged == []
+    assert [(event.kind, event.symbol.raw_symbol) for event in events] == [
+        ("listed", "NEW/USDT:USDT"),
+        ("delisted", "ETH/USDT:USDT"),
+    ]
+    assert after == ["BTC/USDT:USDT", "NEW/USDT:USDT"]
+    assert client.fetches == 2 and client.set_markets_calls == 1
+
+
+def test_new_listing_past_top_symbols_limit_is_still_scanned(monkeypatch) -> None:
+    monkeypatch.setattr("combined_bot.config.MARKETS_CACHE_TTL_SECONDS", 0)
+    monkeypatch.setattr("combined_bot.config.TOP_SYMBOLS_LIMIT", 2)
+    monkeypatch.setattr("combined_bot.config.SYMBOLS_CACHE_TTL_SECONDS", 0)
+    client = _Client([_market("AAA/USDT:USDT"), _market("BBB/USDT:USDT"), _market("CCC/USDT:USDT")])
+    adapter = BinanceFuturesAdapter()
+    adapter._client = client
+    adapter._markets_loaded = True
+
+    async def _run():
+        try:
+            before = await adapter.list_symbols()
+            client.listing = [*client.listing, _market("ZZZ/USDT:USDT")]
+            events = await adapter.refresh_universe()
+            # An expired symbols cache is rebuilt from the client's markets; the listing stays in.
+            return before, events, await adapter.list_symbols()
+        finally:
+            await adapter.close()
+
+    before, events, after = asyncio.run(_run())
+
+    assert before == ["AAA/USDT:USDT", "BBB/USDT:USDT"]
+    assert [(event.kind, event.symbol.raw_symbol) for event in events] == [("listed", "ZZZ/USDT:USDT")]
+    assert after == ["AAA/USDT:USDT", "BBB/USDT:USDT", "ZZZ/USDT:USDT"]
+
+
+class _Adapter:
+    async def list_symbols(self):
+        return ["A/USDT:USDT", "B/USDT:USDT", "NEW/USDT:USDT"]
+
+
+class _Dispatcher:
+    def __init__(self) -> None:
+        self.notices = []
+
+    async def send_universe_event(self, event, chat_ids, timezones=None):
+        self.notices.append((event.kind, event.symbol.canonical_symbol, list(chat_ids)))
+        return len(chat_ids)
+
+
+def test_listing_event_promotes_symbol_and_notifies_once(tmp_path: Path) -> None:
+    database = Database(tmp_path / "signals.sqlite3")
+    database.upsert_user_settings(UserSettings(chat_id=1, enabled_scanners=["vol_spike", "listing"]))
+    database.upsert_user_settings(UserSettings(chat_id=2))
+    scheduler = SymbolScheduler(hot_interval_seconds=30, cold_interval_seconds=600, request_budget_per_minute=0)
+    dispatcher = _Dispatcher()
+    orchestrator = Orchestrator(
+        adapters={"binance": _Adapter()},
+        scanners=[],
+        database=database,
+        dispatcher=dispatcher,
+        scheduler=scheduler,
+    )
+    event = UniverseEvent(
+        "listed", symbol_registry.intern("binance", "NEW/USDT:USDT", market_type="linear_perp"), datetime.now(timezone.utc)
+    )
+    settings = database.get_active_user_settings()
+
+    orchestrator._universe_events = [event]
+    asyncio.run(orchestrator._apply_universe_events(settings, {}))
+    _, due = asyncio.run(orchestrator._scheduled_adapters(0.0))
+
+    assert due["binance"][0] == "NEW/USDT:USDT"
+    assert dispatcher.notices == [("listed", "NEW/USDT", [1])]
+
+    orchestrator._universe_events = [event]
+    asyncio.run(orchestrator._apply_universe_events(settings, {}))
+    assert len(dispatcher.notices) == 1